@@ -7,9 +7,12 @@ from application.factory.consumer_factory import convert_consumer_event, convert
     format_ethereum_event
 from application.service.consumer_service import ConsumerService
 from common.logger import get_logger
-from config import SLACK_HOOK
-from utils.exception_handler import consumer_exception_handler
+from config import SLACK_HOOK, REDELIVERY_DELAY
+from constants.entity import EventConsumerEntity
+from utils.exception_handler import consumer_exception_handler, consumer_batch_exception_handler, \
+    exception_handler
 from utils.exceptions import EXCEPTIONS
+from utils.lambdas import set_invocation_deadline
 
 consumer_service = ConsumerService()
 
@@ -21,11 +24,10 @@ def post_converter_ethereum_events_to_queue(event, context):
     logger.debug(f"Posting ethereum events to queue event={json.dumps(event)}")
     new_format = format_ethereum_event(event=event)
     logger.info(f"Total events received={len(new_format)}")
-    for event in new_format:
-        ConsumerService.post_converter_ethereum_events_to_queue(event)
+    ConsumerService.post_converter_ethereum_events_to_queue(payloads=new_format)
 
 
-@consumer_exception_handler(EXCEPTIONS=EXCEPTIONS, SLACK_HOOK=SLACK_HOOK, logger=logger)
+@consumer_batch_exception_handler(SLACK_HOOK=SLACK_HOOK, REDELIVERY_DELAY=REDELIVERY_DELAY, logger=logger)
 def converter_event_consumer(event, context):
     logger.debug(f"Confirm and trigger transaction process request event={json.dumps(event)}")
     new_format = convert_consumer_event(event=event)
@@ -34,10 +36,18 @@ def converter_event_consumer(event, context):
         consumer_service.converter_event_consumer(payload=event)
 
 
-@consumer_exception_handler(EXCEPTIONS=EXCEPTIONS, SLACK_HOOK=SLACK_HOOK, logger=logger)
+@consumer_batch_exception_handler(SLACK_HOOK=SLACK_HOOK, REDELIVERY_DELAY=REDELIVERY_DELAY, logger=logger)
 def converter_bridge(event, context):
     logger.debug(f"Converter bridge request event={json.dumps(event)}")
     new_format = convert_converter_bridge_event(event=event)
     logger.info(f"Total events received={len(new_format)}")
     for event in new_format:
         consumer_service.converter_bridge(payload=event)
+
+
+@exception_handler(EXCEPTIONS=EXCEPTIONS, SLACK_HOOK=SLACK_HOOK, logger=logger)
+def track_block_confirmations(event, context):
+    logger.debug(f"Job for tracking the block confirmations request={json.dumps(event)}")
+    set_invocation_deadline(context)
+    consumer_service.track_block_confirmations(blockchain_name=event.get(EventConsumerEntity.BLOCKCHAIN_NAME.value))
+    logger.info("Successfully")
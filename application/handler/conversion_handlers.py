@@ -1,6 +1,7 @@
 import os
 import sys
 import json
+from datetime import date
 
 sys.path.append('/opt')
 
@@ -114,7 +115,13 @@ def get_conversion_history(event, context):
         raise BadRequestException(error_code=ErrorCode.PAGE_SIZE_EXCEEDS_LIMIT.value,
                                   error_details=ErrorDetails[ErrorCode.PAGE_SIZE_EXCEEDS_LIMIT.value].value)
 
-    response = conversion_service.get_conversion_history(address=address, page_size=page_size, page_number=page_number)
+    # Cursor pagination is opted into by passing the cursor param, an empty cursor being the first page
+    if ApiParameters.CURSOR.value in query_param:
+        response = conversion_service.get_conversion_history_by_cursor(
+            address=address, page_size=page_size, cursor=query_param.get(ApiParameters.CURSOR.value))
+    else:
+        response = conversion_service.get_conversion_history(address=address, page_size=page_size,
+                                                             page_number=page_number)
 
     return generate_lambda_response(HTTPStatus.OK.value,
                                     make_response_body(status=LambdaResponseStatus.SUCCESS.value, data=response,
@@ -236,6 +243,27 @@ def expire_conversion(event, context):
     logger.info("Successfully")
 
 
+@exception_handler(EXCEPTIONS=EXCEPTIONS, SLACK_HOOK=SLACK_HOOK, logger=logger)
+def reconcile_liquidity_ledger(event, context):
+    logger.debug(f"Job for reconciling the liquidity ledger request={json.dumps(event)}")
+    conversion_service.reconcile_liquidity_ledger()
+    logger.info("Successfully")
+
+
+@exception_handler(EXCEPTIONS=EXCEPTIONS, SLACK_HOOK=SLACK_HOOK, logger=logger)
+def roll_up_conversion_history(event, context):
+    logger.debug(f"Job for rolling up the conversion history request={json.dumps(event)}")
+    try:
+        start_date, end_date = [date.fromisoformat(event[parameter.value]) if event.get(parameter.value) else None
+                                for parameter in [ApiParameters.START_DATE, ApiParameters.END_DATE]]
+    except (TypeError, ValueError):
+        raise BadRequestException(error_code=ErrorCode.INVALID_DATE.value,
+                                  error_details=ErrorDetails[ErrorCode.INVALID_DATE.value].value)
+
+    conversion_service.roll_up_conversion_history(start_date=start_date, end_date=end_date)
+    logger.info("Successfully")
+
+
 @exception_handler(EXCEPTIONS=EXCEPTIONS, SLACK_HOOK=SLACK_HOOK, logger=logger)
 def generate_conversion_report(event, context):
     logger.debug(f"Generating the conversion report request={json.dumps(event)}")
@@ -3,8 +3,8 @@ from common.logger import get_logger
 from infrastructure.repositories.blockchain_repository import BlockchainRepository
 from constants.general import BlockchainName
 from constants.entity import BlockchainEntities
-from utils.general import get_response_from_entities, get_cardano_network_url_and_project_id
-from utils.cardano_blockchain import CardanoBlockchainUtil
+from utils.block_height import get_latest_block_number
+from utils.general import get_response_from_entities
 
 logger = get_logger(__name__)
 
@@ -27,7 +27,5 @@ class BlockchainService:
     def get_cardano_latest_block_no(self):
         cardano_blockchain = self.blockchain_repo.get_blockchain(name=BlockchainName.CARDANO.value)
         chain_id = cardano_blockchain.to_dict().get(BlockchainEntities.CHAIN_ID.value)
-        url, project_id = get_cardano_network_url_and_project_id(chain_id=chain_id)
-        cardano_util = CardanoBlockchainUtil(project_id=project_id, base_url=url)
-        latest_block = cardano_util.get_latest_block().height
+        latest_block = get_latest_block_number(blockchain_name=BlockchainName.CARDANO, chain_id=chain_id)
         return {"latest_block": latest_block}
@@ -3,15 +3,16 @@ import os
 from decimal import Decimal
 from http import HTTPStatus
 
-import requests
-
 from common.logger import get_logger
 from constants.entity import CardanoAPIEntities
 from constants.error_details import ErrorCode
 from utils.exceptions import InternalServerErrorException, BadRequestException
+from utils.http_client import get_cardano_service_client
 
 logger = get_logger(__name__)
 
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
 
 class CardanoService:
 
@@ -22,8 +23,9 @@ class CardanoService:
         if not base_path:
             raise InternalServerErrorException(error_code=ErrorCode.CARDANO_SERVICE_BASE_PATH_NOT_FOUND)
         try:
-            response = requests.get(f"{base_path}/address/derive?token={token_name}", data=json.dumps({}),
-                                    headers={"Content-Type": "application/json"})
+            response = get_cardano_service_client(base_path=base_path).get(
+                endpoint="derive_address", path=f"/address/derive?token={token_name}", data=json.dumps({}),
+                headers={"Content-Type": "application/json"})
 
             if response.status_code != HTTPStatus.OK.value:
                 raise InternalServerErrorException(error_code=ErrorCode.UNEXPECTED_ERROR_ON_CARDANO_SERVICE_CALL)
@@ -51,8 +53,9 @@ class CardanoService:
                                                              tx_details=tx_details)
             payload[CardanoAPIEntities.DEPOSIT_ADDRESS_DETAILS.value] = deposit_address_details
             logger.info(f"Payload for burning ={json.dumps(payload)}")
-            response = requests.post(f"{base_path}/{token}/burn", data=json.dumps(payload),
-                                     headers={"Content-Type": "application/json"})
+            response = get_cardano_service_client(base_path=base_path).post(
+                endpoint="burn", path=f"/{token}/burn", data=json.dumps(payload),
+                headers=CardanoService.generate_headers(conversion_id=conversion_id, operation="burn"))
 
             if response.status_code != HTTPStatus.OK.value:
                 raise InternalServerErrorException(error_code=ErrorCode.UNEXPECTED_ERROR_ON_CARDANO_SERVICE_CALL)
@@ -84,8 +87,9 @@ class CardanoService:
             payload[CardanoAPIEntities.SOURCE_ADDRESS.value] = source_address
             logger.info(f"Payload for minting = {json.dumps(payload)}")
 
-            response = requests.post(f"{base_path}/{token}/mint", data=json.dumps(payload),
-                                     headers={"Content-Type": "application/json"})
+            response = get_cardano_service_client(base_path=base_path).post(
+                endpoint="mint", path=f"/{token}/mint", data=json.dumps(payload),
+                headers=CardanoService.generate_headers(conversion_id=conversion_id, operation="mint"))
 
             if response.status_code != HTTPStatus.OK.value:
                 raise InternalServerErrorException(error_code=ErrorCode.UNEXPECTED_ERROR_ON_CARDANO_SERVICE_CALL)
@@ -119,8 +123,9 @@ class CardanoService:
 
             logger.info(f"Payload for liquidity token transfer = {json.dumps(payload)}")
 
-            response = requests.post(f"{base_path}/{token}/liquidity/transfer", data=json.dumps(payload),
-                                     headers={"Content-Type": "application/json"})
+            response = get_cardano_service_client(base_path=base_path).post(
+                endpoint="liquidity_transfer", path=f"/{token}/liquidity/transfer", data=json.dumps(payload),
+                headers=CardanoService.generate_headers(conversion_id=conversion_id, operation="liquidity_transfer"))
 
             if response.status_code != HTTPStatus.OK.value:
                 raise InternalServerErrorException(error_code=ErrorCode.UNEXPECTED_ERROR_ON_CARDANO_SERVICE_CALL)
@@ -139,7 +144,8 @@ class CardanoService:
         if not base_path:
             raise InternalServerErrorException(error_code=ErrorCode.CARDANO_SERVICE_BASE_PATH_NOT_FOUND)
         try:
-            response = requests.get(f"{base_path}/{token_name}/liquidity")
+            response = get_cardano_service_client(base_path=base_path).get(endpoint="token_liquidity",
+                                                                           path=f"/{token_name}/liquidity")
 
             if response.status_code == HTTPStatus.NOT_FOUND.value:
                 raise BadRequestException(error_code=ErrorCode.NOT_LIQUID_CONTRACT)
@@ -156,6 +162,11 @@ class CardanoService:
         logger.info(f"Response={response}")
         return response
 
+    @staticmethod
+    def generate_headers(conversion_id, operation):
+        # A mint, burn or transfer resent after a timeout carries the same key, so the service can ignore the repeat
+        return {"Content-Type": "application/json", IDEMPOTENCY_KEY_HEADER: f"{conversion_id}-{operation}"}
+
     @staticmethod
     def generate_transaction_detail(hash, environment):
         return {
@@ -1,5 +1,6 @@
 import ast
 import json
+from datetime import timedelta
 from decimal import Decimal
 
 from application.service.blockchain_service import BlockchainService
@@ -10,24 +11,27 @@ from application.service.pooling_service import PoolingService
 from application.service.token_service import TokenService
 from application.service.wallet_pair_service import WalletPairService
 from common.logger import get_logger
-from config import MESSAGE_GROUP_ID, SLACK_HOOK
+from config import MESSAGE_GROUP_ID, SLACK_HOOK, CONFIRMATION_TRACKER_RUN
 from constants.entity import CardanoEventType, BlockchainEntities, CardanoEventConsumer, EventConsumerEntity, \
     WalletPairEntities, ConversionEntities, ConverterBridgeEntities, EthereumEventConsumerEntities, EthereumEventType, \
     TransactionEntities, TokenEntities, ConversionDetailEntities, CardanoAPIEntities, TokenPairEntities, \
     ConversionFeeEntities, MessagePoolEntities, BinanceEventConsumerEntities, BinanceEventType, \
     CardanoServicesEventTypes
 from constants.error_details import ErrorCode, ErrorDetails
-from constants.general import BlockchainName, CreatedBy, QueueName, ConversionOn
+from constants.general import BlockchainName, CreatedBy, QueueName, ConversionOn, ConfirmationTrackerRunEntities
 from constants.status import TransactionStatus, TransactionVisibility, TransactionOperation, \
     ALLOWED_CONVERTER_BRIDGE_TX_OPERATIONS, ConversionStatus, ConversionTransactionStatus
-from utils.general import update_decimal_places, reset_decimal_places, calculate_fee_amount
+from utils.general import update_decimal_places, reset_decimal_places, calculate_fee_amount, datetime_in_utcnow
 from utils.blockchain import get_next_activity_event_on_conversion, validate_consumer_event_against_transaction, \
     generate_deposit_address_details_for_cardano_operation, \
     validate_conversion_request_amount, validate_consumer_event_type, convert_str_to_decimal, \
     get_current_block_confirmation, wait_until_transaction_hash_exists_in_blockchain, \
-    validate_tx_hash_presence_in_blockchain
+    validate_tx_hash_presence_in_blockchain, liquidity_balance_cache, is_redelivery_delayed, is_confirmation_tracked, \
+    get_transaction_block_number
+from utils.block_height import fetch_latest_block_number
 from utils.exception_handler import bridge_exception_handler
 from utils.exceptions import BadRequestException, InternalServerErrorException, BlockConfirmationNotEnoughException
+from utils.lambdas import get_remaining_invocation_time
 
 logger = get_logger(__name__)
 
@@ -42,11 +46,14 @@ class ConsumerService:
         self.pool_service = PoolingService()
 
     @staticmethod
-    def post_converter_ethereum_events_to_queue(payload):
-        logger.info(f"Posting the ethereum event to queue of payload={payload}")
-        NotificationService.send_message_to_queue(queue=QueueName.EVENT_CONSUMER.value, message=json.dumps(payload),
-                                                  message_group_id=None)
-        logger.info("Finished posting message to queue")
+    def post_converter_ethereum_events_to_queue(payloads):
+        logger.info(f"Posting the ethereum events to queue of payloads={payloads}")
+        if not payloads:
+            return
+        NotificationService.send_messages_to_queue(queue=QueueName.EVENT_CONSUMER.value,
+                                                   messages=[json.dumps(payload) for payload in payloads],
+                                                   message_group_id=None)
+        logger.info("Finished posting messages to queue")
 
     def converter_event_consumer(self, payload):
         logger.info(f"Converter event consumer received the payload={payload}")
@@ -150,6 +157,12 @@ class ConsumerService:
         if transaction is None:
             transaction = self.conversion_service.get_transaction_by_hash(tx_hash=tx_hash)
 
+        if is_confirmation_tracked(blockchain_name=db_blockchain_name):
+            self.hand_over_to_confirmation_tracker(tx_id=transaction.get(TransactionEntities.ID.value),
+                                                   blockchain_name=db_blockchain_name, tx_hash=tx_hash,
+                                                   network_id=network_id)
+            return
+
         self.check_and_update_block_confirmation(tx_id=transaction.get(TransactionEntities.ID.value),
                                                  blockchain_name=db_blockchain_name,
                                                  required_block_confirmation=required_block_confirmation,
@@ -158,7 +171,9 @@ class ConsumerService:
         self.conversion_service.update_transaction_by_id(tx_id=transaction.get(TransactionEntities.ID.value),
                                                          tx_status=TransactionStatus.SUCCESS.value)
 
-        conversion_id = conversion.get(ConversionEntities.ID.value)
+        self.process_confirmed_conversion(conversion_id=conversion.get(ConversionEntities.ID.value))
+
+    def process_confirmed_conversion(self, conversion_id):
         logger.info(f"Conversion id= {conversion_id}")
         conversion_complete_detail = self.conversion_service.get_conversion_complete_detail(conversion_id=conversion_id)
 
@@ -170,8 +185,7 @@ class ConsumerService:
         activity_event = get_next_activity_event_on_conversion(conversion_complete_detail).to_dict()
 
         if activity_event:
-            # Getting message pool id
-            message_group = self.pool_service.get_message_group_pool()
+            message_group = self.pool_service.get_message_group_pool(conversion_id=conversion_id)
             if message_group:
                 message_group_id = message_group.get(MessagePoolEntities.MESSAGE_GROUP_ID.value)
             else:
@@ -184,15 +198,13 @@ class ConsumerService:
             NotificationService.send_message_to_queue(queue=queue,
                                                       message=json.dumps(activity_event),
                                                       message_group_id=message_group_id)
-            if message_group:
-                self.pool_service.update_message_pool(id=message_group.get(MessagePoolEntities.ID.value))
         else:
             conversion_transaction_id = conversion_complete_detail \
                 .get(ConversionDetailEntities.TRANSACTIONS.value, {})[0] \
                 .get(TransactionEntities.CONVERSION_TRANSACTION_ID.value)
             self.conversion_service.update_conversion_transaction(conversion_transaction_id=conversion_transaction_id,
                                                                   status=ConversionTransactionStatus.SUCCESS.value)
-            self.conversion_service.update_conversion(conversion_id=conversion.get(ConversionEntities.ID.value),
+            self.conversion_service.update_conversion(conversion_id=conversion_id,
                                                       status=ConversionStatus.SUCCESS.value)
             logger.info("Conversion is done")
 
@@ -270,8 +282,16 @@ class ConsumerService:
             raise BadRequestException(error_code=ErrorCode.TRANSACTION_ALREADY_PROCESSED.value,
                                       error_details=ErrorDetails[ErrorCode.TRANSACTION_ALREADY_PROCESSED.value].value)
 
+        if event_type in [EthereumEventType.TOKEN_MINTED.value, BinanceEventType.TOKEN_MINTED.value]:
+            self.invalidate_liquidity_balance(wallet_pair=wallet_pair)
+
         return conversion
 
+    def invalidate_liquidity_balance(self, wallet_pair):
+        token_pair = self.token_service.get_token_pair_internal(
+            token_pair_id=None, token_pair_row_id=wallet_pair.get(WalletPairEntities.TOKEN_PAIR_ID.value))
+        liquidity_balance_cache.invalidate(key=token_pair.get(TokenPairEntities.ID.value))
+
     def process_cardano_token_received_event(self, blockchain_event, transaction):
         created_by = CreatedBy.BACKEND.value
         fee_amount = Decimal(0)
@@ -405,6 +425,82 @@ class ConsumerService:
 
         return conversion
 
+    def hand_over_to_confirmation_tracker(self, tx_id, blockchain_name, tx_hash, network_id):
+        # The block number is looked up once here, the tracker then advances the confirmations from the chain head
+        block_number = get_transaction_block_number(blockchain_name=blockchain_name, tx_hash=tx_hash,
+                                                    network_id=network_id)
+        if block_number is None:
+            logger.info(f"Transaction tx_hash={tx_hash} is not included in a block yet")
+            raise BlockConfirmationNotEnoughException(
+                error_code=ErrorCode.NOT_ENOUGH_BLOCK_CONFIRMATIONS.value,
+                error_details=ErrorDetails[ErrorCode.NOT_ENOUGH_BLOCK_CONFIRMATIONS.value].value)
+
+        self.conversion_service.set_transaction_block_number(tx_id=tx_id, block_number=block_number)
+        logger.info(f"Transaction tx_hash={tx_hash} is handed over to the {blockchain_name} confirmation tracker")
+
+    def track_block_confirmations(self, blockchain_name):
+        """
+        Advances the confirmations of every transaction of the blockchain waiting for them from a single fetch of
+        the chain head, and processes the conversions of the ones reaching the required block confirmation. A
+        transaction whose conversion fails to be processed is set back to waiting and retried on the next run.
+        Each confirmed transaction stays claimed until its conversion is processed, so the claims left by a run
+        which timed out are processed again once they are older than CLAIM_TIMEOUT.
+        """
+        logger.info(f"Tracking the block confirmations of blockchain_name={blockchain_name}")
+        if not is_confirmation_tracked(blockchain_name=blockchain_name):
+            logger.info(f"Confirmation tracker is not enabled for blockchain_name={blockchain_name}")
+            return
+
+        blockchain_detail = self.blockchain_service.get_blockchain(blockchain_name=blockchain_name)
+        if not blockchain_detail:
+            raise InternalServerErrorException(
+                error_code=ErrorCode.UNSUPPORTED_BLOCKCHAIN_ON_SYSTEM.value,
+                error_details=ErrorDetails[ErrorCode.UNSUPPORTED_BLOCKCHAIN_ON_SYSTEM.value].value)
+
+        latest_block_number = fetch_latest_block_number(
+            blockchain_name=BlockchainName(blockchain_detail.get(BlockchainEntities.NAME.value).capitalize()),
+            chain_id=blockchain_detail.get(BlockchainEntities.CHAIN_ID.value))
+        confirmed_tx_ids = self.conversion_service.update_transaction_confirmations(
+            blockchain_id=blockchain_detail.get(BlockchainEntities.ID.value),
+            latest_block_number=latest_block_number)
+        logger.info(f"Transactions confirmed at block_number={latest_block_number} are {confirmed_tx_ids}")
+
+        claimed_before = datetime_in_utcnow() - timedelta(
+            seconds=CONFIRMATION_TRACKER_RUN.get(ConfirmationTrackerRunEntities.CLAIM_TIMEOUT.value, 300))
+        expired_claim_tx_ids = self.conversion_service.get_expired_transaction_claims(
+            blockchain_id=blockchain_detail.get(BlockchainEntities.ID.value), claimed_before=claimed_before)
+        if expired_claim_tx_ids:
+            logger.info(f"Transactions left unprocessed by an earlier run are {expired_claim_tx_ids}")
+
+        deadline_margin = CONFIRMATION_TRACKER_RUN.get(ConfirmationTrackerRunEntities.DEADLINE_MARGIN.value, 0)
+        errors = []
+        for tx_id, is_expired_claim in [(tx_id, True) for tx_id in expired_claim_tx_ids] + \
+                                       [(tx_id, False) for tx_id in confirmed_tx_ids]:
+            remaining_time = get_remaining_invocation_time()
+            if remaining_time is not None and remaining_time < deadline_margin:
+                logger.info(f"Leaving the transactions from tx_id={tx_id} to the next run, {remaining_time:.1f}s left")
+                break
+
+            if is_expired_claim:
+                is_claimed = self.conversion_service.reclaim_transaction(tx_id=tx_id, claimed_before=claimed_before)
+            else:
+                is_claimed = self.conversion_service.set_transaction_confirmed(tx_id=tx_id)
+            if not is_claimed:
+                logger.info(f"Transaction of tx_id={tx_id} is already confirmed")
+                continue
+            try:
+                conversion = self.conversion_service.get_conversion_detail_by_tx_id(tx_id=tx_id)
+                self.process_confirmed_conversion(conversion_id=conversion.get(ConversionEntities.ID.value))
+                self.conversion_service.release_transaction_claim(tx_id=tx_id)
+            except Exception as e:
+                # The next run of the tracker picks the transaction up again, the others are still processed
+                logger.exception(f"Unable to process the confirmed transaction of tx_id={tx_id}: {repr(e)}")
+                self.conversion_service.set_transaction_waiting_for_confirmation(tx_id=tx_id)
+                errors.append(e)
+
+        if errors:
+            raise errors[0]
+
     def check_and_update_block_confirmation(self, tx_id, blockchain_name, required_block_confirmation,
                                             tx_hash, network_id):
 
@@ -414,8 +510,9 @@ class ConsumerService:
             logger.info(f"Block confirmation is not enough as required confirmation={required_block_confirmation} "
                         f"and current_confirmation={current_block_confirmation}")
             self.conversion_service.update_transaction_by_id(tx_id=tx_id, confirmation=current_block_confirmation)
-            current_block_confirmation = get_current_block_confirmation(blockchain_name=blockchain_name,
-                                                                        tx_hash=tx_hash, network_id=network_id)
+            if not is_redelivery_delayed():
+                current_block_confirmation = get_current_block_confirmation(blockchain_name=blockchain_name,
+                                                                            tx_hash=tx_hash, network_id=network_id)
 
         logger.info(f"Current block confirmation={current_block_confirmation}")
         self.conversion_service.update_transaction_by_id(tx_id=tx_id, confirmation=current_block_confirmation)
@@ -450,16 +547,54 @@ class ConsumerService:
         activity_event_obj = get_next_activity_event_on_conversion(conversion_complete_detail)
         activity_event = activity_event_obj.to_dict()
 
+        submitted_transaction = self.get_submitted_cardano_transaction(
+            conversion_complete_detail=conversion_complete_detail, payload=payload)
         if payload == activity_event:
             self.process_converter_bridge_request(
                 conversion_complete_detail=conversion_complete_detail,
                 payload=payload,
                 conversion_side=activity_event_obj.conversion_side)
             logger.info("Successfully processed the request")
+        elif submitted_transaction:
+            # Redelivered as the transaction submitted for this request was not on the blockchain yet
+            wait_until_transaction_hash_exists_in_blockchain(
+                submitted_transaction.get(TransactionEntities.TRANSACTION_HASH.value),
+                self.get_cardano_network_id(conversion_complete_detail=conversion_complete_detail))
+            logger.info("Submitted transaction is available on the blockchain")
         else:
             logger.info("Unable to match the request activity event")
             raise BadRequestException(error_code=ErrorCode.ACTIVITY_EVENT_NOT_MATCHING)
 
+    @staticmethod
+    def get_submitted_cardano_transaction(conversion_complete_detail, payload):
+        """
+        Last transaction of the conversion when it was submitted to the cardano services for the operation of the
+        payload and is still waiting for its confirmations.
+        """
+        tx_operation = payload.get(ConverterBridgeEntities.BLOCKCHAIN_EVENT.value, {}) \
+                              .get(ConverterBridgeEntities.TX_OPERATION.value)
+        transactions = conversion_complete_detail.get(ConversionDetailEntities.TRANSACTIONS.value, [])
+        if payload.get(ConverterBridgeEntities.BLOCKCHAIN_NAME.value, "").lower() != \
+                BlockchainName.CARDANO.value.lower() or tx_operation not in CardanoServicesEventTypes \
+                or not transactions:
+            return None
+
+        transaction = transactions[-1]
+        if transaction.get(TransactionEntities.TRANSACTION_OPERATION.value) == tx_operation and \
+                transaction.get(TransactionEntities.STATUS.value) == TransactionStatus.WAITING_FOR_CONFIRMATION.value \
+                and transaction.get(TransactionEntities.CREATED_BY.value) == CreatedBy.BACKEND.value:
+            return transaction
+        return None
+
+    @staticmethod
+    def get_cardano_network_id(conversion_complete_detail):
+        to_blockchain = conversion_complete_detail.get(ConversionDetailEntities.TO_TOKEN.value, {}) \
+                                                  .get(TokenEntities.BLOCKCHAIN.value, {})
+        if to_blockchain.get(BlockchainEntities.NAME.value, "").lower() == BlockchainName.CARDANO.value.lower():
+            return to_blockchain.get(BlockchainEntities.CHAIN_ID.value)
+        return conversion_complete_detail.get(ConversionDetailEntities.FROM_TOKEN.value, {}) \
+                                         .get(TokenEntities.BLOCKCHAIN.value, {}).get(BlockchainEntities.CHAIN_ID.value)
+
     def process_converter_bridge_request(self, conversion_complete_detail, payload, conversion_side):
         logger.info("Processing the conversion bridge request")
         db_from_blockchain = conversion_complete_detail.get(ConversionDetailEntities.FROM_TOKEN.value, {}) \
@@ -603,6 +738,10 @@ class ConsumerService:
             logger.info("Invalid tx_operation provided")
             raise InternalServerErrorException(error_code=ErrorCode.INVALID_TRANSACTION_OPERATION_PROVIDED)
 
+        if tx_operation in [TransactionOperation.TOKEN_MINTED.value, TransactionOperation.TOKEN_TRANSFERRED.value]:
+            self.invalidate_liquidity_balance(
+                wallet_pair=conversion_complete_detail.get(ConversionDetailEntities.WALLET_PAIR.value, {}))
+
         if payload_blockchain_name == BlockchainName.CARDANO.value.lower() and (tx_operation in CardanoServicesEventTypes):
             self.conversion_service.create_transaction(
                 conversion_transaction_id=transactions[0].get(TransactionEntities.CONVERSION_TRANSACTION_ID.value),
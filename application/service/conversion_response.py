@@ -209,7 +209,3 @@ def get_transaction_by_hash_response(transaction):
     response[TransactionEntities.CONVERSION_TRANSACTION_ID.value] = transaction[
         TransactionEntities.CONVERSION_TRANSACTION_ID.value]
     return response
-
-
-def get_expiring_conversion_response(conversions):
-    return [conversion[ConversionEntities.ID.value] for conversion in conversions]
@@ -1,4 +1,5 @@
 import json
+from datetime import datetime, timedelta
 from decimal import Decimal
 
 from application.service.conversion_response import get_latest_user_pending_conversion_request_response, \
@@ -6,13 +7,13 @@ from application.service.conversion_response import get_latest_user_pending_conv
     get_conversion_detail_response, get_conversion_history_response, create_conversion_transaction_response, \
     create_transaction_response, create_transaction_for_conversion_response, get_transaction_by_hash_response, \
     claim_conversion_response, \
-    get_conversion_response, update_conversion_response, get_expiring_conversion_response, get_transaction_response
+    get_conversion_response, update_conversion_response, get_transaction_response
 from application.service.token_service import TokenService
 from application.service.wallet_pair_service import WalletPairService
-from common.blockchain_util import BlockChainUtil
 from common.logger import get_logger
 from common.utils import Utils
-from config import SIGNATURE_EXPIRY_BLOCKS, EXPIRE_CONVERSION, CONVERTER_REPORTING_SLACK_HOOK
+from config import SIGNATURE_EXPIRY_BLOCKS, EXPIRE_CONVERSION, CONVERTER_REPORTING_SLACK_HOOK, \
+    EXPIRE_CONVERSION_BATCH_SIZE
 from constants.entity import TokenPairEntities, WalletPairEntities, \
     ConversionEntities, TokenEntities, BlockchainEntities, ConversionDetailEntities, TransactionConversionEntities, \
     TransactionEntities, ConversionFeeEntities, ConverterBridgeEntities, EventConsumerEntity
@@ -20,19 +21,23 @@ from constants.error_details import ErrorCode, ErrorDetails
 from constants.general import BlockchainName, CreatedBy, SignatureTypeEntities, ConversionOn
 from constants.status import ConversionStatus, TransactionVisibility, TransactionStatus
 from infrastructure.repositories.conversion_repository import ConversionRepository
+from infrastructure.repositories.liquidity_repository import LiquidityRepository
 from utils.blockchain import validate_address, validate_conversion_claim_request_signature, \
     validate_conversion_request_amount, convert_str_to_decimal, get_next_activity_event_on_conversion, \
     check_existing_transaction_state, validate_evm_transaction_details_against_conversion, \
     validate_cardano_transaction_details_against_conversion
 from utils.exceptions import BadRequestException, InternalServerErrorException
 from utils.general import get_blockchain_from_token_pair_details, get_response_from_entities, \
-    is_supported_network_conversion, get_evm_network_url, get_offset, paginate_items_response_format, \
-    datetime_in_utcnow, relative_date, datetime_to_str, get_formatted_conversion_status_report, \
-    reset_decimal_places, update_decimal_places, get_cardano_network_url_and_project_id, \
+    is_supported_network_conversion, get_offset, paginate_items_response_format, cursor_pagination_response_format, \
+    encode_pagination_cursor, decode_pagination_cursor, \
+    datetime_in_utcnow, relative_date, get_formatted_conversion_status_report, \
+    reset_decimal_places, update_decimal_places, \
     calculate_fee_amount, calculate_claim_amount_by_conversion_ratio
 from utils.signature import validate_conversion_signature, validate_cardano_conversion_signature, get_signature
-from utils.cardano_blockchain import CardanoBlockchainUtil
-from utils.blockchain import get_converter_contract_balance
+from utils.blockchain import get_converter_contract_balance, get_converter_token_data, \
+    get_cached_converter_balance
+from utils.block_height import get_latest_block_number, get_block_number_lag
+from utils.concurrency import run_concurrently
 
 logger = get_logger(__name__)
 
@@ -41,16 +46,19 @@ class ConversionService:
 
     def __init__(self):
         self.conversion_repo = ConversionRepository()
+        self.liquidity_repo = LiquidityRepository()
         self.token_service = TokenService()
         self.wallet_pair_service = WalletPairService()
 
     def create_conversion(self, wallet_pair_id, deposit_amount, fee_amount, claim_amount,
-                          created_by=CreatedBy.DAPP.value):
+                          created_by=CreatedBy.DAPP.value, from_blockchain_name=None):
         logger.info(f"Creating the conversion with wallet_pair_id={wallet_pair_id}, deposit_amount={deposit_amount}, "
                     f"fee_amount={fee_amount} claim_amount={claim_amount} created_by={created_by}")
+        expire_hours = EXPIRE_CONVERSION.get(from_blockchain_name.upper(), 0) if from_blockchain_name else 0
         conversion = self.conversion_repo.create_conversion(wallet_pair_id=wallet_pair_id,
                                                             deposit_amount=deposit_amount, fee_amount=fee_amount,
-                                                            claim_amount=claim_amount, created_by=created_by)
+                                                            claim_amount=claim_amount, created_by=created_by,
+                                                            expire_hours=expire_hours)
         return create_conversion_response(conversion.to_dict())
 
     def create_conversion_transaction(self, conversion_id, created_by):
@@ -104,19 +112,13 @@ class ConversionService:
 
     def __get_conversion_detail(self, conversion_id):
         logger.info(f"Get the conversion detail for the conversion_id={conversion_id}")
-        conversion_detail = self.conversion_repo.get_conversion_detail(conversion_id=conversion_id)
-        if conversion_detail:
-            conversion_detail = conversion_detail.to_dict()
-            conversion_row_ids = ConversionService.get_conversion_row_ids(conversion_details=[conversion_detail])
-            transaction_details = dict()
-            if conversion_row_ids:
-                transaction_details = self.get_transactions_for_conversion_row_ids(
-                    conversion_row_ids=conversion_row_ids)
-            transaction_details = self.format_transactions_with_conversion(transaction_details=transaction_details)
-            conversion_details = self.add_transaction_detail_to_conversion_detail(
-                conversion_details=[conversion_detail],
-                transaction_details=transaction_details)
-            conversion_detail = conversion_details[0]
+        conversion_aggregate = self.conversion_repo.get_conversion_aggregate(conversion_id=conversion_id)
+        if conversion_aggregate is None:
+            return None
+
+        conversion_detail, transactions = conversion_aggregate
+        conversion_detail = conversion_detail.to_dict()
+        conversion_detail[ConversionDetailEntities.TRANSACTIONS.value] = get_response_from_entities(transactions)
         return conversion_detail
 
     def get_conversion_detail(self, conversion_id):
@@ -167,35 +169,6 @@ class ConversionService:
             token_pair=token_pair,
             blockchain_conversion_type=TokenPairEntities.TO_TOKEN.value)
 
-        # Liquidity check
-        try:
-            # Update decimal places for claim amount
-            from_token_decimals = token_pair.get(TokenPairEntities.FROM_TOKEN.value) \
-                                            .get(TokenEntities.ALLOWED_DECIMAL.value)
-            to_token_decimals = token_pair.get(TokenPairEntities.TO_TOKEN.value) \
-                                          .get(TokenEntities.ALLOWED_DECIMAL.value)
-            claim_amount = update_decimal_places(Decimal(amount),
-                                                 from_decimals=from_token_decimals,
-                                                 to_decimals=to_token_decimals)
-            # Recalculate claim amount by conversion ratio
-            conversion_ratio = token_pair.get(TokenPairEntities.CONVERSION_RATIO.value)
-            if conversion_ratio:
-                claim_amount = calculate_claim_amount_by_conversion_ratio(
-                    amount=claim_amount,
-                    conversion_ratio=Decimal(conversion_ratio)
-                )
-            # TODO[C2C]: Request Cardano liquidity from Cardano Services
-            # Check amount available for claim
-            liquidity_data = self.get_liquidity_balance_data(token_pair_id=token_pair_id)
-            if int(claim_amount) > liquidity_data["available"]:
-                raise BadRequestException(error_code=ErrorCode.INSUFFICIENT_CONTRACT_LIQUIDITY)
-        except BadRequestException as e:
-            if e.error_code == ErrorCode.NOT_LIQUID_CONTRACT.value:
-                # Skipping liquidity check if contract is not liquidity contract
-                pass
-            else:
-                raise e
-
         if not is_supported_network_conversion(from_blockchain=from_blockchain, to_blockchain=to_blockchain):
             logger.exception(f"Unsupported network conversion detected from_blockchain={from_blockchain}, "
                              f"to_blockchain={to_blockchain}")
@@ -215,40 +188,88 @@ class ConversionService:
             chain_id = to_blockchain.get(BlockchainEntities.CHAIN_ID.value)
 
         if signer_blockchain in evm_blockchains:
-            network_url = get_evm_network_url(chain_id=chain_id)
-            evm_web3_object = BlockChainUtil(provider_type="HTTP_PROVIDER", provider=network_url)
-            current_block_no = evm_web3_object.get_current_block_no()
-            last_valid_block_no = current_block_no - SIGNATURE_EXPIRY_BLOCKS[signer_blockchain.name]
-            is_block_number_valid = (last_valid_block_no <= block_number <= current_block_no)
-            is_signature_valid = validate_conversion_signature(token_pair_id=token_pair_id, amount=amount,
-                                                               from_address=from_address, to_address=to_address,
-                                                               block_number=block_number, signature=signature,
-                                                               is_signer_as_from_address=is_signer_as_from_address,
-                                                               chain_id=chain_id)
+            def validate_signature():
+                return validate_conversion_signature(token_pair_id=token_pair_id, amount=amount,
+                                                     from_address=from_address, to_address=to_address,
+                                                     block_number=block_number, signature=signature,
+                                                     is_signer_as_from_address=is_signer_as_from_address,
+                                                     chain_id=chain_id)
         elif signer_blockchain == BlockchainName.CARDANO:
-            url, project_id = get_cardano_network_url_and_project_id(chain_id=chain_id)
-            cardano_blockchain = CardanoBlockchainUtil(project_id=project_id, base_url=url)
-            current_block_no = cardano_blockchain.get_latest_block().height
-            last_valid_block_no = current_block_no - SIGNATURE_EXPIRY_BLOCKS[signer_blockchain.name]
-            is_block_number_valid = (last_valid_block_no <= block_number <= current_block_no)
-            is_signature_valid = validate_cardano_conversion_signature(token_pair_id, amount, from_address, to_address,
-                                                                       block_number, signature, key,
-                                                                       is_signer_as_from_address)
+            def validate_signature():
+                return validate_cardano_conversion_signature(token_pair_id, amount, from_address, to_address,
+                                                             block_number, signature, key, is_signer_as_from_address)
         else:
             logger.error(f"Unsupported signer blockchain provided: {signer_blockchain}")
             raise BadRequestException(error_code=ErrorCode.UNSUPPORTED_BLOCKCHAIN_ON_SYSTEM)
 
+        # Update decimal places for claim amount
+        from_token_decimals = token_pair.get(TokenPairEntities.FROM_TOKEN.value) \
+                                        .get(TokenEntities.ALLOWED_DECIMAL.value)
+        to_token_decimals = token_pair.get(TokenPairEntities.TO_TOKEN.value) \
+                                      .get(TokenEntities.ALLOWED_DECIMAL.value)
+        claim_amount = update_decimal_places(Decimal(amount),
+                                             from_decimals=from_token_decimals,
+                                             to_decimals=to_token_decimals)
+        # Recalculate claim amount by conversion ratio
+        conversion_ratio = token_pair.get(TokenPairEntities.CONVERSION_RATIO.value)
+        if conversion_ratio:
+            claim_amount = calculate_claim_amount_by_conversion_ratio(
+                amount=claim_amount,
+                conversion_ratio=Decimal(conversion_ratio)
+            )
+
+        # The db reads are done here, the remote checks below run concurrently and must not use the db session
+        to_token_data = get_converter_token_data(token_pair_id=token_pair_id)
+        locked_tokens, frozen_tokens = self.__get_reserved_liquidity(token_pair_id=token_pair_id)
+
+        # Given in the order the checks used to run one after the other, the error of the first failing one is raised
+        run_concurrently({
+            "liquidity": lambda: ConversionService.__validate_liquidity(
+                token_pair_id=token_pair_id, to_token_data=to_token_data, claim_amount=claim_amount,
+                locked_tokens=locked_tokens, frozen_tokens=frozen_tokens),
+            "block_number": lambda: ConversionService.__validate_signature_block_number(
+                signer_blockchain=signer_blockchain, chain_id=chain_id, block_number=block_number),
+            "signature": lambda: ConversionService.__validate_signature(is_signature_valid=validate_signature()),
+            "address": lambda: validate_address(from_address=from_address, to_address=to_address,
+                                                from_blockchain=from_blockchain, to_blockchain=to_blockchain)
+        })
+
+    @staticmethod
+    def __validate_liquidity(token_pair_id, to_token_data, claim_amount, locked_tokens, frozen_tokens):
+        # TODO[C2C]: Request Cardano liquidity from Cardano Services
+        # Check amount available for claim
+        try:
+            current_liquidity_balance = get_cached_converter_balance(token_pair_id=token_pair_id,
+                                                                     to_token_data=to_token_data)
+            liquidity_data = ConversionService.__get_liquidity_balance_data(
+                current_liquidity_balance=current_liquidity_balance, locked_tokens=locked_tokens,
+                frozen_tokens=frozen_tokens)
+            if int(claim_amount) > liquidity_data["available"]:
+                raise BadRequestException(error_code=ErrorCode.INSUFFICIENT_CONTRACT_LIQUIDITY)
+        except BadRequestException as e:
+            if e.error_code == ErrorCode.NOT_LIQUID_CONTRACT.value:
+                # Skipping liquidity check if contract is not liquidity contract
+                pass
+            else:
+                raise e
+
+    @staticmethod
+    def __validate_signature_block_number(signer_blockchain, chain_id, block_number):
+        # The cached height can be a block behind, so the signed block number may be ahead of it by that lag
+        current_block_no = get_latest_block_number(blockchain_name=signer_blockchain, chain_id=chain_id)
+        last_valid_block_no = current_block_no - SIGNATURE_EXPIRY_BLOCKS[signer_blockchain.name]
+        is_block_number_valid = (last_valid_block_no <= block_number <=
+                                 current_block_no + get_block_number_lag(blockchain_name=signer_blockchain))
         if not is_block_number_valid:
             raise BadRequestException(error_code=ErrorCode.SIGNATURE_EXPIRED.value,
                                       error_details=ErrorDetails[ErrorCode.SIGNATURE_EXPIRED.value].value)
 
+    @staticmethod
+    def __validate_signature(is_signature_valid):
         if not is_signature_valid:
             raise BadRequestException(error_code=ErrorCode.INCORRECT_SIGNATURE.value,
                                       error_details=ErrorDetails[ErrorCode.INCORRECT_SIGNATURE.value].value)
 
-        validate_address(from_address=from_address, to_address=to_address, from_blockchain=from_blockchain,
-                         to_blockchain=to_blockchain)
-
     def create_conversion_request(self, token_pair_id, amount, from_address, to_address, block_number, signature, key):
         logger.info(f"Creating the conversion request for token_pair_id={token_pair_id}, amount={amount}, "
                     f"from_address={from_address}, to_address={to_address}, block_number={block_number}, "
@@ -413,7 +434,7 @@ class ConversionService:
                 )
             conversion = self.create_conversion(wallet_pair_id=wallet_pair_id, deposit_amount=deposit_amount,
                                                 fee_amount=fee_amount, claim_amount=claim_amount,
-                                                created_by=created_by)
+                                                created_by=created_by, from_blockchain_name=from_blockchain_name)
         return conversion
 
     def get_token_contract_address_for_conversion_id(self, conversion_on, conversion_id):
@@ -445,6 +466,36 @@ class ConversionService:
                                               total_records=total_conversion_history,
                                               page_number=page_number, page_size=page_size)
 
+    def get_conversion_history_by_cursor(self, address, page_size, cursor):
+        logger.info(f"Getting the conversion history for the given address={address}, page_size={page_size}, "
+                    f"cursor={cursor}")
+        status_rank, created_at, row_id = None, None, None
+        if cursor:
+            status_rank, created_at, row_id = ConversionService.__get_conversion_history_cursor_key(cursor=cursor)
+
+        # One extra row tells whether there is a next page, so the history never has to be counted
+        conversion_history_page = self.conversion_repo.get_conversion_history_after(
+            address=address, limit=page_size + 1, status_rank=status_rank, created_at=created_at, row_id=row_id)
+
+        next_cursor = None
+        if len(conversion_history_page) > page_size:
+            conversion_history_page = conversion_history_page[:page_size]
+            last_status_rank, last_created_at, last_row_id = conversion_history_page[-1][1]
+            next_cursor = encode_pagination_cursor([last_status_rank, last_created_at.isoformat(), last_row_id])
+
+        conversion_history = get_response_from_entities([conversion for conversion, _ in conversion_history_page])
+        return cursor_pagination_response_format(items=get_conversion_history_response(conversion_history),
+                                                 next_cursor=next_cursor, page_size=page_size)
+
+    @staticmethod
+    def __get_conversion_history_cursor_key(cursor):
+        try:
+            status_rank, created_at, row_id = decode_pagination_cursor(cursor=cursor)
+            return int(status_rank), datetime.fromisoformat(created_at), int(row_id)
+        except (TypeError, ValueError):
+            raise BadRequestException(error_code=ErrorCode.INVALID_PAGINATION_CURSOR.value,
+                                      error_details=ErrorDetails[ErrorCode.INVALID_PAGINATION_CURSOR.value].value)
+
     @staticmethod
     def get_conversion_row_ids(conversion_details):
         return [conversion_detail.get(ConversionDetailEntities.CONVERSION.value).get(ConversionEntities.ROW_ID.value)
@@ -558,6 +609,37 @@ class ConversionService:
                                                       confirmation=confirmation, tx_status=tx_status,
                                                       created_by=created_by)
 
+    def set_transaction_block_number(self, tx_id, block_number):
+        logger.info(f"Setting the block number={block_number} of the transaction of tx_id={tx_id}")
+        self.conversion_repo.set_transaction_block_number(tx_id=tx_id, block_number=block_number)
+
+    def update_transaction_confirmations(self, blockchain_id, latest_block_number):
+        logger.info(f"Updating the transaction confirmations of blockchain_id={blockchain_id} to the "
+                    f"latest_block_number={latest_block_number}")
+        return self.conversion_repo.update_transaction_confirmations(blockchain_id=blockchain_id,
+                                                                     latest_block_number=latest_block_number)
+
+    def set_transaction_confirmed(self, tx_id):
+        logger.info(f"Setting the transaction of tx_id={tx_id} as confirmed")
+        return self.conversion_repo.set_transaction_confirmed(tx_id=tx_id)
+
+    def set_transaction_waiting_for_confirmation(self, tx_id):
+        logger.info(f"Setting the transaction of tx_id={tx_id} back to waiting for confirmation")
+        self.conversion_repo.set_transaction_waiting_for_confirmation(tx_id=tx_id)
+
+    def release_transaction_claim(self, tx_id):
+        logger.info(f"Releasing the claim on the transaction of tx_id={tx_id}")
+        self.conversion_repo.release_transaction_claim(tx_id=tx_id)
+
+    def get_expired_transaction_claims(self, blockchain_id, claimed_before):
+        logger.info(f"Getting the transactions of blockchain_id={blockchain_id} claimed before {claimed_before}")
+        return self.conversion_repo.get_expired_transaction_claims(blockchain_id=blockchain_id,
+                                                                   claimed_before=claimed_before)
+
+    def reclaim_transaction(self, tx_id, claimed_before):
+        logger.info(f"Reclaiming the transaction of tx_id={tx_id}")
+        return self.conversion_repo.reclaim_transaction(tx_id=tx_id, claimed_before=claimed_before)
+
     def get_transaction_by_hash(self, tx_hash):
         logger.info(f"Getting the transaction by tx_hash={tx_hash}")
         transaction = self.conversion_repo.get_transaction_by_hash(tx_hash)
@@ -605,11 +687,22 @@ class ConversionService:
     def get_liquidity_balance_data(self, token_pair_id: str):
         logger.info(f"Retrieving liquidity balance for token_pair_id {token_pair_id}")
 
-        locked_tokens = self.conversion_repo.get_processing_claim_amount_for_token_pair(token_pair_id)
-        frozen_tokens = self.conversion_repo.get_initiated_claim_amount_for_token_pair(token_pair_id)
-
+        locked_tokens, frozen_tokens = self.__get_reserved_liquidity(token_pair_id=token_pair_id)
         current_liquidity_balance = get_converter_contract_balance(token_pair_id)
 
+        return ConversionService.__get_liquidity_balance_data(current_liquidity_balance=current_liquidity_balance,
+                                                              locked_tokens=locked_tokens,
+                                                              frozen_tokens=frozen_tokens)
+
+    def __get_reserved_liquidity(self, token_pair_id: str):
+        locked_tokens = self.liquidity_repo.get_locked_amount(token_pair_id=token_pair_id)
+        # Frozen tokens are the user initiated conversions of the last minutes, a time window can't be kept as a
+        # counter so it stays a sum, bounded to those minutes by the conversion status index
+        frozen_tokens = self.conversion_repo.get_initiated_claim_amount_for_token_pair(token_pair_id)
+        return locked_tokens, frozen_tokens
+
+    @staticmethod
+    def __get_liquidity_balance_data(current_liquidity_balance, locked_tokens, frozen_tokens):
         if current_liquidity_balance is None:
             raise BadRequestException(error_code=ErrorCode.NOT_LIQUID_CONTRACT)
 
@@ -622,30 +715,73 @@ class ConversionService:
 
         return data
 
+    def reconcile_liquidity_ledger(self):
+        mismatches = []
+        for token_pair_id in self.liquidity_repo.get_token_pair_ids():
+            ledger_amount, locked_amount = self.liquidity_repo.reconcile_locked_amount(token_pair_id=token_pair_id)
+            if ledger_amount != locked_amount:
+                logger.error(f"Liquidity ledger mismatch for token_pair_id={token_pair_id}, "
+                             f"ledger_amount={ledger_amount}, locked_amount={locked_amount}")
+                mismatches.append(f"token_pair_id={token_pair_id} ledger={ledger_amount} locked={locked_amount}")
+
+        if mismatches:
+            Utils().report_slack(slack_msg="Corrected the liquidity ledger of " + ", ".join(mismatches),
+                                 SLACK_HOOK=CONVERTER_REPORTING_SLACK_HOOK)
+        return mismatches
+
     def expire_conversion(self):
-        current_datetime = datetime_in_utcnow()
-        cardano_expire_datetime = relative_date(date_time=current_datetime, hours=EXPIRE_CONVERSION.get("CARDANO", 0))
-        ethereum_expire_datetime = relative_date(date_time=current_datetime, hours=EXPIRE_CONVERSION.get("ETHEREUM", 0))
-        binance_expire_datetime = relative_date(date_time=current_datetime, hours=EXPIRE_CONVERSION.get("BINANCE", 0))
-        print(f"Expiring the conversion of ethereum, cardano and binance which is less than or equal to "
-              f"{ethereum_expire_datetime}, {cardano_expire_datetime} or {binance_expire_datetime} respectively ")
-        conversions = self.conversion_repo.get_expiring_conversion(
-            ethereum_expire_datetime=ethereum_expire_datetime,
-            cardano_expire_datetime=cardano_expire_datetime,
-            binance_expire_datetime=binance_expire_datetime)
-        conversion_ids = get_expiring_conversion_response(get_response_from_entities(conversions))
-        print(f"Expiring conversions total={len(conversion_ids)} conversion_ids={conversion_ids}")
-        self.conversion_repo.set_conversions_to_expire(conversion_ids=conversion_ids)
+        expire_datetime = datetime_in_utcnow()
+        logger.info(f"Expiring the conversions which expire at or before {expire_datetime}")
+        total_expired = 0
+        while True:
+            expired = self.conversion_repo.expire_conversions(expire_datetime=expire_datetime,
+                                                              batch_size=EXPIRE_CONVERSION_BATCH_SIZE)
+            total_expired += expired
+            if expired < EXPIRE_CONVERSION_BATCH_SIZE:
+                break
+        logger.info(f"Expiring conversions total={total_expired}")
 
     def generate_conversion_report(self):
         current_date = datetime_in_utcnow().date()
-        previous_date_str = datetime_to_str(relative_date(current_date, days=1))
+        previous_date = relative_date(current_date, days=1)
+
+        # Roll up the days closed since the last run, the history before the first rollup is filled by
+        # roll_up_conversion_history
+        last_rollup_date = self.conversion_repo.get_last_rollup_date()
+        start_date = last_rollup_date + timedelta(days=1) if last_rollup_date else previous_date
+        self.roll_up_conversions(start_date=start_date, end_date=previous_date)
 
         # Generate report only for previous date
-        self.__generate_conversion_report(start_date=previous_date_str, end_date=previous_date_str)
+        self.__generate_conversion_report(start_date=previous_date, end_date=previous_date)
 
         # Generate report till previous date
-        self.__generate_conversion_report(start_date=None, end_date=previous_date_str)
+        self.__generate_conversion_report(start_date=None, end_date=previous_date)
+
+    def roll_up_conversion_history(self, start_date=None, end_date=None):
+        current_date = datetime_in_utcnow().date()
+        start_date = start_date or self.conversion_repo.get_first_conversion_date()
+        end_date = min(end_date or current_date, relative_date(current_date, days=1))
+        if start_date is None:
+            logger.info("No conversion to roll up")
+            return
+        self.roll_up_conversions(start_date=start_date, end_date=end_date)
+
+    def roll_up_conversions(self, start_date, end_date):
+        """
+        Rolls up each closed day from start_date to end_date, along with the earlier days holding conversions updated
+        since the start of the last run. Only those can have changed their status, so a day whose conversions never
+        reach a final status is not rolled up on every run.
+        """
+        rolled_up_at = datetime_in_utcnow()
+        dates = {start_date + timedelta(days=days) for days in range((end_date - start_date).days + 1)}
+        last_rollup_run_time = self.conversion_repo.get_last_rollup_run_time()
+        if last_rollup_run_time:
+            dates.update(self.conversion_repo.get_updated_conversion_dates(updated_since=last_rollup_run_time,
+                                                                           before_date=start_date))
+        logger.info(f"Rolling up the conversions of {len(dates)} days from start_date={start_date} and "
+                    f"end_date={end_date}")
+        for date in sorted(dates):
+            self.conversion_repo.roll_up_conversions(date=date, rolled_up_at=rolled_up_at)
 
     def __generate_conversion_report(self, start_date, end_date):
         logger.info(f"Getting the conversion report from start_date={start_date} and end_date={end_date}")
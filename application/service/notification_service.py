@@ -14,3 +14,7 @@ class NotificationService:
     @staticmethod
     def send_message_to_queue(queue, message, message_group_id):
         SqsService.send_message_to_queue(queue=queue, message=message, message_group_id=message_group_id)
+
+    @staticmethod
+    def send_messages_to_queue(queue, messages, message_group_id):
+        SqsService.send_messages_to_queue(queue=queue, messages=messages, message_group_id=message_group_id)
@@ -1,19 +1,42 @@
+import hashlib
+
 from common.logger import get_logger
+from config import CACHE_TTL
+from constants.entity import MessagePoolEntities
+from constants.general import CacheTTLEntities
 from infrastructure.repositories.pooling_repository import PoolingRepository
+from utils.cache import TTLCache
+from utils.general import get_response_from_entities
 
 logger = get_logger(__name__)
 
+ENABLED_MESSAGE_GROUP_POOLS = "ENABLED"
+
+message_group_pool_cache = TTLCache(name="message_group_pool",
+                                    ttl=CACHE_TTL.get(CacheTTLEntities.MESSAGE_GROUP_POOL.value, 0))
+
 
 class PoolingService:
 
     def __init__(self):
         self.pooling_repo = PoolingRepository()
 
-    def get_message_group_pool(self):
-        logger.info("Getting the message group pool which is last least used for processing")
-        message_pool = self.pooling_repo.get_message_group_pool()
-        return message_pool.to_dict() if message_pool else None
+    def get_message_group_pool(self, conversion_id):
+        """
+        Picks the enabled message group of the conversion from a stable hash of its id, so the conversions spread
+        evenly over the groups without writing anything and every event of a conversion lands on the same group.
+        """
+        message_pools = message_group_pool_cache.get_or_load(key=ENABLED_MESSAGE_GROUP_POOLS,
+                                                             loader=self.__get_enabled_message_group_pools)
+        if not message_pools:
+            return None
+
+        digest = hashlib.sha256(conversion_id.encode("utf-8")).digest()
+        message_pool = message_pools[int.from_bytes(digest[:8], "big") % len(message_pools)]
+        logger.info(f"Message group pool id={message_pool.get(MessagePoolEntities.ID.value)} picked for the "
+                    f"conversion id={conversion_id}")
+        return message_pool
 
-    def update_message_pool(self, id):
-        logger.info(f"Updating the message pool id={id}")
-        self.pooling_repo.update_message_pool(id=id)
+    def __get_enabled_message_group_pools(self):
+        logger.info("Getting the enabled message group pools")
+        return get_response_from_entities(self.pooling_repo.get_enabled_message_group_pools())
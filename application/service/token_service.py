@@ -1,11 +1,18 @@
 from application.service.token_reponse import get_all_token_pair_response, get_token_pair_response, \
     get_token_pair_internal_response
 from common.logger import get_logger
+from config import CACHE_TTL
+from constants.entity import TokenPairEntities
+from constants.general import CacheTTLEntities
 from infrastructure.repositories.token_repository import TokenRepository
+from utils.cache import TTLCache
 from utils.general import get_response_from_entities
 
 logger = get_logger(__name__)
 
+# Shared by every TokenService instance of the container, entries are stored under both the id and the row_id
+token_pair_cache = TTLCache(name="token_pair", ttl=CACHE_TTL.get(CacheTTLEntities.TOKEN_PAIR.value, 0))
+
 
 class TokenService:
 
@@ -19,10 +26,54 @@ class TokenService:
 
     def get_token_pair(self, token_pair_id):
         logger.info(f"Getting the token pair for the given id={token_pair_id}")
-        token_pair = self.token_repo.get_token_pair(token_pair_id=token_pair_id)
-        return get_token_pair_response(token_pair.to_dict())
+        token_pair = self.__get_token_pair_detail(token_pair_id=token_pair_id)
+        return get_token_pair_response(token_pair)
 
     def get_token_pair_internal(self, token_pair_id, token_pair_row_id=None):
         logger.info(f"Getting the token pair for the given id={token_pair_id} or token_pair_row_id={token_pair_row_id}")
-        token_pair = self.token_repo.get_token_pair(token_pair_id=token_pair_id, token_pair_row_id=token_pair_row_id)
-        return get_token_pair_internal_response(token_pair.to_dict())
+        token_pair = self.__get_token_pair_detail(token_pair_id=token_pair_id, token_pair_row_id=token_pair_row_id)
+        return get_token_pair_internal_response(token_pair)
+
+    def __get_token_pair_detail(self, token_pair_id, token_pair_row_id=None):
+        token_pair = TokenService.get_cached_token_pair(token_pair_id=token_pair_id,
+                                                        token_pair_row_id=token_pair_row_id)
+        if token_pair is None:
+            token_pair = self.token_repo.get_token_pair(token_pair_id=token_pair_id,
+                                                        token_pair_row_id=token_pair_row_id).to_dict()
+            token_pair_cache.set(key=(TokenPairEntities.ID.value, token_pair[TokenPairEntities.ID.value]),
+                                 value=token_pair)
+            token_pair_cache.set(key=(TokenPairEntities.ROW_ID.value, token_pair[TokenPairEntities.ROW_ID.value]),
+                                 value=token_pair)
+        return token_pair
+
+    @staticmethod
+    def get_cached_token_pair(token_pair_id, token_pair_row_id=None):
+        if token_pair_id:
+            token_pair = token_pair_cache.get(key=(TokenPairEntities.ID.value, token_pair_id))
+        elif token_pair_row_id:
+            token_pair = token_pair_cache.get(key=(TokenPairEntities.ROW_ID.value, token_pair_row_id))
+        else:
+            return None
+
+        if token_pair and token_pair_row_id and token_pair[TokenPairEntities.ROW_ID.value] != token_pair_row_id:
+            return None
+        return token_pair
+
+    @staticmethod
+    def invalidate_token_pair_cache(token_pair_id=None, token_pair_row_id=None):
+        """
+        Has to be called whenever is_enabled or the conversion fee of a token pair changes, without any
+        arguments the whole cache is dropped.
+        """
+        logger.info(f"Invalidating the token pair cache for id={token_pair_id}, row_id={token_pair_row_id}")
+        if not token_pair_id and not token_pair_row_id:
+            token_pair_cache.clear()
+            return
+
+        token_pair = TokenService.get_cached_token_pair(token_pair_id=token_pair_id,
+                                                        token_pair_row_id=token_pair_row_id)
+        if token_pair:
+            token_pair_id = token_pair[TokenPairEntities.ID.value]
+            token_pair_row_id = token_pair[TokenPairEntities.ROW_ID.value]
+        token_pair_cache.invalidate(key=(TokenPairEntities.ID.value, token_pair_id))
+        token_pair_cache.invalidate(key=(TokenPairEntities.ROW_ID.value, token_pair_row_id))
@@ -7,6 +7,12 @@ NETWORK = {
         "DB_NAME": "converter_unittest_db",
         "DB_PORT": 3306,
         "DB_LOGGING": True,
+        # QUEUE, NULL or RDS_PROXY
+        "DB_POOL_MODE": "QUEUE",
+        "DB_POOL_SIZE": 1,
+        "DB_MAX_OVERFLOW": 2,
+        "DB_POOL_RECYCLE": 3600,
+        "DB_POOL_TIMEOUT": 10,
     },
 }
 
@@ -100,8 +106,55 @@ QUEUE_DETAILS = {
 TOKEN_CONTRACT_PATH = {
 }
 
-MAX_RETRY = {"BLOCK_CONFIRMATION": 0, "TRANSACTION_HASH_PRESENCE": 0}
-SLEEP_TIME = {"BLOCK_CONFIRMATION": 0, "TRANSACTION_HASH_PRESENCE": 0}
+MAX_RETRY = {"BLOCK_CONFIRMATION": 0, "TRANSACTION_HASH_PRESENCE": 0, "SQS_SEND_MESSAGE_BATCH": 2}
+# SQS_SEND_MESSAGE_BATCH is the backoff of the retries of failed batch entries, doubled on every retry with jitter
+SLEEP_TIME = {"BLOCK_CONFIRMATION": 0, "TRANSACTION_HASH_PRESENCE": 0, "SQS_SEND_MESSAGE_BATCH": 0.1}
+# In Seconds, when set a transaction that is not confirmed yet is not waited for inside the lambda, its message is
+# redelivered after this delay, doubled on every attempt up to MAX. 0 keeps the sleep and retry. On the standard event
+# consumer queue the message is sent again up to MAX_RETRY BLOCK_CONFIRMATION times. On the fifo converter bridge
+# queues every check uses up a receive, so bridgeQueueRetry in serverless.yml bounds the attempts there
+REDELIVERY_DELAY = {"BLOCK_CONFIRMATION": 0, "MAX": 900}
+
+# Timeouts and backoff in seconds. The circuit opens after FAILURE_THRESHOLD consecutive failed calls and fails the
+# calls fast for RESET_TIMEOUT seconds. A mint, burn or transfer is waited for until DEADLINE_MARGIN seconds before the
+# lambda times out, or WRITE_READ_TIMEOUT outside of an sqs handler, as giving up on it leads to it being sent again
+CARDANO_SERVICE_CLIENT = {"CONNECT_TIMEOUT": 5, "READ_TIMEOUT": 60, "WRITE_READ_TIMEOUT": 280, "DEADLINE_MARGIN": 5,
+                          "MAX_RETRY": 2, "RETRY_BACKOFF": 0.5, "FAILURE_THRESHOLD": 5, "RESET_TIMEOUT": 30}
+
+# In Seconds, 0 disables the cache
+# SECRET_VERSION is how long a cached secret is used before its version is checked again for a rotation
+CACHE_TTL = {"TOKEN_PAIR": 0, "BLOCKCHAIN": 0, "CONTRACT": 0, "SECRET": 0, "SECRET_VERSION": 60,
+             "LIQUIDITY_BALANCE": 0, "MESSAGE_GROUP_POOL": 0}
+# In Seconds, how long an expired entry is still served while it is refreshed in the background
+CACHE_STALE_TTL = {"LIQUIDITY_BALANCE": 0}
+# Number of entries kept by the caches of immutable data, 0 disables the cache
+CACHE_MAX_SIZE = {"CARDANO_TRANSACTION_UTXOS": 1000, "CARDANO_ADDRESS": 10000}
+
+# In Seconds, the block time of each chain, the latest block height is cached that long. 0 disables the cache
+BLOCK_INTERVAL = {
+    "CARDANO": 0,
+    "ETHEREUM": 0,
+    "BINANCE": 0
+}
+# Number of blocks a cached height can be behind the one the user signed, which can come from the cache of another
+# container. Cardano blocks arrive at random, so several of them can land within one BLOCK_INTERVAL
+MAX_CACHED_BLOCK_LAG = {
+    "CARDANO": 8,
+    "ETHEREUM": 2,
+    "BINANCE": 2
+}
+
+# Chains whose transaction confirmations are advanced by the scheduled confirmation tracker instead of each event
+# consumer polling its own transaction
+CONFIRMATION_TRACKER = {
+    "CARDANO": False,
+    "ETHEREUM": False,
+    "BINANCE": False
+}
+# In Seconds, a run of the tracker takes no new transaction DEADLINE_MARGIN seconds before the lambda times out. A
+# confirmed transaction stays claimed by the run processing its conversion, a claim older than CLAIM_TIMEOUT was
+# left by a run that did not finish and is processed again by the next run
+CONFIRMATION_TRACKER_RUN = {"DEADLINE_MARGIN": 10, "CLAIM_TIMEOUT": 300}
 
 SIGNATURE_EXPIRY_BLOCKS = {
     "CARDANO": 0,
@@ -117,3 +170,5 @@ EXPIRE_CONVERSION = {
     "ETHEREUM": 0,
     "BINANCE": 0
 }
+# Conversions expired per statement, it bounds the size of each transaction of the expiry job
+EXPIRE_CONVERSION_BATCH_SIZE = 1000
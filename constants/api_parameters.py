@@ -13,7 +13,10 @@ class ApiParameters(Enum):
     TRANSACTION_HASH = "transaction_hash"
     PAGE_SIZE = "page_size"
     PAGE_NUMBER = "page_number"
+    CURSOR = "cursor"
     ADDRESS = "address"
     ETHEREUM_ADDRESS = "ethereum_address"
+    START_DATE = "start_date"
+    END_DATE = "end_date"
 
 
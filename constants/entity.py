@@ -154,6 +154,7 @@ class PaginationEntity(Enum):
     LIMIT = "limit"
     TOTAL_RECORDS = "total_records"
     PAGE_COUNT = "page_count"
+    NEXT_CURSOR = "next_cursor"
 
 
 class EventConsumerEntity(Enum):
@@ -274,6 +275,33 @@ class SQSEntities(Enum):
     QUEUE_URL = "QueueUrl"
     MESSAGE_BODY = "MessageBody"
     MESSAGE_GROUP_ID = "MessageGroupId"
+    ENTRIES = "Entries"
+    ID = "Id"
+    FAILED = "Failed"
+    SENDER_FAULT = "SenderFault"
+    RECEIPT_HANDLE = "ReceiptHandle"
+    VISIBILITY_TIMEOUT = "VisibilityTimeout"
+    DELAY_SECONDS = "DelaySeconds"
+    MESSAGE_ATTRIBUTES = "MessageAttributes"
+    DATA_TYPE = "DataType"
+    STRING_VALUE = "StringValue"
+    ATTEMPT = "attempt"
+
+
+class SQSEventEntities(Enum):
+    RECORDS = "Records"
+    MESSAGE_ID = "messageId"
+    ATTRIBUTES = "attributes"
+    MESSAGE_GROUP_ID = "MessageGroupId"
+    APPROXIMATE_RECEIVE_COUNT = "ApproximateReceiveCount"
+    RECEIPT_HANDLE = "receiptHandle"
+    EVENT_SOURCE_ARN = "eventSourceARN"
+    BODY = "body"
+    MESSAGE_ATTRIBUTES = "messageAttributes"
+    DATA_TYPE = "dataType"
+    STRING_VALUE = "stringValue"
+    BATCH_ITEM_FAILURES = "batchItemFailures"
+    ITEM_IDENTIFIER = "itemIdentifier"
 
 
 class ConversionReportingEntities(Enum):
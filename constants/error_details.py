@@ -85,6 +85,8 @@ class ErrorCode(Enum):
     INVALID_ADDRESS = "E0081"
     CARDANO_SERVICE_BASE_PATH_NOT_FOUND = "E0082"
     BLOCKCHAIN_EVENT_DATA_DOES_NOT_MATCH_DATABASE_DATA = "E0083"
+    INVALID_PAGINATION_CURSOR = "E0084"
+    INVALID_DATE = "E0085"
 
 
 class ErrorDetails(Enum):
@@ -171,3 +173,5 @@ class ErrorDetails(Enum):
     E0081 = "The provided address is not valid"
     E0082 = "CARDANO_SERVICE_BASE_PATH not found in environment variables"
     E0083 = "Data from the blockchain event does not match the transaction or conversion data from the DB"
+    E0084 = "The provided pagination cursor is not valid"
+    E0085 = "The provided date is not valid, expected format is YYYY-MM-DD"
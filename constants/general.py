@@ -40,11 +40,55 @@ class SignatureTypeEntities(Enum):
 class MaxRetryEntities(Enum):
     BLOCK_CONFIRMATION = "BLOCK_CONFIRMATION"
     TRANSACTION_HASH_PRESENCE = "TRANSACTION_HASH_PRESENCE"
+    SQS_SEND_MESSAGE_BATCH = "SQS_SEND_MESSAGE_BATCH"
+
+
+class HttpClientEntities(Enum):
+    CONNECT_TIMEOUT = "CONNECT_TIMEOUT"
+    READ_TIMEOUT = "READ_TIMEOUT"
+    WRITE_READ_TIMEOUT = "WRITE_READ_TIMEOUT"
+    DEADLINE_MARGIN = "DEADLINE_MARGIN"
+    MAX_RETRY = "MAX_RETRY"
+    RETRY_BACKOFF = "RETRY_BACKOFF"
+    FAILURE_THRESHOLD = "FAILURE_THRESHOLD"
+    RESET_TIMEOUT = "RESET_TIMEOUT"
+
+
+class ConfirmationTrackerRunEntities(Enum):
+    DEADLINE_MARGIN = "DEADLINE_MARGIN"
+    CLAIM_TIMEOUT = "CLAIM_TIMEOUT"
 
 
 class SleepTimeEntities(Enum):
     BLOCK_CONFIRMATION = "BLOCK_CONFIRMATION"
     TRANSACTION_HASH_PRESENCE = "TRANSACTION_HASH_PRESENCE"
+    SQS_SEND_MESSAGE_BATCH = "SQS_SEND_MESSAGE_BATCH"
+
+
+class RedeliveryDelayEntities(Enum):
+    BLOCK_CONFIRMATION = "BLOCK_CONFIRMATION"
+    MAX = "MAX"
+
+
+class DBPoolMode(Enum):
+    QUEUE = "QUEUE"
+    NULL = "NULL"
+    RDS_PROXY = "RDS_PROXY"
+
+
+class CacheTTLEntities(Enum):
+    TOKEN_PAIR = "TOKEN_PAIR"
+    BLOCKCHAIN = "BLOCKCHAIN"
+    CONTRACT = "CONTRACT"
+    SECRET = "SECRET"
+    SECRET_VERSION = "SECRET_VERSION"
+    LIQUIDITY_BALANCE = "LIQUIDITY_BALANCE"
+    MESSAGE_GROUP_POOL = "MESSAGE_GROUP_POOL"
+
+
+class CacheSizeEntities(Enum):
+    CARDANO_TRANSACTION_UTXOS = "CARDANO_TRANSACTION_UTXOS"
+    CARDANO_ADDRESS = "CARDANO_ADDRESS"
 
 
 SIGNATURE_TYPES = [SignatureTypeEntities.CONVERSION_IN.value, SignatureTypeEntities.CONVERSION_OUT.value]
@@ -10,6 +10,25 @@ class ConversionStatus(Enum):
     EXPIRED = "EXPIRED"
 
 
+# Order of the conversions in the history, persisted in conversion.status_rank so it can be served from an index
+CONVERSION_STATUS_RANK = {
+    ConversionStatus.WAITING_FOR_CLAIM.value: 1,
+    ConversionStatus.USER_INITIATED.value: 2,
+    ConversionStatus.CLAIM_INITIATED.value: 3,
+    ConversionStatus.PROCESSING.value: 4,
+    ConversionStatus.SUCCESS.value: 5,
+    ConversionStatus.EXPIRED.value: 6
+}
+DEFAULT_CONVERSION_STATUS_RANK = 7
+
+# Conversions holding the claim amount of the converter liquidity, tracked in token_pair_liquidity.locked_amount
+LIQUIDITY_LOCKED_CONVERSION_STATUSES = [
+    ConversionStatus.PROCESSING.value,
+    ConversionStatus.WAITING_FOR_CLAIM.value,
+    ConversionStatus.CLAIM_INITIATED.value
+]
+
+
 class ConversionTransactionStatus(Enum):
     FAILED = "FAILED"
     SUCCESS = "SUCCESS"
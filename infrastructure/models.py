@@ -1,8 +1,16 @@
+from decimal import Decimal
+
 from sqlalchemy import Column, VARCHAR, INTEGER, ForeignKey, UniqueConstraint, DECIMAL, BOOLEAN, BIGINT, \
-    func, TEXT, TIMESTAMP, text, JSON
+    func, TEXT, TIMESTAMP, text, JSON, Index, event, inspect, select, DATE
+from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
+from constants.general import CreatedBy
+from constants.status import CONVERSION_STATUS_RANK, DEFAULT_CONVERSION_STATUS_RANK, \
+    LIQUIDITY_LOCKED_CONVERSION_STATUSES
+from utils.general import get_uuid
+
 Base = declarative_base()
 
 
@@ -87,6 +95,38 @@ class TokenPairDBModel(Base):
     __table_args__ = (UniqueConstraint(from_token_id, to_token_id), {})
 
 
+class TokenPairLiquidityDBModel(Base):
+    __tablename__ = "token_pair_liquidity"
+    row_id = Column("row_id", BIGINT, primary_key=True, autoincrement=True)
+    id = Column("id", VARCHAR(50), unique=True, nullable=False)
+    token_pair_id = Column("token_pair_id", BIGINT, ForeignKey(TokenPairDBModel.row_id), unique=True, nullable=False)
+    locked_amount = Column("locked_amount", DECIMAL(64, 0), nullable=False, server_default=text("0"))
+    created_by = Column("created_by", VARCHAR(50), nullable=False)
+    created_at = Column("created_at", TIMESTAMP,
+                        server_default=func.current_timestamp(), nullable=False)
+    updated_at = Column("updated_at", TIMESTAMP,
+                        server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
+                        nullable=False)
+
+
+class ConversionDailyRollupDBModel(Base):
+    # Conversion counts and claim amounts per token pair and status of each closed day, the reports sum these rows
+    __tablename__ = "conversion_daily_rollup"
+    row_id = Column("row_id", BIGINT, primary_key=True, autoincrement=True)
+    id = Column("id", VARCHAR(50), unique=True, nullable=False)
+    date = Column("date", DATE, nullable=False)
+    token_pair_id = Column("token_pair_id", BIGINT, ForeignKey(TokenPairDBModel.row_id), nullable=False)
+    status = Column("status", VARCHAR(30), nullable=False)
+    count = Column("count", INTEGER, nullable=False)
+    amount = Column("amount", DECIMAL(64, 0), nullable=False)
+    created_at = Column("created_at", TIMESTAMP,
+                        server_default=func.current_timestamp(), nullable=False)
+    updated_at = Column("updated_at", TIMESTAMP,
+                        server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
+                        nullable=False)
+    __table_args__ = (UniqueConstraint(date, token_pair_id, status), {})
+
+
 class WalletPairDBModel(Base):
     __tablename__ = "wallet_pair"
     row_id = Column("row_id", BIGINT, primary_key=True, autoincrement=True)
@@ -106,7 +146,9 @@ class WalletPairDBModel(Base):
                         server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
                         nullable=False)
     token_pair = relationship(TokenPairDBModel, foreign_keys=[token_pair_id], uselist=False, lazy="select")
-    __table_args__ = (UniqueConstraint(token_pair_id, from_address, to_address), {})
+    __table_args__ = (UniqueConstraint(token_pair_id, from_address, to_address),
+                      Index("ix_wallet_pair_from_address", from_address),
+                      Index("ix_wallet_pair_to_address", to_address), {})
 
 
 class ConversionDBModel(Base):
@@ -118,7 +160,11 @@ class ConversionDBModel(Base):
     claim_amount = Column("claim_amount", DECIMAL(64, 0), nullable=False)
     fee_amount = Column("fee_amount", DECIMAL(64, 0), nullable=False)
     status = Column("status", VARCHAR(30), nullable=False)
+    status_rank = Column("status_rank", INTEGER, nullable=False,
+                         server_default=text(str(DEFAULT_CONVERSION_STATUS_RANK)))
     claim_signature = Column("claim_signature", VARCHAR(250))
+    # Time a user initiated conversion expires at, from the EXPIRE_CONVERSION hours of its from blockchain
+    expires_at = Column("expires_at", TIMESTAMP, nullable=True)
     created_by = Column("created_by", VARCHAR(50), nullable=False)
     created_at = Column("created_at", TIMESTAMP,
                         server_default=func.current_timestamp(), nullable=False)
@@ -126,6 +172,63 @@ class ConversionDBModel(Base):
                         server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
                         nullable=False)
     wallet_pair = relationship(WalletPairDBModel, foreign_keys=[wallet_pair_id], uselist=False, lazy="select")
+    # Descending keys follow the history order, so a wallet pair page is read straight off the index (MySQL 8)
+    __table_args__ = (Index("ix_conversion_history", wallet_pair_id, status_rank, created_at.desc(), row_id.desc()),
+                      Index("ix_conversion_status_created_at", status, created_at),
+                      Index("ix_conversion_status_expires_at", status, expires_at),
+                      Index("ix_conversion_created_at", created_at),
+                      Index("ix_conversion_updated_at", updated_at),
+                      Index("ix_conversion_wallet_pair_id_status_created_at", wallet_pair_id, status, created_at), {})
+
+
+@event.listens_for(ConversionDBModel.status, "set")
+def set_conversion_status_rank(target, value, oldvalue, initiator):
+    target.status_rank = CONVERSION_STATUS_RANK.get(value, DEFAULT_CONVERSION_STATUS_RANK)
+
+
+def get_locked_claim_amount(status, claim_amount):
+    if status in LIQUIDITY_LOCKED_CONVERSION_STATUSES and claim_amount is not None:
+        return Decimal(str(claim_amount))
+    return Decimal(0)
+
+
+def get_previous_value(target, attribute):
+    history = inspect(target).attrs[attribute].history
+    return history.deleted[0] if history.deleted else getattr(target, attribute)
+
+
+def add_locked_amount(connection, wallet_pair_id, amount):
+    if not amount:
+        return
+    token_pair_id = connection.execute(select(WalletPairDBModel.token_pair_id)
+                                       .where(WalletPairDBModel.row_id == wallet_pair_id)).scalar()
+    liquidity = TokenPairLiquidityDBModel.__table__
+    connection.execute(insert(liquidity).values(id=get_uuid(), token_pair_id=token_pair_id, locked_amount=amount,
+                                                created_by=CreatedBy.BACKEND.value)
+                       .on_duplicate_key_update(locked_amount=liquidity.c.locked_amount + amount))
+
+
+# The locked liquidity ledger is updated in the flush of the conversion change, so both commit or roll back together.
+# Bulk query updates skip these events and have to keep the ledger in sync on their own.
+@event.listens_for(ConversionDBModel, "after_insert")
+def add_inserted_conversion_to_ledger(mapper, connection, target):
+    add_locked_amount(connection=connection, wallet_pair_id=target.wallet_pair_id,
+                      amount=get_locked_claim_amount(status=target.status, claim_amount=target.claim_amount))
+
+
+@event.listens_for(ConversionDBModel, "after_update")
+def add_updated_conversion_to_ledger(mapper, connection, target):
+    previous_amount = get_locked_claim_amount(status=get_previous_value(target, "status"),
+                                              claim_amount=get_previous_value(target, "claim_amount"))
+    amount = get_locked_claim_amount(status=target.status, claim_amount=target.claim_amount)
+    add_locked_amount(connection=connection, wallet_pair_id=target.wallet_pair_id, amount=amount - previous_amount)
+
+
+@event.listens_for(ConversionDBModel, "after_delete")
+def remove_deleted_conversion_from_ledger(mapper, connection, target):
+    add_locked_amount(connection=connection, wallet_pair_id=target.wallet_pair_id,
+                      amount=-get_locked_claim_amount(status=get_previous_value(target, "status"),
+                                                      claim_amount=get_previous_value(target, "claim_amount")))
 
 
 class ConversionTransactionDBModel(Base):
@@ -156,6 +259,10 @@ class TransactionDBModel(Base):
     transaction_hash = Column("transaction_hash", VARCHAR(250))
     transaction_amount = Column("transaction_amount", DECIMAL(50, 20))
     confirmation = Column("confirmation", INTEGER, nullable=False)
+    # Block the transaction is included in, set for the chains whose confirmations are advanced by the tracker
+    block_number = Column("block_number", BIGINT, nullable=True)
+    # Time the confirmation tracker confirmed the transaction at, cleared once its conversion is processed
+    claimed_at = Column("claimed_at", TIMESTAMP, nullable=True)
     status = Column("status", VARCHAR(30))
     created_by = Column("created_by", VARCHAR(50), nullable=False)
     created_at = Column("created_at", TIMESTAMP,
@@ -165,6 +272,9 @@ class TransactionDBModel(Base):
                         nullable=False)
     conversion_transaction = relationship(ConversionTransactionDBModel, uselist=False, lazy="select")
     token = relationship(TokenDBModel, foreign_keys=[token_id], uselist=False, lazy="select")
+    __table_args__ = (Index("ix_transaction_transaction_hash", transaction_hash),
+                      Index("ix_transaction_status_block_number", status, block_number),
+                      Index("ix_transaction_status_claimed_at", status, claimed_at), {})
 
 
 class MessageGroupPoolDBModel(Base):
@@ -3,7 +3,7 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.engine.url import URL
 
 from config import NETWORK
-from utils.database import update_in_db
+from utils.database import update_in_db, get_engine_pool_kwargs, register_pool_metrics
 
 driver = NETWORK['db']['DB_DRIVER']
 host = NETWORK['db']['DB_HOST']
@@ -14,7 +14,8 @@ port = NETWORK['db']["DB_PORT"]
 db_logging = NETWORK['db']["DB_LOGGING"]
 
 connection_string = f"{driver}://{user}:{password}@{host}:{port}/{db_name}"
-engine = create_engine(connection_string, pool_pre_ping=True, echo=db_logging)
+engine = create_engine(connection_string, echo=db_logging, **get_engine_pool_kwargs(db_config=NETWORK['db']))
+register_pool_metrics(engine=engine)
 
 Session = sessionmaker(bind=engine)
 default_session = Session()
@@ -1,13 +1,37 @@
+from config import CACHE_TTL
+from constants.general import CacheTTLEntities
 from domain.factory.blockchain_factory import BlockchainFactory
 from infrastructure.models import BlockChainDBModel, TokenDBModel, TokenPairDBModel
 from infrastructure.repositories.base_repository import BaseRepository
+from utils.cache import TTLCache
 from utils.database import read_from_db
 
+ALL_BLOCKCHAINS_KEY = "all"
+
+# Blockchain rows are static chain metadata, so they are loaded once per container and refreshed after the ttl
+blockchain_cache = TTLCache(name="blockchain", ttl=CACHE_TTL.get(CacheTTLEntities.BLOCKCHAIN.value, 0))
+
 
 class BlockchainRepository(BaseRepository):
 
-    @read_from_db()
     def get_all_blockchain(self):
+        blockchains, _ = self.__get_blockchains()
+        return blockchains
+
+    def get_blockchain(self, name):
+        _, blockchains_by_name = self.__get_blockchains()
+        return blockchains_by_name.get(name.lower())
+
+    def __get_blockchains(self):
+        blockchains = blockchain_cache.get(key=ALL_BLOCKCHAINS_KEY)
+        if blockchains is None:
+            all_blockchains = self.__get_all_blockchain_from_db()
+            blockchains = (all_blockchains, {blockchain.name.lower(): blockchain for blockchain in all_blockchains})
+            blockchain_cache.set(key=ALL_BLOCKCHAINS_KEY, value=blockchains)
+        return blockchains
+
+    @read_from_db()
+    def __get_all_blockchain_from_db(self):
         blockchains = self.session.query(BlockChainDBModel.id, BlockChainDBModel.name, BlockChainDBModel.description,
                                          BlockChainDBModel.symbol, BlockChainDBModel.logo, BlockChainDBModel.chain_id,
                                          BlockChainDBModel.block_confirmation, BlockChainDBModel.is_extension_available,
@@ -24,24 +48,17 @@ class BlockchainRepository(BaseRepository):
                                              updated_at=blockchain.updated_at)
                 for blockchain in blockchains]
 
-    @read_from_db()
-    def get_blockchain(self, name):
-        blockchain = self.session.query(BlockChainDBModel) \
-            .filter(BlockChainDBModel.name.ilike(name)).first()
-
-        if blockchain is None:
-            return None
-
-        return BlockchainFactory.blockchain(id=blockchain.id, name=blockchain.name, description=blockchain.description,
-                                            symbol=blockchain.symbol, logo=blockchain.logo,
-                                            chain_id=blockchain.chain_id,
-                                            block_confirmation=blockchain.block_confirmation,
-                                            is_extension_available=blockchain.is_extension_available,
-                                            created_by=blockchain.created_by, created_at=blockchain.created_at,
-                                            updated_at=blockchain.updated_at)
+    def get_to_token_data_by_token_pair_id(self, token_pair_id):
+        key = (TokenPairDBModel.__tablename__, token_pair_id)
+        chain_data = blockchain_cache.get(key=key)
+        if chain_data is None:
+            chain_data = self.__get_to_token_data_by_token_pair_id_from_db(token_pair_id=token_pair_id)
+            if chain_data is not None:
+                blockchain_cache.set(key=key, value=chain_data)
+        return chain_data
 
     @read_from_db()
-    def get_to_token_data_by_token_pair_id(self, token_pair_id):
+    def __get_to_token_data_by_token_pair_id_from_db(self, token_pair_id):
         chain_data = self.session.query(
             BlockChainDBModel.name,
             BlockChainDBModel.chain_id,
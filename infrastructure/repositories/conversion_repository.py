@@ -1,11 +1,12 @@
-from sqlalchemy import or_, case, func, and_
-from sqlalchemy.orm import joinedload, aliased
+from sqlalchemy import or_, func, and_, update, cast, INTEGER, select, union_all
+from sqlalchemy.orm import joinedload, aliased, contains_eager
 
-from constants.general import CreatedBy, BlockchainName, ConversionOn
-from constants.status import ConversionStatus, ConversionTransactionStatus
+from constants.general import CreatedBy, ConversionOn
+from constants.status import ConversionStatus, ConversionTransactionStatus, CONVERSION_STATUS_RANK, \
+    LIQUIDITY_LOCKED_CONVERSION_STATUSES, TransactionStatus
 from domain.factory.conversion_factory import ConversionFactory
 from infrastructure.models import ConversionDBModel, WalletPairDBModel, TokenPairDBModel, TokenDBModel, \
-    ConversionTransactionDBModel, TransactionDBModel, BlockChainDBModel
+    ConversionTransactionDBModel, TransactionDBModel, BlockChainDBModel, ConversionDailyRollupDBModel
 from infrastructure.repositories.base_repository import BaseRepository
 from utils.database import read_from_db, update_in_db
 from utils.general import get_uuid, datetime_in_utcnow
@@ -63,13 +64,35 @@ class ConversionRepository(BaseRepository):
         return ConversionFactory.conversion_detail(conversion=conversion_detail)
 
     @read_from_db()
-    def get_processing_claim_amount_for_token_pair(self, target_token_pair_id: str):
-        statuses = [
-            ConversionStatus.PROCESSING.value,
-            ConversionStatus.WAITING_FOR_CLAIM.value,
-            ConversionStatus.CLAIM_INITIATED.value
-        ]
+    def get_conversion_aggregate(self, conversion_id):
+        """
+        Loads the conversion with its wallet pair, token pair and non failed transactions in one statement, the
+        transactions are outer joined so a conversion without any comes back as a single row.
+        """
+        rows = self.session.query(ConversionDBModel, TransactionDBModel) \
+            .join(WalletPairDBModel, WalletPairDBModel.row_id == ConversionDBModel.wallet_pair_id) \
+            .join(TokenPairDBModel, TokenPairDBModel.row_id == WalletPairDBModel.token_pair_id) \
+            .outerjoin(ConversionTransactionDBModel,
+                       and_(ConversionTransactionDBModel.conversion_id == ConversionDBModel.row_id,
+                            ConversionTransactionDBModel.status != ConversionTransactionStatus.FAILED.value)) \
+            .outerjoin(TransactionDBModel,
+                       TransactionDBModel.conversion_transaction_id == ConversionTransactionDBModel.row_id) \
+            .filter(ConversionDBModel.id == conversion_id) \
+            .order_by(TransactionDBModel.row_id, TransactionDBModel.created_at.asc()) \
+            .options(joinedload(ConversionDBModel.wallet_pair).joinedload(WalletPairDBModel.token_pair)) \
+            .options(contains_eager(TransactionDBModel.conversion_transaction)) \
+            .options(joinedload(TransactionDBModel.token).joinedload(TokenDBModel.blockchain_detail)).all()
+
+        if not rows:
+            return None
+
+        conversion_detail = ConversionFactory.conversion_detail(conversion=rows[0][0])
+        transactions = [ConversionFactory.transaction_detail(transaction=transaction)
+                        for _, transaction in rows if transaction is not None]
+        return conversion_detail, transactions
 
+    @read_from_db()
+    def get_processing_claim_amount_for_token_pair(self, target_token_pair_id: str):
         total_claim_amount_query = self.session.query(
             func.sum(ConversionDBModel.claim_amount)
         ).join(
@@ -77,7 +100,7 @@ class ConversionRepository(BaseRepository):
         ).join(
             TokenPairDBModel, TokenPairDBModel.row_id == WalletPairDBModel.token_pair_id
         ).filter(
-            ConversionDBModel.status.in_(statuses),
+            ConversionDBModel.status.in_(LIQUIDITY_LOCKED_CONVERSION_STATUSES),
             TokenPairDBModel.id == target_token_pair_id
         )
 
@@ -104,11 +127,14 @@ class ConversionRepository(BaseRepository):
         total_claim_amount = total_claim_amount_query.scalar()
         return int(total_claim_amount) if total_claim_amount is not None else 0
 
-    def create_conversion(self, wallet_pair_id, deposit_amount, fee_amount, claim_amount, created_by):
+    def create_conversion(self, wallet_pair_id, deposit_amount, fee_amount, claim_amount, created_by,
+                          expire_hours=0):
+        created_at = datetime_in_utcnow()
         conversion_item = ConversionDBModel(id=get_uuid(), wallet_pair_id=wallet_pair_id, deposit_amount=deposit_amount,
                                             claim_amount=claim_amount, fee_amount=fee_amount,
                                             status=ConversionStatus.USER_INITIATED.value, claim_signature=None,
-                                            created_by=created_by, created_at=datetime_in_utcnow(),
+                                            expires_at=created_at + timedelta(hours=int(expire_hours)),
+                                            created_by=created_by, created_at=created_at,
                                             updated_at=datetime_in_utcnow())
         self.add_item(conversion_item)
         return ConversionFactory.conversion(row_id=conversion_item.row_id, id=conversion_item.id,
@@ -259,35 +285,17 @@ class ConversionRepository(BaseRepository):
 
         return count[0]
 
+    @staticmethod
+    def __conversion_history_order():
+        return ConversionDBModel.status_rank.asc(), ConversionDBModel.created_at.desc(), ConversionDBModel.row_id.desc()
+
     @read_from_db()
     def get_conversion_history(self, address, conversion_id, offset=0, limit=15):
 
         conversions_detail_query = self.session.query(ConversionDBModel) \
             .join(WalletPairDBModel, WalletPairDBModel.row_id == ConversionDBModel.wallet_pair_id) \
             .join(TokenPairDBModel, TokenPairDBModel.row_id == WalletPairDBModel.token_pair_id) \
-            .order_by(case(
-                [
-                    (
-                        ConversionDBModel.status == ConversionStatus.WAITING_FOR_CLAIM.value, 1
-                    ),
-                    (
-                        ConversionDBModel.status == ConversionStatus.USER_INITIATED.value, 2
-                    ),
-                    (
-                        ConversionDBModel.status == ConversionStatus.CLAIM_INITIATED.value, 3
-                    ),
-                    (
-                        ConversionDBModel.status == ConversionStatus.PROCESSING.value, 4
-                    ),
-                    (
-                        ConversionDBModel.status == ConversionStatus.SUCCESS.value, 5
-                    ),
-                    (
-                        ConversionDBModel.status == ConversionStatus.EXPIRED.value, 6
-                    )
-                ],
-                else_=7
-            ).asc(), ConversionDBModel.created_at.desc())
+            .order_by(*ConversionRepository.__conversion_history_order())
 
         if address:
             conversions_detail_query = conversions_detail_query.filter(
@@ -303,6 +311,50 @@ class ConversionRepository(BaseRepository):
         return [ConversionFactory.conversion_detail(conversion=conversion_detail) for conversion_detail in
                 conversions_detail]
 
+    @read_from_db()
+    def get_conversion_history_after(self, address, limit, status_rank=None, created_at=None, row_id=None):
+        """
+        Keyset page of the conversion history, the rows following the given (status_rank, created_at, row_id) key
+        in history order. Returns each conversion along with its own key.
+        Every wallet pair of the address reads at most limit keys off ix_conversion_history and only those are merged
+        into the page, an OR over the wallet pair addresses would sort all the conversions of the address instead.
+        """
+        wallet_pair_ids = [wallet_pair.row_id for wallet_pair in self.session.query(WalletPairDBModel.row_id).filter(
+            or_(WalletPairDBModel.from_address == address, WalletPairDBModel.to_address == address)).all()]
+        if not wallet_pair_ids:
+            return []
+
+        wallet_pair_pages = [
+            ConversionRepository.__conversion_history_keys_after(wallet_pair_id=wallet_pair_id, limit=limit,
+                                                                 status_rank=status_rank, created_at=created_at,
+                                                                 row_id=row_id)
+            for wallet_pair_id in wallet_pair_ids]
+        history_keys = (union_all(*wallet_pair_pages) if len(wallet_pair_pages) > 1 else wallet_pair_pages[0]) \
+            .subquery()
+
+        conversions_detail = self.session.query(ConversionDBModel) \
+            .join(history_keys, history_keys.c.row_id == ConversionDBModel.row_id) \
+            .order_by(*ConversionRepository.__conversion_history_order()) \
+            .options(joinedload(ConversionDBModel.wallet_pair).joinedload(WalletPairDBModel.token_pair)) \
+            .limit(limit).all()
+
+        return [(ConversionFactory.conversion_detail(conversion=conversion_detail),
+                 (conversion_detail.status_rank, conversion_detail.created_at, conversion_detail.row_id))
+                for conversion_detail in conversions_detail]
+
+    @staticmethod
+    def __conversion_history_keys_after(wallet_pair_id, limit, status_rank, created_at, row_id):
+        history_keys_query = select(ConversionDBModel.row_id).where(ConversionDBModel.wallet_pair_id == wallet_pair_id)
+
+        if row_id is not None:
+            history_keys_query = history_keys_query.where(or_(
+                ConversionDBModel.status_rank > status_rank,
+                and_(ConversionDBModel.status_rank == status_rank, ConversionDBModel.created_at < created_at),
+                and_(ConversionDBModel.status_rank == status_rank, ConversionDBModel.created_at == created_at,
+                     ConversionDBModel.row_id < row_id)))
+
+        return history_keys_query.order_by(*ConversionRepository.__conversion_history_order()).limit(limit)
+
     @read_from_db()
     def get_transactions_for_conversion_row_ids(self, conversion_row_ids):
         transactions = self.session.query(TransactionDBModel) \
@@ -338,6 +390,104 @@ class ConversionRepository(BaseRepository):
         transaction.updated_at = datetime_in_utcnow()
         self.session.commit()
 
+    @update_in_db()
+    def set_transaction_block_number(self, tx_id, block_number):
+        self.session.query(TransactionDBModel) \
+            .filter(TransactionDBModel.id == tx_id) \
+            .update({TransactionDBModel.block_number: block_number,
+                     TransactionDBModel.updated_at: datetime_in_utcnow()}, synchronize_session=False)
+        self.session.commit()
+
+    @update_in_db()
+    def update_transaction_confirmations(self, blockchain_id, latest_block_number):
+        """
+        Sets the confirmations of every transaction of the blockchain waiting for them from the latest block number
+        in one statement and returns the ids of the ones reaching the required block confirmation of the chain.
+        """
+        blockchain_token_ids = self.session.query(TokenDBModel.row_id) \
+            .join(BlockChainDBModel, BlockChainDBModel.row_id == TokenDBModel.blockchain_id) \
+            .filter(BlockChainDBModel.id == blockchain_id)
+        waiting_transactions = and_(TransactionDBModel.status == TransactionStatus.WAITING_FOR_CONFIRMATION.value,
+                                    TransactionDBModel.block_number.isnot(None),
+                                    TransactionDBModel.token_id.in_(blockchain_token_ids))
+
+        self.session.query(TransactionDBModel) \
+            .filter(waiting_transactions) \
+            .update({TransactionDBModel.confirmation: latest_block_number - TransactionDBModel.block_number,
+                     TransactionDBModel.updated_at: datetime_in_utcnow()}, synchronize_session=False)
+        self.session.commit()
+
+        confirmed_transactions = self.session.query(TransactionDBModel.id) \
+            .join(TokenDBModel, TokenDBModel.row_id == TransactionDBModel.token_id) \
+            .join(BlockChainDBModel, BlockChainDBModel.row_id == TokenDBModel.blockchain_id) \
+            .filter(waiting_transactions,
+                    TransactionDBModel.confirmation >= BlockChainDBModel.block_confirmation) \
+            .order_by(TransactionDBModel.row_id).all()
+
+        return [transaction.id for transaction in confirmed_transactions]
+
+    @update_in_db()
+    def set_transaction_confirmed(self, tx_id):
+        # The status is only changed from waiting, so a transaction confirmed meanwhile by the event consumer is
+        # not processed twice. The claim marks it as not processed yet until release_transaction_claim
+        now = datetime_in_utcnow()
+        updated_rows = self.session.query(TransactionDBModel) \
+            .filter(TransactionDBModel.id == tx_id,
+                    TransactionDBModel.status == TransactionStatus.WAITING_FOR_CONFIRMATION.value) \
+            .update({TransactionDBModel.status: TransactionStatus.SUCCESS.value,
+                     TransactionDBModel.claimed_at: now,
+                     TransactionDBModel.updated_at: now}, synchronize_session=False)
+        self.session.commit()
+        return updated_rows == 1
+
+    @update_in_db()
+    def set_transaction_waiting_for_confirmation(self, tx_id):
+        # Hands a confirmed transaction whose conversion could not be processed back to the tracker
+        self.session.query(TransactionDBModel) \
+            .filter(TransactionDBModel.id == tx_id,
+                    TransactionDBModel.status == TransactionStatus.SUCCESS.value) \
+            .update({TransactionDBModel.status: TransactionStatus.WAITING_FOR_CONFIRMATION.value,
+                     TransactionDBModel.claimed_at: None,
+                     TransactionDBModel.updated_at: datetime_in_utcnow()}, synchronize_session=False)
+        self.session.commit()
+
+    @update_in_db()
+    def release_transaction_claim(self, tx_id):
+        self.session.query(TransactionDBModel) \
+            .filter(TransactionDBModel.id == tx_id) \
+            .update({TransactionDBModel.claimed_at: None,
+                     TransactionDBModel.updated_at: datetime_in_utcnow()}, synchronize_session=False)
+        self.session.commit()
+
+    @read_from_db()
+    def get_expired_transaction_claims(self, blockchain_id, claimed_before):
+        """
+        Ids of the transactions of the blockchain confirmed by a tracker run which did not get to process their
+        conversion, the ones claimed before the given time.
+        """
+        expired_claims = self.session.query(TransactionDBModel.id) \
+            .join(TokenDBModel, TokenDBModel.row_id == TransactionDBModel.token_id) \
+            .join(BlockChainDBModel, BlockChainDBModel.row_id == TokenDBModel.blockchain_id) \
+            .filter(BlockChainDBModel.id == blockchain_id,
+                    TransactionDBModel.status == TransactionStatus.SUCCESS.value,
+                    TransactionDBModel.claimed_at < claimed_before) \
+            .order_by(TransactionDBModel.row_id).all()
+
+        return [transaction.id for transaction in expired_claims]
+
+    @update_in_db()
+    def reclaim_transaction(self, tx_id, claimed_before):
+        # Only one of the runs seeing the same expired claim gets to take it over
+        now = datetime_in_utcnow()
+        updated_rows = self.session.query(TransactionDBModel) \
+            .filter(TransactionDBModel.id == tx_id,
+                    TransactionDBModel.status == TransactionStatus.SUCCESS.value,
+                    TransactionDBModel.claimed_at < claimed_before) \
+            .update({TransactionDBModel.claimed_at: now,
+                     TransactionDBModel.updated_at: now}, synchronize_session=False)
+        self.session.commit()
+        return updated_rows == 1
+
     @read_from_db()
     def get_transaction_by_hash(self, tx_hash):
         transaction = self.session.query(TransactionDBModel) \
@@ -375,47 +525,70 @@ class ConversionRepository(BaseRepository):
                                             created_by=conversion.created_by, created_at=conversion.created_at,
                                             updated_at=conversion.updated_at)
 
+    @update_in_db()
+    def expire_conversions(self, expire_datetime, batch_size):
+        """
+        Expires at most batch_size user initiated conversions whose expiry time has passed and returns how many
+        were expired. They hold no locked liquidity, so the ledger is left as it is.
+        """
+        result = self.session.execute(
+            update(ConversionDBModel)
+            .where(ConversionDBModel.status == ConversionStatus.USER_INITIATED.value,
+                   ConversionDBModel.expires_at <= expire_datetime)
+            .values({ConversionDBModel.status: ConversionStatus.EXPIRED.value,
+                     ConversionDBModel.status_rank: CONVERSION_STATUS_RANK[ConversionStatus.EXPIRED.value],
+                     ConversionDBModel.updated_at: datetime_in_utcnow()})
+            .with_dialect_options(mysql_limit=batch_size)
+            .execution_options(synchronize_session=False))
+        self.session.commit()
+        return result.rowcount
+
     @read_from_db()
-    def get_expiring_conversion(self, ethereum_expire_datetime, cardano_expire_datetime, binance_expire_datetime):
-        from_token = aliased(TokenDBModel)
-        to_token = aliased(TokenDBModel)
-        from_blockchain = aliased(BlockChainDBModel)
-        to_blockchain = aliased(BlockChainDBModel)
+    def get_first_conversion_date(self):
+        first_created_at = self.session.query(func.min(ConversionDBModel.created_at)).scalar()
+        return first_created_at.date() if first_created_at else None
 
-        conversions = self.session.query(ConversionDBModel.row_id, ConversionDBModel.id,
-                                         ConversionDBModel.wallet_pair_id, ConversionDBModel.deposit_amount,
-                                         ConversionDBModel.claim_amount, ConversionDBModel.fee_amount,
-                                         ConversionDBModel.status, ConversionDBModel.claim_signature,
-                                         ConversionDBModel.created_by, ConversionDBModel.created_at,
-                                         ConversionDBModel.updated_at) \
-            .join(WalletPairDBModel, WalletPairDBModel.row_id == ConversionDBModel.wallet_pair_id) \
-            .join(TokenPairDBModel, TokenPairDBModel.row_id == WalletPairDBModel.token_pair_id) \
-            .join(from_token, from_token.row_id == TokenPairDBModel.from_token_id) \
-            .join(to_token, to_token.row_id == TokenPairDBModel.to_token_id) \
-            .join(from_blockchain, from_blockchain.row_id == from_token.blockchain_id) \
-            .join(to_blockchain, to_blockchain.row_id == to_token.blockchain_id) \
-            .filter(ConversionDBModel.status == ConversionStatus.USER_INITIATED.value,
-                    or_(and_(func.lower(from_blockchain.name) == BlockchainName.ETHEREUM.value.lower(),
-                             ConversionDBModel.created_at <= str(ethereum_expire_datetime)),
-                        and_(func.lower(from_blockchain.name) == BlockchainName.BINANCE.value.lower(),
-                             ConversionDBModel.created_at <= str(binance_expire_datetime)),
-                        and_(func.lower(from_blockchain.name) == BlockchainName.CARDANO.value.lower(),
-                             ConversionDBModel.created_at <= str(cardano_expire_datetime)))).all()
-
-        return [ConversionFactory.conversion(row_id=conversion.row_id, id=conversion.id,
-                                             wallet_pair_id=conversion.wallet_pair_id,
-                                             deposit_amount=conversion.deposit_amount,
-                                             claim_amount=conversion.claim_amount, fee_amount=conversion.fee_amount,
-                                             status=conversion.status, claim_signature=conversion.claim_signature,
-                                             created_by=conversion.created_by, created_at=conversion.created_at,
-                                             updated_at=conversion.updated_at) for conversion in conversions]
+    @read_from_db()
+    def get_last_rollup_date(self):
+        return self.session.query(func.max(ConversionDailyRollupDBModel.date)).scalar()
 
-    @update_in_db()
-    def set_conversions_to_expire(self, conversion_ids):
-        self.session.query(ConversionDBModel) \
-            .filter(ConversionDBModel.id.in_(conversion_ids)) \
-            .update({ConversionDBModel.status: ConversionStatus.EXPIRED.value}, synchronize_session=False)
+    @read_from_db()
+    def get_last_rollup_run_time(self):
+        return self.session.query(func.max(ConversionDailyRollupDBModel.created_at)).scalar()
 
+    @read_from_db()
+    def get_updated_conversion_dates(self, updated_since, before_date):
+        # Days before before_date holding a conversion whose status may have changed since updated_since
+        dates = self.session.query(func.date(ConversionDBModel.created_at).label("date")) \
+            .filter(ConversionDBModel.updated_at >= updated_since, ConversionDBModel.created_at < before_date) \
+            .distinct().all()
+        return [row.date for row in dates]
+
+    @update_in_db()
+    def roll_up_conversions(self, date, rolled_up_at):
+        """
+        Replaces the rollup rows of the day with the conversion counts and claim amounts created on it, grouped by
+        token pair and current status. The rows are stamped with rolled_up_at, the start of the rollup run.
+        """
+        conversion_totals = self.session.query(WalletPairDBModel.token_pair_id, ConversionDBModel.status,
+                                               func.count(ConversionDBModel.id).label("count"),
+                                               func.sum(ConversionDBModel.claim_amount).label("amount")) \
+            .join(WalletPairDBModel, WalletPairDBModel.row_id == ConversionDBModel.wallet_pair_id) \
+            .filter(ConversionDBModel.created_at >= date,
+                    ConversionDBModel.created_at < date + timedelta(days=1)) \
+            .group_by(WalletPairDBModel.token_pair_id, ConversionDBModel.status).all()
+
+        self.session.query(ConversionDailyRollupDBModel) \
+            .filter(ConversionDailyRollupDBModel.date == date) \
+            .delete(synchronize_session=False)
+        self.session.add_all([ConversionDailyRollupDBModel(id=get_uuid(), date=date,
+                                                           token_pair_id=conversion_total.token_pair_id,
+                                                           status=conversion_total.status,
+                                                           count=conversion_total.count,
+                                                           amount=conversion_total.amount,
+                                                           created_at=rolled_up_at,
+                                                           updated_at=rolled_up_at)
+                              for conversion_total in conversion_totals])
         self.session.commit()
 
     @read_from_db()
@@ -425,14 +598,14 @@ class ConversionRepository(BaseRepository):
         from_blockchain = aliased(BlockChainDBModel)
         to_blockchain = aliased(BlockChainDBModel)
 
-        conversion_status_counts_query = self.session.query(from_token.symbol.label("token"),
-                                                            from_blockchain.symbol.label("from_blockchain"),
-                                                            to_blockchain.symbol.label("to_blockchain"),
-                                                            ConversionDBModel.status.label("status"),
-                                                            func.count(ConversionDBModel.id).label("count"),
-                                                            func.sum(ConversionDBModel.claim_amount).label("amount")) \
-            .join(WalletPairDBModel, WalletPairDBModel.row_id == ConversionDBModel.wallet_pair_id) \
-            .join(TokenPairDBModel, TokenPairDBModel.row_id == WalletPairDBModel.token_pair_id) \
+        conversion_status_counts_query = self.session.query(
+            from_token.symbol.label("token"),
+            from_blockchain.symbol.label("from_blockchain"),
+            to_blockchain.symbol.label("to_blockchain"),
+            ConversionDailyRollupDBModel.status.label("status"),
+            cast(func.sum(ConversionDailyRollupDBModel.count), INTEGER).label("count"),
+            func.sum(ConversionDailyRollupDBModel.amount).label("amount")) \
+            .join(TokenPairDBModel, TokenPairDBModel.row_id == ConversionDailyRollupDBModel.token_pair_id) \
             .join(from_token, from_token.row_id == TokenPairDBModel.from_token_id) \
             .join(to_token, to_token.row_id == TokenPairDBModel.to_token_id) \
             .join(from_blockchain, from_blockchain.row_id == from_token.blockchain_id) \
@@ -440,16 +613,16 @@ class ConversionRepository(BaseRepository):
 
         if start_date:
             conversion_status_counts_query = conversion_status_counts_query.filter(
-                func.date(ConversionDBModel.created_at) >= start_date)
+                ConversionDailyRollupDBModel.date >= start_date)
 
         if end_date:
             conversion_status_counts_query = conversion_status_counts_query.filter(
-                func.date(ConversionDBModel.created_at) <= end_date)
+                ConversionDailyRollupDBModel.date <= end_date)
 
         conversion_status_counts = conversion_status_counts_query.group_by(from_token.id, from_token.symbol,
                                                                            from_blockchain.symbol,
                                                                            to_blockchain.symbol,
-                                                                           ConversionDBModel.status) \
+                                                                           ConversionDailyRollupDBModel.status) \
             .order_by(from_token.symbol.asc()).all()
 
         return ConversionFactory.generate_conversion_report(conversion_status_counts=conversion_status_counts)
@@ -0,0 +1,57 @@
+from sqlalchemy import func
+
+from constants.general import CreatedBy
+from constants.status import LIQUIDITY_LOCKED_CONVERSION_STATUSES
+from infrastructure.models import TokenPairLiquidityDBModel, TokenPairDBModel, ConversionDBModel, WalletPairDBModel
+from infrastructure.repositories.base_repository import BaseRepository
+from utils.database import read_from_db, update_in_db
+from utils.general import get_uuid, datetime_in_utcnow
+
+
+class LiquidityRepository(BaseRepository):
+
+    @read_from_db()
+    def get_locked_amount(self, token_pair_id: str):
+        locked_amount = self.session.query(TokenPairLiquidityDBModel.locked_amount) \
+            .join(TokenPairDBModel, TokenPairDBModel.row_id == TokenPairLiquidityDBModel.token_pair_id) \
+            .filter(TokenPairDBModel.id == token_pair_id) \
+            .scalar()
+
+        return int(locked_amount) if locked_amount is not None else 0
+
+    @read_from_db()
+    def get_token_pair_ids(self):
+        return [token_pair.id for token_pair in self.session.query(TokenPairDBModel.id).all()]
+
+    @update_in_db()
+    def reconcile_locked_amount(self, token_pair_id: str):
+        """
+        Resets the ledger of the token pair to the sum of its locked conversions and returns the ledger amount found
+        along with that sum. The rows are locked before the sum is read, so a conversion change running meanwhile
+        applies its delta on top of the corrected amount.
+        """
+        token_pair_row_id, liquidity = self.session.query(TokenPairDBModel.row_id, TokenPairLiquidityDBModel) \
+            .outerjoin(TokenPairLiquidityDBModel, TokenPairLiquidityDBModel.token_pair_id == TokenPairDBModel.row_id) \
+            .filter(TokenPairDBModel.id == token_pair_id) \
+            .with_for_update().one()
+
+        total_claim_amount = self.session.query(func.sum(ConversionDBModel.claim_amount)) \
+            .join(WalletPairDBModel, WalletPairDBModel.row_id == ConversionDBModel.wallet_pair_id) \
+            .filter(WalletPairDBModel.token_pair_id == token_pair_row_id,
+                    ConversionDBModel.status.in_(LIQUIDITY_LOCKED_CONVERSION_STATUSES)) \
+            .scalar()
+        locked_amount = int(total_claim_amount) if total_claim_amount is not None else 0
+        ledger_amount = int(liquidity.locked_amount) if liquidity else 0
+
+        if liquidity is None:
+            self.session.add(TokenPairLiquidityDBModel(id=get_uuid(), token_pair_id=token_pair_row_id,
+                                                       locked_amount=locked_amount,
+                                                       created_by=CreatedBy.BACKEND.value,
+                                                       created_at=datetime_in_utcnow(),
+                                                       updated_at=datetime_in_utcnow()))
+        elif ledger_amount != locked_amount:
+            liquidity.locked_amount = locked_amount
+            liquidity.updated_at = datetime_in_utcnow()
+        self.session.commit()
+
+        return ledger_amount, locked_amount
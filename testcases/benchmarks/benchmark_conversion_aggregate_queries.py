@@ -0,0 +1,95 @@
+"""
+Counts the statements sent to the database for loading one conversion with its transactions, the previous two
+query path against ConversionRepository.get_conversion_aggregate. It needs the database configured in
+config.NETWORK with the schema migrated, the same as the functional testcases. Every statement runs inside one outer
+transaction that is rolled back at the end, so the rows it adds are never committed and nothing else is touched.
+Run it with `PYTHONPATH=$PWD python -m testcases.benchmarks.benchmark_conversion_aggregate_queries`.
+"""
+import timeit
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from infrastructure.repositories.base_repository import engine
+from infrastructure.repositories.conversion_repository import ConversionRepository
+from testcases.functional_testcases.test_variables import TestVariables
+
+CONVERSION_ID = "51769f201e46446fb61a9c197cb0706b"
+ITERATIONS = 100
+SAVEPOINT_STATEMENTS = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+conversion_repo = ConversionRepository()
+
+
+class StatementCounter:
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, connection, cursor, statement, *args, **kwargs):
+        # The savepoints of the outer transaction are not part of the load
+        if not statement.upper().startswith(SAVEPOINT_STATEMENTS):
+            self.count += 1
+
+
+def load_with_two_queries():
+    conversion_detail = conversion_repo.get_conversion_detail(conversion_id=CONVERSION_ID).to_dict()
+    conversion_row_id = conversion_detail["conversion"]["row_id"]
+    transactions = conversion_repo.get_transactions_for_conversion_row_ids(conversion_row_ids=[conversion_row_id])
+    return conversion_detail, [transaction.to_dict() for transaction in transactions]
+
+
+def load_aggregate():
+    conversion_detail, transactions = conversion_repo.get_conversion_aggregate(conversion_id=CONVERSION_ID)
+    return conversion_detail.to_dict(), [transaction.to_dict() for transaction in transactions]
+
+
+def add_rows():
+    test_variables = TestVariables()
+    for rows in [test_variables.blockchain, test_variables.token, test_variables.conversion_fee,
+                 test_variables.token_pair, test_variables.wallet_pair, test_variables.conversion,
+                 test_variables.conversion_transaction, test_variables.transaction]:
+        conversion_repo.session.add_all(rows)
+        conversion_repo.session.commit()
+
+
+def begin_outer_transaction():
+    """
+    Binds the repository to a session inside an outer transaction, the commits of the repository only release a
+    savepoint which is started again right after.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection)
+    session.begin_nested()
+
+    @event.listens_for(session, "after_transaction_end")
+    def restart_savepoint(session, ended_transaction):
+        if ended_transaction.nested and not ended_transaction._parent.nested:
+            session.expire_all()
+            session.begin_nested()
+
+    conversion_repo.session = session
+    return connection, transaction, session
+
+
+def main():
+    connection, transaction, session = begin_outer_transaction()
+    try:
+        add_rows()
+        assert load_with_two_queries()[1] == load_aggregate()[1]
+        for name, function in [("two queries", load_with_two_queries), ("aggregate", load_aggregate)]:
+            counter = StatementCounter()
+            event.listen(engine, "before_cursor_execute", counter)
+            seconds = timeit.timeit(function, number=ITERATIONS)
+            event.remove(engine, "before_cursor_execute", counter)
+            print(f"{name}: {counter.count / ITERATIONS:.1f} statements and {seconds / ITERATIONS * 1e3:.2f} ms "
+                  f"per load")
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
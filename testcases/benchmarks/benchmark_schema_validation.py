@@ -0,0 +1,38 @@
+"""
+Compares validating a request against documentation/models/conversion.json by reading the schema file on every
+call against the compiled validators kept by utils.general.validate_schema. Run it with
+`PYTHONPATH=$PWD python -m testcases.benchmarks.benchmark_schema_validation`.
+"""
+import json
+import os
+import timeit
+
+from jsonschema.validators import validate
+
+from utils.general import validate_schema
+
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../documentation/models/conversion.json")
+SCHEMA_KEY = "CreateConversionRequestInput"
+ITERATIONS = 2000
+INPUT_JSON = {"token_pair_id": "22477fd4ea994689a04646cbbaafd133", "amount": "1000",
+              "from_address": "0xa18b95A9371Ac18C233fB024cdAC5ef6300efDa1",
+              "to_address": "addr_test1qza8485avt2xn3vy63plawqt0gk3ykpf98wusc4qrml2avu0pkm5rp3pkz6q4n3kf8znlf3y749lll8l",
+              "block_number": 12345, "signature": "0x"}
+
+
+def main():
+    def uncached():
+        with open(SCHEMA_FILE) as f:
+            schema = json.load(f).get(SCHEMA_KEY)
+        validate(instance=INPUT_JSON, schema=schema)
+
+    def cached():
+        validate_schema(filepath=SCHEMA_FILE, schema_key=SCHEMA_KEY, input_json=INPUT_JSON)
+
+    for name, function in [("read and compile per call", uncached), ("compiled validator", cached)]:
+        seconds = timeit.timeit(function, number=ITERATIONS)
+        print(f"{name}: {seconds / ITERATIONS * 1e6:.1f} us per validation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Compares recovering the signer through a Web3 HTTP provider against the provider free eth_account path used by
+utils.signature. Run it with `PYTHONPATH=$PWD python -m testcases.benchmarks.benchmark_signature_recovery`.
+"""
+import timeit
+
+import web3
+from eth_account import Account
+from eth_account.messages import defunct_hash_message, encode_defunct
+from web3 import Web3
+
+from utils.general import get_evm_network_url
+from utils.signature import recover_signer_address
+
+CHAIN_ID = 42
+ITERATIONS = 1000
+
+
+def main():
+    account = Account.create()
+    message = web3.Web3.soliditySha3(["string", "string", "string", "string"],
+                                     ["conversion_id", "100", account.address, account.address])
+    signature = Account.sign_message(encode_defunct(message), private_key=account.key).signature.hex()
+    network_url = get_evm_network_url(chain_id=CHAIN_ID)
+
+    def with_provider():
+        web3_object = Web3(web3.providers.HTTPProvider(network_url))
+        return web3_object.eth.account.recoverHash(message_hash=defunct_hash_message(message), signature=signature)
+
+    def without_provider():
+        return recover_signer_address(message=message, signature=signature)
+
+    assert with_provider() == without_provider() == account.address
+
+    for name, function in [("with provider", with_provider), ("without provider", without_provider)]:
+        seconds = timeit.timeit(function, number=ITERATIONS)
+        print(f"{name}: {seconds / ITERATIONS * 1e6:.1f} us per recovery")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,8 @@ from unittest.mock import patch
 
 from application.handler.blockchain_handlers import get_all_blockchain
 from infrastructure.models import BlockChainDBModel, TransactionDBModel, ConversionTransactionDBModel, \
-    ConversionDBModel, WalletPairDBModel, TokenPairDBModel, ConversionFeeDBModel, TokenDBModel, MessageGroupPoolDBModel
+    ConversionDBModel, WalletPairDBModel, TokenPairDBModel, ConversionFeeDBModel, TokenDBModel, \
+    MessageGroupPoolDBModel, TokenPairLiquidityDBModel
 from infrastructure.repositories.blockchain_repository import BlockchainRepository
 from testcases.functional_testcases.test_variables import TestVariables
 
@@ -54,6 +55,8 @@ class TestBlockchain(unittest.TestCase):
         blockchain_repo.session.commit()
         blockchain_repo.session.query(WalletPairDBModel).delete()
         blockchain_repo.session.commit()
+        blockchain_repo.session.query(TokenPairLiquidityDBModel).delete()
+        blockchain_repo.session.commit()
         blockchain_repo.session.query(TokenPairDBModel).delete()
         blockchain_repo.session.commit()
         blockchain_repo.session.query(ConversionFeeDBModel).delete()
@@ -7,7 +7,8 @@ from application.handler.consumer_handlers import converter_event_consumer, conv
 from constants.error_details import ErrorCode, ErrorDetails
 from constants.status import ConversionTransactionStatus, TransactionVisibility, TransactionOperation, TransactionStatus
 from infrastructure.models import TransactionDBModel, ConversionTransactionDBModel, ConversionDBModel, \
-    WalletPairDBModel, TokenPairDBModel, ConversionFeeDBModel, TokenDBModel, BlockChainDBModel, MessageGroupPoolDBModel
+    WalletPairDBModel, TokenPairDBModel, ConversionFeeDBModel, TokenDBModel, BlockChainDBModel, \
+    MessageGroupPoolDBModel, TokenPairLiquidityDBModel
 from infrastructure.repositories.conversion_repository import ConversionRepository
 from testcases.functional_testcases.test_variables import TestVariables, consumer_token_received_event_message, \
     prepare_consumer_cardano_event_format, prepare_converter_bridge_event_format, \
@@ -38,9 +39,9 @@ class TestConsumer(unittest.TestCase):
         conversion_repo.session.add_all(TestVariables().conversion)
         conversion_repo.session.commit()
 
-    @patch("application.service.notification_service.NotificationService.send_message_to_queue")
+    @patch("application.service.notification_service.NotificationService.send_messages_to_queue")
     @patch("common.utils.Utils.report_slack")
-    def test_post_converter_ethereum_events_to_queue(self, mock_report_slack, mock_send_message_to_queue):
+    def test_post_converter_ethereum_events_to_queue(self, mock_report_slack, mock_send_messages_to_queue):
         # Invalid input
         event = dict()
         post_converter_ethereum_events_to_queue(event, {})
@@ -55,11 +56,12 @@ class TestConsumer(unittest.TestCase):
         post_converter_ethereum_events_to_queue(event, {})
 
         # expected message format to send
-        mock_send_message_to_queue.assert_called_with(queue="EVENT_CONSUMER",
-                                                      message=json.dumps({'blockchain_name': 'Ethereum',
-                                                                          'blockchain_event': {'name': 'test',
-                                                                                               'data': 'test'}}),
-                                                      message_group_id=None)
+        mock_send_messages_to_queue.assert_called_once_with(queue="EVENT_CONSUMER",
+                                                            messages=[json.dumps({'blockchain_name': 'Ethereum',
+                                                                                  'blockchain_event': {
+                                                                                      'name': 'test',
+                                                                                      'data': 'test'}})],
+                                                            message_group_id=None)
 
     @patch("common.blockchain_util.BlockChainUtil.get_current_block_no")
     @patch("common.blockchain_util.BlockChainUtil.get_transaction_receipt_from_blockchain")
@@ -409,6 +411,8 @@ class TestConsumer(unittest.TestCase):
         conversion_repo.session.commit()
         conversion_repo.session.query(WalletPairDBModel).delete()
         conversion_repo.session.commit()
+        conversion_repo.session.query(TokenPairLiquidityDBModel).delete()
+        conversion_repo.session.commit()
         conversion_repo.session.query(TokenPairDBModel).delete()
         conversion_repo.session.commit()
         conversion_repo.session.query(ConversionFeeDBModel).delete()
@@ -7,12 +7,13 @@ from sqlalchemy import distinct
 
 from application.handler.conversion_handlers import create_conversion_request, get_conversion_history, \
     create_transaction_for_conversion, claim_conversion, get_conversion, get_conversion_count_by_status, \
-    expire_conversion, get_transaction_by_conversion_id, generate_conversion_report
+    expire_conversion, get_transaction_by_conversion_id, generate_conversion_report, roll_up_conversion_history
 from constants.error_details import ErrorCode, ErrorDetails
 from constants.lambdas import LambdaResponseStatus
 from constants.status import ConversionStatus
 from infrastructure.models import TokenPairDBModel, ConversionFeeDBModel, TokenDBModel, BlockChainDBModel, \
-    WalletPairDBModel, ConversionDBModel, TransactionDBModel, ConversionTransactionDBModel, MessageGroupPoolDBModel
+    WalletPairDBModel, ConversionDBModel, TransactionDBModel, ConversionTransactionDBModel, \
+    MessageGroupPoolDBModel, TokenPairLiquidityDBModel, ConversionDailyRollupDBModel
 from infrastructure.repositories.conversion_repository import ConversionRepository
 from testcases.functional_testcases.test_variables import TestVariables
 from utils.exceptions import BadRequestException, InternalServerErrorException
@@ -963,6 +964,18 @@ class TestConversion(unittest.TestCase):
         event = dict()
         generate_conversion_report(event, {})
 
+    @patch("common.utils.Utils.report_slack")
+    def test_roll_up_conversion_history(self, mock_report_slack):
+        response = roll_up_conversion_history({"start_date": "12-01-2022"}, {})
+        self.assertEqual(json.loads(response["body"])["error"]["code"], ErrorCode.INVALID_DATE.value)
+
+        roll_up_conversion_history({}, {})
+        rollups = conversion_repo.session.query(ConversionDailyRollupDBModel).all()
+        conversions = conversion_repo.session.query(ConversionDBModel).all()
+        self.assertEqual(sum(rollup.count for rollup in rollups), len(conversions))
+        self.assertEqual(sum(rollup.amount for rollup in rollups),
+                         sum(conversion.claim_amount for conversion in conversions))
+
     def tearDown(self):
         TestConversion.delete_all_tables()
 
@@ -976,6 +989,10 @@ class TestConversion(unittest.TestCase):
         conversion_repo.session.commit()
         conversion_repo.session.query(WalletPairDBModel).delete()
         conversion_repo.session.commit()
+        conversion_repo.session.query(TokenPairLiquidityDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(ConversionDailyRollupDBModel).delete()
+        conversion_repo.session.commit()
         conversion_repo.session.query(TokenPairDBModel).delete()
         conversion_repo.session.commit()
         conversion_repo.session.query(ConversionFeeDBModel).delete()
@@ -0,0 +1,124 @@
+import re
+import unittest
+from contextlib import contextmanager
+from datetime import datetime, date
+
+from sqlalchemy import event
+
+from constants.status import ConversionStatus
+from infrastructure.models import TokenPairDBModel, ConversionFeeDBModel, TokenDBModel, BlockChainDBModel, \
+    WalletPairDBModel, ConversionDBModel, TransactionDBModel, ConversionTransactionDBModel, \
+    TokenPairLiquidityDBModel, ConversionDailyRollupDBModel
+from infrastructure.repositories.base_repository import engine
+from infrastructure.repositories.conversion_repository import ConversionRepository
+from testcases.functional_testcases.test_variables import TestVariables
+
+conversion_repo = ConversionRepository()
+
+# Tables which grow with the traffic, a query reading one of them must always have an index it can use
+HOT_TABLES = ["conversion", "conversion_transaction", "transaction", "wallet_pair"]
+ETHEREUM_ADDRESS = "0xa18b95A9371Ac18C233fB024cdAC5ef6300efDa1"
+
+
+@contextmanager
+def captured_statements():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE")):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+class TestQueryPlans(unittest.TestCase):
+    """
+    Runs EXPLAIN on the statements of the hot repository queries, every read of a hot table has to go through an
+    index. The test tables are too small for the optimizer to prefer one on its own, so the plans are taken with
+    max_seeks_for_key=1, which makes an index lookup cheaper than any scan.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        TestQueryPlans.delete_all_tables()
+
+    def setUp(self):
+        test_variables = TestVariables()
+        for records in [test_variables.blockchain, test_variables.token, test_variables.conversion_fee,
+                        test_variables.token_pair, test_variables.wallet_pair, test_variables.conversion,
+                        test_variables.conversion_transaction, test_variables.transaction]:
+            conversion_repo.session.add_all(records)
+            conversion_repo.session.commit()
+
+    def assert_no_full_scan(self, repository_query):
+        with captured_statements() as statements:
+            repository_query()
+        self.assertTrue(statements)
+
+        with engine.connect() as connection:
+            cursor = connection.connection.cursor()
+            cursor.execute("SET SESSION max_seeks_for_key = 1")
+            try:
+                for statement, parameters in statements:
+                    cursor.execute(f"EXPLAIN {statement}", parameters)
+                    columns = [column[0] for column in cursor.description]
+                    for plan in [dict(zip(columns, row)) for row in cursor.fetchall()]:
+                        table = re.sub(r"_\d+$", "", plan["table"] or "")
+                        if table in HOT_TABLES:
+                            self.assertNotIn(plan["type"], ("ALL", "index"), f"Full scan on {table} for {statement}")
+                            self.assertIsNotNone(plan["key"], f"No index used on {table} for {statement}")
+            finally:
+                # The connection goes back to the pool
+                cursor.execute("SET SESSION max_seeks_for_key = DEFAULT")
+                cursor.close()
+
+    def test_get_transaction_by_hash(self):
+        self.assert_no_full_scan(
+            lambda: conversion_repo.get_transaction_by_hash(tx_hash="22477fd4ea994689a04646cbbaafd133"))
+
+    def test_conversion_history(self):
+        self.assert_no_full_scan(lambda: conversion_repo.get_conversion_history_count(address=ETHEREUM_ADDRESS))
+        self.assert_no_full_scan(lambda: conversion_repo.get_conversion_history(address=ETHEREUM_ADDRESS,
+                                                                                conversion_id=None))
+        self.assert_no_full_scan(lambda: conversion_repo.get_conversion_history_after(
+            address=ETHEREUM_ADDRESS, limit=16, status_rank=2, created_at=datetime(2022, 1, 12), row_id=2))
+        self.assert_no_full_scan(lambda: conversion_repo.get_conversion_count_by_status(address=ETHEREUM_ADDRESS))
+
+    def test_conversion_aggregate(self):
+        self.assert_no_full_scan(
+            lambda: conversion_repo.get_conversion_aggregate(conversion_id="51769f201e46446fb61a9c197cb0706b"))
+
+    def test_liquidity_sums(self):
+        self.assert_no_full_scan(lambda: conversion_repo.get_processing_claim_amount_for_token_pair(
+            target_token_pair_id="22477fd4ea994689a04646cbbaafd133"))
+        self.assert_no_full_scan(lambda: conversion_repo.get_initiated_claim_amount_for_token_pair(
+            target_token_pair_id="22477fd4ea994689a04646cbbaafd133"))
+
+    def test_get_latest_user_pending_conversion_request(self):
+        self.assert_no_full_scan(lambda: conversion_repo.get_latest_user_pending_conversion_request(
+            wallet_pair_id=TestVariables().wallet_pair_id_1, status=ConversionStatus.USER_INITIATED.value))
+
+    def test_roll_up_conversions(self):
+        self.assert_no_full_scan(lambda: conversion_repo.roll_up_conversions(
+            date=date(2022, 1, 12), rolled_up_at=datetime(2022, 1, 13, 4, 10, 54)))
+        self.assert_no_full_scan(lambda: conversion_repo.get_updated_conversion_dates(
+            updated_since=datetime(2022, 1, 13, 4, 10, 54), before_date=date(2022, 1, 13)))
+
+    def test_expire_conversions(self):
+        self.assert_no_full_scan(lambda: conversion_repo.expire_conversions(
+            expire_datetime=datetime(2022, 1, 12, 4, 10, 54), batch_size=100))
+
+    def tearDown(self):
+        TestQueryPlans.delete_all_tables()
+
+    @staticmethod
+    def delete_all_tables():
+        for db_model in [TransactionDBModel, ConversionTransactionDBModel, ConversionDBModel, WalletPairDBModel,
+                         TokenPairLiquidityDBModel, ConversionDailyRollupDBModel, TokenPairDBModel,
+                         ConversionFeeDBModel, TokenDBModel, BlockChainDBModel]:
+            conversion_repo.session.query(db_model).delete()
+            conversion_repo.session.commit()
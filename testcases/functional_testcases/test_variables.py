@@ -51,8 +51,8 @@ def create_conversion(row_id, id, wallet_pair_id, deposit_amount, claim_amount,
                       created_by, created_at, updated_at):
     return ConversionDBModel(row_id=row_id, id=id, wallet_pair_id=wallet_pair_id, deposit_amount=deposit_amount,
                              claim_amount=claim_amount, fee_amount=fee_amount, status=status,
-                             claim_signature=claim_signature, created_by=created_by, created_at=created_at,
-                             updated_at=updated_at)
+                             claim_signature=claim_signature, expires_at=created_at, created_by=created_by,
+                             created_at=created_at, updated_at=updated_at)
 
 
 def create_conversion_transaction(row_id, id, conversion_id, status, created_by, created_at, updated_at):
@@ -4,7 +4,8 @@ from unittest.mock import patch
 
 from application.handler.wallet_handlers import get_all_deposit_address, get_wallets_address_by_ethereum_address
 from infrastructure.models import TransactionDBModel, ConversionTransactionDBModel, ConversionDBModel, \
-    WalletPairDBModel, TokenPairDBModel, ConversionFeeDBModel, TokenDBModel, BlockChainDBModel, MessageGroupPoolDBModel
+    WalletPairDBModel, TokenPairDBModel, ConversionFeeDBModel, TokenDBModel, BlockChainDBModel, \
+    MessageGroupPoolDBModel, TokenPairLiquidityDBModel
 from infrastructure.repositories.wallet_pair_repository import WalletPairRepository
 from testcases.functional_testcases.test_variables import TestVariables
 
@@ -105,6 +106,8 @@ class TestWallet(unittest.TestCase):
         wallet_repo.session.commit()
         wallet_repo.session.query(WalletPairDBModel).delete()
         wallet_repo.session.commit()
+        wallet_repo.session.query(TokenPairLiquidityDBModel).delete()
+        wallet_repo.session.commit()
         wallet_repo.session.query(TokenPairDBModel).delete()
         wallet_repo.session.commit()
         wallet_repo.session.query(ConversionFeeDBModel).delete()
@@ -0,0 +1,45 @@
+import unittest
+from unittest.mock import patch, Mock
+
+from constants.general import BlockchainName
+from utils.block_height import get_latest_block_number, get_block_number_lag, block_height_caches
+
+
+class TestBlockHeightCache(unittest.TestCase):
+
+    def setUp(self):
+        self.ttls = {blockchain_name: cache.ttl for blockchain_name, cache in block_height_caches.items()}
+        for cache in block_height_caches.values():
+            cache.ttl = 12
+            cache.clear()
+
+    @patch.dict("utils.block_height.MAX_CACHED_BLOCK_LAG", {"CARDANO": 8, "ETHEREUM": 2})
+    @patch("common.blockchain_util.BlockChainUtil.get_current_block_no")
+    def test_evm_block_height_is_cached_per_chain(self, mock_get_current_block_no):
+        mock_get_current_block_no.side_effect = [100, 200]
+
+        self.assertEqual(100, get_latest_block_number(blockchain_name=BlockchainName.ETHEREUM, chain_id=42))
+        self.assertEqual(100, get_latest_block_number(blockchain_name=BlockchainName.ETHEREUM, chain_id=42))
+        self.assertEqual(200, get_latest_block_number(blockchain_name=BlockchainName.BINANCE, chain_id=97))
+        self.assertEqual(2, mock_get_current_block_no.call_count)
+        self.assertEqual(2, get_block_number_lag(blockchain_name=BlockchainName.ETHEREUM))
+
+    @patch.dict("utils.block_height.MAX_CACHED_BLOCK_LAG", {"CARDANO": 8, "ETHEREUM": 2})
+    @patch("utils.cardano_blockchain.CardanoBlockchainUtil.get_latest_block")
+    def test_cardano_block_height_is_cached(self, mock_get_latest_block):
+        mock_get_latest_block.return_value = Mock(height=7000)
+
+        self.assertEqual(7000, get_latest_block_number(blockchain_name=BlockchainName.CARDANO, chain_id=2))
+        self.assertEqual(7000, get_latest_block_number(blockchain_name=BlockchainName.CARDANO, chain_id=2))
+        self.assertEqual(1, mock_get_latest_block.call_count)
+        self.assertEqual(8, get_block_number_lag(blockchain_name=BlockchainName.CARDANO))
+
+        block_height_caches[BlockchainName.CARDANO].ttl = 0
+        get_latest_block_number(blockchain_name=BlockchainName.CARDANO, chain_id=2)
+        self.assertEqual(2, mock_get_latest_block.call_count)
+        self.assertEqual(0, get_block_number_lag(blockchain_name=BlockchainName.CARDANO))
+
+    def tearDown(self):
+        for blockchain_name, cache in block_height_caches.items():
+            cache.ttl = self.ttls[blockchain_name]
+            cache.clear()
@@ -1,10 +1,15 @@
 import unittest
+from unittest.mock import patch
 
-from utils.blockchain import is_valid_cardano_address
+from utils.blockchain import is_valid_cardano_address, validate_cardano_address, cardano_address_cache
+from utils.exceptions import BadRequestException
 
 
 class TestAddressValidation(unittest.TestCase):
 
+    def setUp(self):
+        cardano_address_cache.clear()
+
     def test_cardano_address_validation(self):
         valid_cardano_address = "addr1q8v2v2whcj7tjagumt4cxjcma4aj8f8ev443fcxp40l70wdpdetpt7deeagf8kyvwndem3ehlh0twf4vmqjdfvqtseaq7ynqs0"
         result = is_valid_cardano_address(valid_cardano_address)
@@ -13,3 +18,27 @@ class TestAddressValidation(unittest.TestCase):
         invalid_cardano_address = "q8v2v2whcj7tjagumt4cxjcma4aj8f8ev453fcxp40l80wdpdetpt7debugf8kyvwndem3ehlh0twf4vmqjdfvqtseaq7ynqs0"
         result = is_valid_cardano_address(invalid_cardano_address)
         self.assertEqual(False, result)
+
+    @patch("utils.cardano_blockchain.CardanoBlockchainUtil.get_address_detail")
+    def test_shelley_address_is_validated_locally(self, mock_get_address_detail):
+        mainnet_address = "addr1q8v2v2whcj7tjagumt4cxjcma4aj8f8ev443fcxp40l70wdpdetpt7deeagf8kyvwndem3ehlh0twf4vmqjdfvqtseaq7ynqs0"
+        testnet_address = "addr_test1qza8485avt2xn3vy63plawqt0gk3ykpf98wusc4qrml2avu0pkm5rp3pkz6q4n3kf8znlf3y749lll8lfmg5x86kgt8qju7vx8"
+
+        validate_cardano_address(address=mainnet_address, chain_id=1)
+        validate_cardano_address(address=testnet_address, chain_id=2)
+        validate_cardano_address(address=testnet_address, chain_id=0)
+        self.assertRaises(BadRequestException, validate_cardano_address, address=mainnet_address, chain_id=2)
+        self.assertRaises(BadRequestException, validate_cardano_address, address=testnet_address, chain_id=1)
+        self.assertRaises(BadRequestException, validate_cardano_address, address=testnet_address[:-1] + "a",
+                          chain_id=2)
+        mock_get_address_detail.assert_not_called()
+
+    @patch("utils.cardano_blockchain.CardanoBlockchainUtil.get_address_detail")
+    def test_byron_address_is_looked_up_once(self, mock_get_address_detail):
+        byron_address = "Ae2tdPwUPEZFRbyhz3cpfC2CumGzNkFBN2L42rcUc2yjQpEkxDbkPodpMAi"
+        for _ in range(2):
+            validate_cardano_address(address=byron_address, chain_id=1)
+        self.assertEqual(1, mock_get_address_detail.call_count)
+
+    def tearDown(self):
+        cardano_address_cache.clear()
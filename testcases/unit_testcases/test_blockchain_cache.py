@@ -0,0 +1,56 @@
+import unittest
+from unittest.mock import patch
+
+from domain.factory.blockchain_factory import BlockchainFactory
+from infrastructure.repositories.blockchain_repository import BlockchainRepository, blockchain_cache
+
+blockchains = [
+    BlockchainFactory.blockchain(id="a38b4038c3a04810805fb26056dfabdd", name="Ethereum", symbol="ETH", chain_id=42,
+                                 block_confirmation=25, is_extension_available=True),
+    BlockchainFactory.blockchain(id="5b21294fe71a4145a40f6ab918a50f96", name="Cardano", symbol="ADA", chain_id=2,
+                                 block_confirmation=23, is_extension_available=False)
+]
+
+
+class TestBlockchainCache(unittest.TestCase):
+
+    def setUp(self):
+        self.ttl = blockchain_cache.ttl
+        blockchain_cache.ttl = 60
+        blockchain_cache.clear()
+
+    @patch("infrastructure.repositories.blockchain_repository.BlockchainRepository"
+           "._BlockchainRepository__get_all_blockchain_from_db")
+    def test_blockchains_are_loaded_once(self, mock_get_all_blockchain_from_db):
+        mock_get_all_blockchain_from_db.return_value = blockchains
+        blockchain_repo = BlockchainRepository()
+
+        self.assertEqual("Ethereum", blockchain_repo.get_blockchain(name="ethereum").name)
+        self.assertEqual(2, blockchain_repo.get_blockchain(name="CARDANO").chain_id)
+        self.assertIsNone(blockchain_repo.get_blockchain(name="Binance"))
+        self.assertEqual(blockchains, blockchain_repo.get_all_blockchain())
+        self.assertEqual(1, mock_get_all_blockchain_from_db.call_count)
+
+        blockchain_cache.clear()
+        blockchain_repo.get_blockchain(name="Ethereum")
+        self.assertEqual(2, mock_get_all_blockchain_from_db.call_count)
+
+    @patch("infrastructure.repositories.blockchain_repository.BlockchainRepository"
+           "._BlockchainRepository__get_to_token_data_by_token_pair_id_from_db")
+    def test_to_token_data_is_cached_per_token_pair(self, mock_get_to_token_data):
+        mock_get_to_token_data.side_effect = [("Ethereum", 42, "AGIX", "0xa1e841e8f770e5c9507e2f8cfd0aa6f73009715d"),
+                                              None, None]
+        blockchain_repo = BlockchainRepository()
+
+        blockchain_repo.get_to_token_data_by_token_pair_id(token_pair_id="22477fd4ea994689a04646cbbaafd133")
+        blockchain_repo.get_to_token_data_by_token_pair_id(token_pair_id="22477fd4ea994689a04646cbbaafd133")
+        self.assertEqual(1, mock_get_to_token_data.call_count)
+
+        # Unknown token pairs are not cached
+        self.assertIsNone(blockchain_repo.get_to_token_data_by_token_pair_id(token_pair_id="unknown"))
+        self.assertIsNone(blockchain_repo.get_to_token_data_by_token_pair_id(token_pair_id="unknown"))
+        self.assertEqual(3, mock_get_to_token_data.call_count)
+
+    def tearDown(self):
+        blockchain_cache.ttl = self.ttl
+        blockchain_cache.clear()
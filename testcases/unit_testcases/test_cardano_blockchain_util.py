@@ -0,0 +1,40 @@
+import unittest
+from unittest.mock import patch
+
+from utils.cardano_blockchain import get_cardano_blockchain_util, clear_cardano_blockchain_utils, \
+    transaction_utxos_cache
+
+
+class TestCardanoBlockchainUtil(unittest.TestCase):
+
+    def setUp(self):
+        clear_cardano_blockchain_utils()
+        transaction_utxos_cache.clear()
+
+    def test_clients_are_reused_per_chain_id(self):
+        cardano_blockchain = get_cardano_blockchain_util(chain_id=2)
+        self.assertIs(cardano_blockchain, get_cardano_blockchain_util(chain_id=2))
+        self.assertIsNot(cardano_blockchain, get_cardano_blockchain_util(chain_id=1))
+
+    @patch("blockfrost.BlockFrostApi.transaction_utxos")
+    def test_transaction_utxos_are_cached(self, mock_transaction_utxos):
+        mock_transaction_utxos.side_effect = [{"hash": "tx1"}, {"hash": "tx2"}, {"hash": "tx1"}]
+        cardano_blockchain = get_cardano_blockchain_util(chain_id=2)
+
+        self.assertEqual({"hash": "tx1"}, cardano_blockchain.get_transaction_utxos(transaction_hash="tx1"))
+        self.assertEqual({"hash": "tx1"}, cardano_blockchain.get_transaction_utxos(transaction_hash="tx1"))
+        self.assertEqual({"hash": "tx2"}, cardano_blockchain.get_transaction_utxos(transaction_hash="tx2"))
+        self.assertEqual(2, mock_transaction_utxos.call_count)
+
+        max_size = transaction_utxos_cache.max_size
+        try:
+            transaction_utxos_cache.max_size = 1
+            transaction_utxos_cache.set(key="tx3", value={"hash": "tx3"})
+            self.assertIsNone(transaction_utxos_cache.get(key=(cardano_blockchain.base_url, "tx1")))
+            self.assertEqual({"hash": "tx3"}, transaction_utxos_cache.get(key="tx3"))
+        finally:
+            transaction_utxos_cache.max_size = max_size
+
+    def tearDown(self):
+        clear_cardano_blockchain_utils()
+        transaction_utxos_cache.clear()
@@ -0,0 +1,53 @@
+import unittest
+from threading import Barrier, Event
+
+from utils.concurrency import run_concurrently, MAX_WORKERS
+
+
+class TestRunConcurrently(unittest.TestCase):
+
+    def test_results_are_returned_by_name(self):
+        # Each task waits for the other one, which only succeeds when both run at the same time
+        barrier = Barrier(2, timeout=5)
+        results = run_concurrently({"first": lambda: barrier.wait() is not None and 1,
+                                    "second": lambda: barrier.wait() is not None and 2})
+
+        self.assertEqual({"first": 1, "second": 2}, results)
+
+    def test_failure_is_raised_by_task_order(self):
+        second_failed = Event()
+
+        def fail_first():
+            second_failed.wait(5)
+            raise ValueError("first")
+
+        def fail_second():
+            second_failed.set()
+            raise KeyError("second")
+
+        with self.assertRaises(ValueError):
+            run_concurrently({"first": fail_first, "second": fail_second})
+
+    def test_failure_does_not_wait_for_slower_tasks(self):
+        release = Event()
+        slow_task_finished = Event()
+        queued_task_ran = Event()
+
+        def fail():
+            raise ValueError("first")
+
+        def slow():
+            release.wait(5)
+            slow_task_finished.set()
+
+        # The slow tasks take every worker, so the last task is still queued when the failure is raised
+        tasks = {"first": fail}
+        tasks.update({f"slow_{index}": slow for index in range(MAX_WORKERS)})
+        tasks["queued"] = queued_task_ran.set
+        try:
+            with self.assertRaises(ValueError):
+                run_concurrently(tasks)
+            self.assertFalse(slow_task_finished.is_set())
+        finally:
+            release.set()
+        self.assertFalse(queued_task_ran.wait(0.5))
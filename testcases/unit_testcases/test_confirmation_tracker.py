@@ -0,0 +1,147 @@
+import unittest
+from unittest.mock import patch, Mock
+
+from application.service.consumer_service import ConsumerService
+from utils.exceptions import BlockConfirmationNotEnoughException, InternalServerErrorException
+from utils.lambdas import set_invocation_deadline
+
+blockchain = {"id": "a38b4038c3a04810805fb26056dfabdd", "name": "Ethereum", "chain_id": 42, "block_confirmation": 25}
+
+
+class TestConfirmationTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.consumer_service = ConsumerService()
+
+    @patch.dict("utils.blockchain.CONFIRMATION_TRACKER", {"ETHEREUM": True})
+    @patch("application.service.conversion_service.ConversionService.release_transaction_claim")
+    @patch("application.service.conversion_service.ConversionService.get_expired_transaction_claims",
+           return_value=[])
+    @patch("application.service.consumer_service.ConsumerService.process_confirmed_conversion")
+    @patch("application.service.conversion_service.ConversionService.get_conversion_detail_by_tx_id")
+    @patch("application.service.conversion_service.ConversionService.set_transaction_confirmed")
+    @patch("application.service.conversion_service.ConversionService.update_transaction_confirmations")
+    @patch("application.service.consumer_service.fetch_latest_block_number")
+    @patch("application.service.blockchain_service.BlockchainService.get_blockchain")
+    def test_confirmed_transactions_are_processed_once(self, mock_get_blockchain, mock_fetch_latest_block_number,
+                                                       mock_update_transaction_confirmations,
+                                                       mock_set_transaction_confirmed,
+                                                       mock_get_conversion_detail_by_tx_id,
+                                                       mock_process_confirmed_conversion,
+                                                       mock_get_expired_transaction_claims,
+                                                       mock_release_transaction_claim):
+        mock_get_blockchain.return_value = blockchain
+        mock_fetch_latest_block_number.return_value = 1200
+        mock_update_transaction_confirmations.return_value = ["tx_1", "tx_2"]
+        # tx_2 was confirmed meanwhile by the event consumer
+        mock_set_transaction_confirmed.side_effect = [True, False]
+        mock_get_conversion_detail_by_tx_id.return_value = {"id": "conversion_1"}
+
+        self.consumer_service.track_block_confirmations(blockchain_name="Ethereum")
+        mock_fetch_latest_block_number.assert_called_once()
+        mock_update_transaction_confirmations.assert_called_once_with(blockchain_id=blockchain["id"],
+                                                                      latest_block_number=1200)
+        mock_get_conversion_detail_by_tx_id.assert_called_once_with(tx_id="tx_1")
+        mock_process_confirmed_conversion.assert_called_once_with(conversion_id="conversion_1")
+        mock_release_transaction_claim.assert_called_once_with(tx_id="tx_1")
+
+    @patch.dict("utils.blockchain.CONFIRMATION_TRACKER", {"ETHEREUM": True})
+    @patch("application.service.conversion_service.ConversionService.release_transaction_claim")
+    @patch("application.service.conversion_service.ConversionService.get_expired_transaction_claims",
+           return_value=[])
+    @patch("application.service.consumer_service.ConsumerService.process_confirmed_conversion")
+    @patch("application.service.conversion_service.ConversionService.get_conversion_detail_by_tx_id")
+    @patch("application.service.conversion_service.ConversionService.set_transaction_waiting_for_confirmation")
+    @patch("application.service.conversion_service.ConversionService.set_transaction_confirmed")
+    @patch("application.service.conversion_service.ConversionService.update_transaction_confirmations")
+    @patch("application.service.consumer_service.fetch_latest_block_number")
+    @patch("application.service.blockchain_service.BlockchainService.get_blockchain")
+    def test_failed_transaction_is_handed_back(self, mock_get_blockchain, mock_fetch_latest_block_number,
+                                               mock_update_transaction_confirmations, mock_set_transaction_confirmed,
+                                               mock_set_transaction_waiting_for_confirmation,
+                                               mock_get_conversion_detail_by_tx_id,
+                                               mock_process_confirmed_conversion, mock_get_expired_transaction_claims,
+                                               mock_release_transaction_claim):
+        mock_get_blockchain.return_value = blockchain
+        mock_fetch_latest_block_number.return_value = 1200
+        mock_update_transaction_confirmations.return_value = ["tx_1", "tx_2"]
+        mock_set_transaction_confirmed.return_value = True
+        mock_get_conversion_detail_by_tx_id.side_effect = [{"id": "conversion_1"}, {"id": "conversion_2"}]
+        mock_process_confirmed_conversion.side_effect = [InternalServerErrorException(error_code="E0001"), None]
+
+        self.assertRaises(InternalServerErrorException, self.consumer_service.track_block_confirmations,
+                          blockchain_name="Ethereum")
+        self.assertEqual(2, mock_process_confirmed_conversion.call_count)
+        mock_process_confirmed_conversion.assert_called_with(conversion_id="conversion_2")
+        mock_set_transaction_waiting_for_confirmation.assert_called_once_with(tx_id="tx_1")
+        mock_release_transaction_claim.assert_called_once_with(tx_id="tx_2")
+
+    @patch.dict("utils.blockchain.CONFIRMATION_TRACKER", {"ETHEREUM": True})
+    @patch.dict("application.service.consumer_service.CONFIRMATION_TRACKER_RUN", {"DEADLINE_MARGIN": 10})
+    @patch("application.service.conversion_service.ConversionService.release_transaction_claim")
+    @patch("application.service.conversion_service.ConversionService.reclaim_transaction")
+    @patch("application.service.conversion_service.ConversionService.get_expired_transaction_claims")
+    @patch("application.service.consumer_service.ConsumerService.process_confirmed_conversion")
+    @patch("application.service.conversion_service.ConversionService.get_conversion_detail_by_tx_id")
+    @patch("application.service.conversion_service.ConversionService.set_transaction_confirmed")
+    @patch("application.service.conversion_service.ConversionService.update_transaction_confirmations")
+    @patch("application.service.consumer_service.fetch_latest_block_number")
+    @patch("application.service.blockchain_service.BlockchainService.get_blockchain")
+    def test_expired_claims_are_processed_until_the_deadline(self, mock_get_blockchain,
+                                                             mock_fetch_latest_block_number,
+                                                             mock_update_transaction_confirmations,
+                                                             mock_set_transaction_confirmed,
+                                                             mock_get_conversion_detail_by_tx_id,
+                                                             mock_process_confirmed_conversion,
+                                                             mock_get_expired_transaction_claims,
+                                                             mock_reclaim_transaction,
+                                                             mock_release_transaction_claim):
+        mock_get_blockchain.return_value = blockchain
+        mock_fetch_latest_block_number.return_value = 1200
+        mock_update_transaction_confirmations.return_value = ["tx_2"]
+        # tx_1 was confirmed by a run which timed out before processing its conversion
+        mock_get_expired_transaction_claims.return_value = ["tx_1"]
+        mock_reclaim_transaction.return_value = True
+        mock_get_conversion_detail_by_tx_id.return_value = {"id": "conversion_1"}
+
+        # The deadline is reached while processing tx_1, so tx_2 is left waiting for the next run
+        context = Mock()
+        context.get_remaining_time_in_millis.return_value = 60000
+        set_invocation_deadline(context)
+        mock_process_confirmed_conversion.side_effect = lambda conversion_id: set_invocation_deadline(
+            Mock(get_remaining_time_in_millis=Mock(return_value=5000)))
+
+        self.consumer_service.track_block_confirmations(blockchain_name="Ethereum")
+        self.assertEqual(blockchain["id"], mock_get_expired_transaction_claims.call_args.kwargs["blockchain_id"])
+        mock_reclaim_transaction.assert_called_once_with(
+            tx_id="tx_1", claimed_before=mock_get_expired_transaction_claims.call_args.kwargs["claimed_before"])
+        mock_process_confirmed_conversion.assert_called_once_with(conversion_id="conversion_1")
+        mock_release_transaction_claim.assert_called_once_with(tx_id="tx_1")
+        mock_set_transaction_confirmed.assert_not_called()
+
+    @patch("application.service.consumer_service.fetch_latest_block_number")
+    def test_untracked_blockchain_is_skipped(self, mock_fetch_latest_block_number):
+        self.consumer_service.track_block_confirmations(blockchain_name="Ethereum")
+        mock_fetch_latest_block_number.assert_not_called()
+
+    @patch("application.service.conversion_service.ConversionService.set_transaction_block_number")
+    @patch("application.service.consumer_service.get_transaction_block_number")
+    def test_transaction_not_in_a_block_is_not_handed_over(self, mock_get_transaction_block_number,
+                                                             mock_set_transaction_block_number):
+        mock_get_transaction_block_number.return_value = None
+        self.assertRaises(BlockConfirmationNotEnoughException,
+                          self.consumer_service.hand_over_to_confirmation_tracker, tx_id="tx_1",
+                          blockchain_name="ethereum", tx_hash="0x1", network_id=42)
+        mock_set_transaction_block_number.assert_not_called()
+
+    @patch("application.service.conversion_service.ConversionService.set_transaction_block_number")
+    @patch("application.service.consumer_service.get_transaction_block_number")
+    def test_transaction_is_handed_over_with_its_block_number(self, mock_get_transaction_block_number,
+                                                               mock_set_transaction_block_number):
+        mock_get_transaction_block_number.return_value = 1180
+        self.consumer_service.hand_over_to_confirmation_tracker(tx_id="tx_1", blockchain_name="ethereum",
+                                                                tx_hash="0x1", network_id=42)
+        mock_set_transaction_block_number.assert_called_once_with(tx_id="tx_1", block_number=1180)
+
+    def tearDown(self):
+        set_invocation_deadline(None)
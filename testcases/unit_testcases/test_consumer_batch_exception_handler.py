@@ -0,0 +1,107 @@
+import json
+import unittest
+from unittest.mock import patch, Mock
+
+from common.logger import get_logger
+from utils.exception_handler import consumer_batch_exception_handler
+from utils.exceptions import InternalServerErrorException, BadRequestException, BlockConfirmationNotEnoughException
+
+logger = get_logger(__name__)
+
+
+def prepare_event(*bodies, message_group_id=None):
+    records = []
+    for index, body in enumerate(bodies):
+        record = {"messageId": str(index), "body": json.dumps(body), "attributes": {}}
+        if message_group_id:
+            record["attributes"]["MessageGroupId"] = message_group_id
+        records.append(record)
+    return {"Records": records}
+
+
+class TestConsumerBatchExceptionHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.process = Mock()
+
+        @consumer_batch_exception_handler(SLACK_HOOK={}, logger=logger)
+        def handler(event, context):
+            for record in event["Records"]:
+                self.process(json.loads(record["body"]))
+
+        self.handler = handler
+
+    @patch("common.utils.Utils.report_slack")
+    def test_only_failed_records_are_reported(self, mock_report_slack):
+        self.process.side_effect = [None, InternalServerErrorException(error_code=None, error_details=None),
+                                    BadRequestException(error_code=None, error_details=None)]
+
+        response = self.handler(prepare_event({"id": 1}, {"id": 2}, {"id": 3}), {})
+        self.assertEqual({"batchItemFailures": [{"itemIdentifier": "1"}]}, response)
+        self.assertEqual(3, self.process.call_count)
+        self.assertEqual(1, mock_report_slack.call_count)
+
+        self.process.side_effect = None
+        self.assertIsNone(self.handler(prepare_event({"id": 1}, {"id": 2}), {}))
+
+    @patch("common.utils.Utils.report_slack")
+    def test_fifo_message_group_stops_after_failure(self, mock_report_slack):
+        self.process.side_effect = [None, InternalServerErrorException(error_code=None, error_details=None)]
+
+        response = self.handler(prepare_event({"id": 1}, {"id": 2}, {"id": 3}, message_group_id="group"), {})
+        self.assertEqual({"batchItemFailures": [{"itemIdentifier": "1"}, {"itemIdentifier": "2"}]}, response)
+        self.assertEqual(2, self.process.call_count)
+
+    @patch("common.utils.Utils.report_slack")
+    def test_error_is_raised_when_every_record_fails(self, mock_report_slack):
+        self.process.side_effect = InternalServerErrorException(error_code=None, error_details=None)
+        self.assertRaises(InternalServerErrorException, self.handler, prepare_event({"id": 1}), {})
+
+    @patch("utils.sqs.get_sqs_client")
+    def test_unconfirmed_fifo_record_redelivery_is_delayed(self, mock_get_sqs_client):
+        @consumer_batch_exception_handler(SLACK_HOOK={}, REDELIVERY_DELAY={"BLOCK_CONFIRMATION": 15, "MAX": 100},
+                                          logger=logger)
+        def handler(event, context):
+            for record in event["Records"]:
+                self.process(json.loads(record["body"]))
+
+        event = prepare_event({"id": 1}, {"id": 2}, {"id": 3})
+        for index, record in enumerate(event["Records"]):
+            record["attributes"]["ApproximateReceiveCount"] = str(index * 2 + 1)
+            record["receiptHandle"] = f"handle-{index}"
+            record["eventSourceARN"] = "arn:aws:sqs:us-east-1:000000000000:converter-bridge1.fifo"
+        not_enough_confirmations = BlockConfirmationNotEnoughException(error_code=None, error_details=None)
+        self.process.side_effect = [not_enough_confirmations, None, not_enough_confirmations]
+
+        response = handler(event, {})
+        self.assertEqual({"batchItemFailures": [{"itemIdentifier": "0"}, {"itemIdentifier": "2"}]}, response)
+        mock_change_message_visibility = mock_get_sqs_client.return_value.change_message_visibility
+        queue_url = "https://sqs.us-east-1.amazonaws.com/000000000000/converter-bridge1.fifo"
+        self.assertEqual([{"QueueUrl": queue_url, "ReceiptHandle": "handle-0", "VisibilityTimeout": 15},
+                          {"QueueUrl": queue_url, "ReceiptHandle": "handle-2", "VisibilityTimeout": 100}],
+                         [call.kwargs for call in mock_change_message_visibility.call_args_list])
+
+    @patch.dict("utils.sqs.MAX_RETRY", {"BLOCK_CONFIRMATION": 2})
+    @patch("common.utils.Utils.report_slack")
+    @patch("utils.sqs.get_sqs_client")
+    def test_unconfirmed_record_is_sent_again_with_its_attempt(self, mock_get_sqs_client, mock_report_slack):
+        @consumer_batch_exception_handler(SLACK_HOOK={}, REDELIVERY_DELAY={"BLOCK_CONFIRMATION": 15, "MAX": 100},
+                                          logger=logger)
+        def handler(event, context):
+            for record in event["Records"]:
+                self.process(json.loads(record["body"]))
+
+        event = prepare_event({"id": 1}, {"id": 2})
+        for record in event["Records"]:
+            record["eventSourceARN"] = "arn:aws:sqs:us-east-1:000000000000:event-consumer"
+        event["Records"][1]["messageAttributes"] = {"attempt": {"stringValue": "3", "dataType": "Number"}}
+        self.process.side_effect = BlockConfirmationNotEnoughException(error_code=None, error_details=None)
+
+        # The first record is sent again, the second one used up its redeliveries and fails
+        response = handler(event, {})
+        self.assertEqual({"batchItemFailures": [{"itemIdentifier": "1"}]}, response)
+        mock_get_sqs_client.return_value.send_message.assert_called_once_with(
+            QueueUrl="https://sqs.us-east-1.amazonaws.com/000000000000/event-consumer",
+            MessageBody=json.dumps({"id": 1}), DelaySeconds=15,
+            MessageAttributes={"attempt": {"DataType": "Number", "StringValue": "2"}})
+        mock_get_sqs_client.return_value.change_message_visibility.assert_not_called()
@@ -0,0 +1,16 @@
+import json
+import unittest
+
+from application.factory.consumer_factory import convert_consumer_event
+
+
+class TestConsumerFactory(unittest.TestCase):
+
+    def test_convert_sns_wrapped_consumer_event(self):
+        cardano_event = {"tx_hash": "4f8b6d8e2a1c", "event_type": "TOKEN_RECEIVED", "tx_amount": "1000"}
+        ethereum_event = {"blockchain_name": "Ethereum", "blockchain_event": {"name": "ConversionOut", "data": {}}}
+        event = {"Records": [{"body": json.dumps({"Type": "Notification", "Message": json.dumps(cardano_event)})},
+                             {"body": json.dumps({"Type": "Notification", "Message": json.dumps(ethereum_event)})}]}
+
+        self.assertEqual([{"blockchain_name": "Cardano", "blockchain_event": cardano_event}, ethereum_event],
+                         convert_consumer_event(event))
@@ -0,0 +1,48 @@
+import unittest
+from unittest.mock import patch
+
+from web3 import Web3
+
+from utils.blockchain import get_token_contract_instance, contract_cache
+from utils.web3_provider import get_blockchain_util, get_evm_web3_object, clear_providers
+
+CONTRACT_ADDRESS = Web3.toChecksumAddress("0xacc7fc3d6a8bdb0ef9bc0d28b3b6b0f3fd1d1b41")
+
+
+class TestContractCache(unittest.TestCase):
+
+    def setUp(self):
+        self.ttl = contract_cache.ttl
+        contract_cache.ttl = 60
+        contract_cache.clear()
+        clear_providers()
+
+    @patch("utils.blockchain.get_token_contract_path")
+    def test_abi_and_contract_instance_are_cached(self, mock_get_token_contract_path):
+        web3_object = get_blockchain_util(chain_id=42)
+        abi = [{"type": "function", "name": "getConverterBalance", "inputs": [], "outputs": []}]
+
+        with patch.object(web3_object, "load_contract", return_value=abi) as mock_load_contract:
+            contract_instance = get_token_contract_instance(web3_object=web3_object, token_symbol="AGIX",
+                                                            chain_id=42, contract_address=CONTRACT_ADDRESS)
+            self.assertIs(contract_instance, get_token_contract_instance(
+                web3_object=web3_object, token_symbol="agix", chain_id=42, contract_address=CONTRACT_ADDRESS))
+
+            # A new chain reuses the parsed abi
+            other_contract_instance = get_token_contract_instance(
+                web3_object=get_blockchain_util(chain_id=97), token_symbol="AGIX", chain_id=97,
+                contract_address=CONTRACT_ADDRESS)
+        self.assertIsNot(contract_instance, other_contract_instance)
+        self.assertIs(get_evm_web3_object(chain_id=42), contract_instance.web3)
+        self.assertIs(get_evm_web3_object(chain_id=97), other_contract_instance.web3)
+        self.assertEqual(1, mock_load_contract.call_count)
+        self.assertEqual(1, mock_get_token_contract_path.call_count)
+
+        # The shared util keeps the pooled provider of its chain
+        self.assertIs(get_evm_web3_object(chain_id=42).provider, web3_object.provider)
+        self.assertIs(get_evm_web3_object(chain_id=42), web3_object.web3_object)
+
+    def tearDown(self):
+        contract_cache.ttl = self.ttl
+        contract_cache.clear()
+        clear_providers()
@@ -0,0 +1,51 @@
+import unittest
+from datetime import date, datetime
+from unittest.mock import patch
+
+from application.service.conversion_service import ConversionService
+
+
+@patch("application.service.conversion_service.datetime_in_utcnow", lambda: datetime(2022, 1, 15, 4, 10, 54))
+@patch("application.service.conversion_service.ConversionService._ConversionService__generate_conversion_report")
+@patch("infrastructure.repositories.conversion_repository.ConversionRepository.roll_up_conversions")
+@patch("infrastructure.repositories.conversion_repository.ConversionRepository.get_updated_conversion_dates")
+@patch("infrastructure.repositories.conversion_repository.ConversionRepository.get_last_rollup_run_time")
+@patch("infrastructure.repositories.conversion_repository.ConversionRepository.get_last_rollup_date")
+class TestConversionDailyRollup(unittest.TestCase):
+
+    def rolled_up_dates(self, mock_roll_up_conversions):
+        return [call.kwargs["date"] for call in mock_roll_up_conversions.call_args_list]
+
+    def test_closed_days_since_last_rollup_and_updated_days_are_rolled_up(self, mock_get_last_rollup_date,
+                                                                          mock_get_last_rollup_run_time,
+                                                                          mock_get_updated_conversion_dates,
+                                                                          mock_roll_up_conversions,
+                                                                          mock_generate_conversion_report):
+        mock_get_last_rollup_run_time.return_value = datetime(2022, 1, 14, 4, 10, 12)
+        mock_get_last_rollup_date.return_value = date(2022, 1, 12)
+        mock_get_updated_conversion_dates.return_value = [date(2022, 1, 10), date(2022, 1, 12)]
+
+        ConversionService().generate_conversion_report()
+        self.assertEqual([date(2022, 1, 10), date(2022, 1, 12), date(2022, 1, 13), date(2022, 1, 14)],
+                         self.rolled_up_dates(mock_roll_up_conversions))
+        mock_get_updated_conversion_dates.assert_called_once_with(updated_since=datetime(2022, 1, 14, 4, 10, 12),
+                                                                  before_date=date(2022, 1, 13))
+        self.assertEqual({datetime(2022, 1, 15, 4, 10, 54)},
+                         {call.kwargs["rolled_up_at"] for call in mock_roll_up_conversions.call_args_list})
+        self.assertEqual([{"start_date": date(2022, 1, 14), "end_date": date(2022, 1, 14)},
+                          {"start_date": None, "end_date": date(2022, 1, 14)}],
+                         [call.kwargs for call in mock_generate_conversion_report.call_args_list])
+
+    @patch("infrastructure.repositories.conversion_repository.ConversionRepository.get_first_conversion_date")
+    def test_history_is_rolled_up_until_the_last_closed_day(self, mock_get_first_conversion_date,
+                                                            mock_get_last_rollup_date, mock_get_last_rollup_run_time,
+                                                            mock_get_updated_conversion_dates,
+                                                            mock_roll_up_conversions,
+                                                            mock_generate_conversion_report):
+        mock_get_first_conversion_date.return_value = date(2022, 1, 12)
+        mock_get_last_rollup_run_time.return_value = None
+
+        ConversionService().roll_up_conversion_history(end_date=date(2022, 2, 1))
+        self.assertEqual([date(2022, 1, 12), date(2022, 1, 13), date(2022, 1, 14)],
+                         self.rolled_up_dates(mock_roll_up_conversions))
+        mock_get_updated_conversion_dates.assert_not_called()
@@ -0,0 +1,27 @@
+import unittest
+from unittest.mock import patch
+
+from application.service.conversion_service import ConversionService
+
+
+class TestConversionExpiry(unittest.TestCase):
+
+    @patch("application.service.conversion_service.EXPIRE_CONVERSION_BATCH_SIZE", 100)
+    @patch("infrastructure.repositories.conversion_repository.ConversionRepository.expire_conversions")
+    def test_conversions_are_expired_in_batches(self, mock_expire_conversions):
+        mock_expire_conversions.side_effect = [100, 100, 42]
+
+        ConversionService().expire_conversion()
+        self.assertEqual(3, mock_expire_conversions.call_count)
+        expire_datetimes = {call.kwargs["expire_datetime"] for call in mock_expire_conversions.call_args_list}
+        self.assertEqual(1, len(expire_datetimes))
+        self.assertEqual({100}, {call.kwargs["batch_size"] for call in mock_expire_conversions.call_args_list})
+
+    @patch.dict("application.service.conversion_service.EXPIRE_CONVERSION", {"CARDANO": 5})
+    @patch("application.service.conversion_service.create_conversion_response")
+    @patch("infrastructure.repositories.conversion_repository.ConversionRepository.create_conversion")
+    def test_expiry_hours_of_from_blockchain_are_used_at_creation(self, mock_create_conversion,
+                                                                  mock_create_conversion_response):
+        ConversionService().create_conversion(wallet_pair_id=1, deposit_amount=100, fee_amount=0, claim_amount=100,
+                                              from_blockchain_name="Cardano")
+        self.assertEqual(5, mock_create_conversion.call_args.kwargs["expire_hours"])
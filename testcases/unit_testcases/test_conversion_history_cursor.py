@@ -0,0 +1,56 @@
+import unittest
+from datetime import datetime
+from unittest.mock import patch, Mock
+
+from application.service.conversion_service import ConversionService
+from constants.status import ConversionStatus
+from infrastructure.models import ConversionDBModel
+from utils.exceptions import BadRequestException
+from utils.general import encode_pagination_cursor, decode_pagination_cursor
+
+
+class TestConversionHistoryCursor(unittest.TestCase):
+
+    def test_cursor_encoding(self):
+        cursor = encode_pagination_cursor([2, "2022-01-12T04:10:54", 10])
+        self.assertEqual([2, "2022-01-12T04:10:54", 10], decode_pagination_cursor(cursor=cursor))
+        self.assertRaises(BadRequestException, decode_pagination_cursor, cursor="not a cursor")
+        self.assertRaises(BadRequestException, decode_pagination_cursor,
+                          cursor=encode_pagination_cursor({"row_id": 10}))
+
+    def test_status_rank_follows_status(self):
+        conversion = ConversionDBModel(status=ConversionStatus.USER_INITIATED.value)
+        self.assertEqual(2, conversion.status_rank)
+        conversion.status = ConversionStatus.EXPIRED.value
+        self.assertEqual(6, conversion.status_rank)
+
+    @patch("infrastructure.repositories.conversion_repository.ConversionRepository.get_conversion_history_after")
+    def test_get_conversion_history_by_cursor(self, mock_get_conversion_history_after):
+        created_at = datetime(2022, 1, 12, 4, 10, 54)
+        mock_get_conversion_history_after.return_value = [
+            (Mock(to_dict=Mock(return_value={"id": "a"})), (1, created_at, 12)),
+            (Mock(to_dict=Mock(return_value={"id": "b"})), (2, created_at, 11)),
+            (Mock(to_dict=Mock(return_value={"id": "c"})), (2, created_at, 10))]
+
+        with patch("application.service.conversion_service.get_conversion_history_response",
+                   side_effect=lambda history: history):
+            response = ConversionService().get_conversion_history_by_cursor(address="0xa", page_size=2, cursor="")
+        self.assertEqual([{"id": "a"}, {"id": "b"}], response["items"])
+        self.assertEqual([2, "2022-01-12T04:10:54", 11], decode_pagination_cursor(response["meta"]["next_cursor"]))
+        mock_get_conversion_history_after.assert_called_with(address="0xa", limit=3, status_rank=None,
+                                                             created_at=None, row_id=None)
+
+        mock_get_conversion_history_after.return_value = [
+            (Mock(to_dict=Mock(return_value={"id": "c"})), (2, created_at, 10))]
+        with patch("application.service.conversion_service.get_conversion_history_response",
+                   side_effect=lambda history: history):
+            response = ConversionService().get_conversion_history_by_cursor(
+                address="0xa", page_size=2, cursor=encode_pagination_cursor([2, "2022-01-12T04:10:54", 11]))
+        self.assertEqual([{"id": "c"}], response["items"])
+        self.assertIsNone(response["meta"]["next_cursor"])
+        mock_get_conversion_history_after.assert_called_with(address="0xa", limit=3, status_rank=2,
+                                                             created_at=created_at, row_id=11)
+
+    def test_invalid_cursor_key(self):
+        self.assertRaises(BadRequestException, ConversionService().get_conversion_history_by_cursor,
+                          address="0xa", page_size=2, cursor=encode_pagination_cursor([2, "yesterday", 11]))
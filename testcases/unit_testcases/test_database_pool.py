@@ -0,0 +1,48 @@
+import json
+import unittest
+
+from unittest.mock import Mock
+
+from sqlalchemy import create_engine
+
+from utils.database import get_engine_pool_kwargs, register_pool_metrics, pool_metrics, MeteredNullPool, \
+    MeteredQueuePool, log_pool_metrics
+
+
+class TestDatabasePool(unittest.TestCase):
+
+    def setUp(self):
+        pool_metrics.reset()
+
+    def test_pool_mode_settings(self):
+        pool_kwargs = get_engine_pool_kwargs(db_config={"DB_POOL_SIZE": 2, "DB_MAX_OVERFLOW": 0})
+        self.assertEqual(MeteredQueuePool, pool_kwargs["poolclass"])
+        self.assertEqual((2, 0), (pool_kwargs["pool_size"], pool_kwargs["max_overflow"]))
+
+        self.assertEqual(MeteredNullPool, get_engine_pool_kwargs(db_config={"DB_POOL_MODE": "NULL"})["poolclass"])
+
+        pool_kwargs = get_engine_pool_kwargs(db_config={"DB_POOL_MODE": "RDS_PROXY", "DB_POOL_RECYCLE": 3600})
+        self.assertEqual((1, 0, 240), (pool_kwargs["pool_size"], pool_kwargs["max_overflow"],
+                                       pool_kwargs["pool_recycle"]))
+
+        self.assertRaises(ValueError, get_engine_pool_kwargs, db_config={"DB_POOL_MODE": "UNKNOWN"})
+
+    def test_pool_metrics(self):
+        engine = create_engine("sqlite://", **get_engine_pool_kwargs(db_config={}))
+        register_pool_metrics(engine=engine)
+        for _ in range(2):
+            with engine.connect() as connection:
+                connection.exec_driver_sql("select 1")
+
+        metrics = pool_metrics.to_dict()
+        self.assertEqual((2, 2, 1), (metrics["checkouts"], metrics["checkins"], metrics["connects"]))
+        self.assertGreaterEqual(metrics["max_wait"], 0)
+
+        handler_logger = Mock()
+        log_pool_metrics(handler_logger=handler_logger, handler_name="converter_bridge")
+        self.assertEqual({"handler": "converter_bridge", "db_pool": metrics},
+                         json.loads(handler_logger.info.call_args[0][0]))
+        self.assertEqual(0, pool_metrics.to_dict()["checkouts"])
+
+    def tearDown(self):
+        pool_metrics.reset()
@@ -0,0 +1,83 @@
+import unittest
+from unittest.mock import patch, Mock
+
+import requests
+
+from utils.http_client import HttpClient, CircuitBreaker, CircuitOpenException, http_metrics
+
+
+def response(status_code):
+    return Mock(status_code=status_code)
+
+
+class TestHttpClient(unittest.TestCase):
+
+    def setUp(self):
+        http_metrics.reset()
+        self.client = HttpClient(name="cardano_service", base_path="https://cardano.service", connect_timeout=1,
+                                 read_timeout=2, max_retry=2, retry_backoff=0,
+                                 circuit_breaker=CircuitBreaker(name="cardano_service", failure_threshold=2,
+                                                                reset_timeout=60))
+
+    @patch("requests.Session.request")
+    def test_idempotent_retry(self, mock_request):
+        mock_request.side_effect = [requests.exceptions.ReadTimeout(), response(503), response(200)]
+        self.assertEqual(200, self.client.get(endpoint="token_liquidity", path="/AGIX/liquidity").status_code)
+        self.assertEqual(3, mock_request.call_count)
+        mock_request.assert_called_with(method="GET", url="https://cardano.service/AGIX/liquidity", timeout=(1, 2))
+        self.assertEqual({"calls": 1, "failures": 0},
+                         {name: value for name, value in http_metrics.to_dict()["cardano_service.token_liquidity"]
+                          .items() if name in ["calls", "failures"]})
+
+    @patch("requests.Session.request")
+    def test_non_idempotent_retry_only_when_not_sent(self, mock_request):
+        mock_request.side_effect = [requests.exceptions.ConnectTimeout(), requests.exceptions.ReadTimeout()]
+        self.assertRaises(requests.exceptions.ReadTimeout, self.client.post, endpoint="mint", path="/AGIX/mint")
+        self.assertEqual(2, mock_request.call_count)
+
+        mock_request.reset_mock(side_effect=True)
+        mock_request.return_value = response(503)
+        self.assertEqual(503, self.client.post(endpoint="mint", path="/AGIX/mint").status_code)
+        self.assertEqual(1, mock_request.call_count)
+
+    @patch("utils.http_client.get_remaining_invocation_time")
+    @patch("requests.Session.request")
+    def test_non_idempotent_read_timeout_follows_the_invocation_deadline(self, mock_request,
+                                                                        mock_get_remaining_invocation_time):
+        client = HttpClient(name="cardano_service", base_path="https://cardano.service", connect_timeout=1,
+                            read_timeout=2, write_read_timeout=280, deadline_margin=5, max_retry=0, retry_backoff=0,
+                            circuit_breaker=CircuitBreaker(name="cardano_service", failure_threshold=2,
+                                                           reset_timeout=60))
+        mock_request.return_value = response(200)
+
+        mock_get_remaining_invocation_time.return_value = 250
+        client.post(endpoint="mint", path="/AGIX/mint")
+        self.assertEqual((1, 245), mock_request.call_args.kwargs["timeout"])
+
+        mock_get_remaining_invocation_time.return_value = None
+        client.post(endpoint="mint", path="/AGIX/mint")
+        self.assertEqual((1, 280), mock_request.call_args.kwargs["timeout"])
+
+        client.get(endpoint="token_liquidity", path="/AGIX/liquidity")
+        self.assertEqual((1, 2), mock_request.call_args.kwargs["timeout"])
+
+    @patch("utils.http_client.time.monotonic")
+    @patch("requests.Session.request")
+    def test_circuit_breaker(self, mock_request, mock_monotonic):
+        mock_monotonic.return_value = 0
+        mock_request.return_value = response(500)
+        for _ in range(2):
+            self.client.get(endpoint="token_liquidity", path="/AGIX/liquidity")
+        mock_request.reset_mock()
+
+        self.assertRaises(CircuitOpenException, self.client.get, endpoint="token_liquidity", path="/AGIX/liquidity")
+        mock_request.assert_not_called()
+
+        # A successful trial after the reset timeout closes the circuit
+        mock_monotonic.return_value = 61
+        mock_request.return_value = response(404)
+        self.assertEqual(404, self.client.get(endpoint="token_liquidity", path="/AGIX/liquidity").status_code)
+        self.assertFalse(self.client.circuit_breaker.is_open)
+
+    def tearDown(self):
+        http_metrics.reset()
@@ -0,0 +1,60 @@
+import time
+import unittest
+from threading import Event
+from unittest.mock import patch, Mock
+
+from utils.blockchain import get_converter_contract_balance, liquidity_balance_cache
+from utils.cache import TTLCache
+
+token_pair_id = "fdd6a416d8414154bcdd95f82b6ab239"
+
+
+class TestLiquidityBalanceCache(unittest.TestCase):
+
+    def setUp(self):
+        self.ttl, self.stale_ttl = liquidity_balance_cache.ttl, liquidity_balance_cache.stale_ttl
+        liquidity_balance_cache.ttl, liquidity_balance_cache.stale_ttl = 60, 0
+        liquidity_balance_cache.clear()
+
+    @patch("application.service.cardano_service.CardanoService.get_token_liquidity")
+    @patch("infrastructure.repositories.blockchain_repository.BlockchainRepository.get_to_token_data_by_token_pair_id")
+    def test_balance_is_cached_per_token_pair(self, mock_get_to_token_data, mock_get_token_liquidity):
+        mock_get_to_token_data.return_value = ("Cardano", 2, "AGIX", None)
+        mock_get_token_liquidity.side_effect = [{"data": {"balance": 100}}, {"data": {"balance": 80}}]
+
+        self.assertEqual(100, get_converter_contract_balance(token_pair_id=token_pair_id))
+        self.assertEqual(100, get_converter_contract_balance(token_pair_id=token_pair_id))
+        self.assertEqual(1, mock_get_token_liquidity.call_count)
+
+        liquidity_balance_cache.invalidate(key=token_pair_id)
+        self.assertEqual(80, get_converter_contract_balance(token_pair_id=token_pair_id))
+        self.assertEqual(2, mock_get_token_liquidity.call_count)
+
+    @patch("utils.cache.time.monotonic")
+    def test_stale_value_is_served_while_refreshing(self, mock_monotonic):
+        cache = TTLCache(name="test", ttl=10, stale_ttl=30)
+        refreshed = Event()
+
+        def load_fresh():
+            refreshed.set()
+            return 2
+
+        mock_monotonic.return_value = 0
+        self.assertEqual(1, cache.get_or_load(key="key", loader=Mock(return_value=1)))
+
+        mock_monotonic.return_value = 20
+        self.assertEqual(1, cache.get_or_load(key="key", loader=load_fresh))
+        self.assertTrue(refreshed.wait(timeout=5))
+        for _ in range(100):
+            if cache.get(key="key") == 2:
+                break
+            time.sleep(0.01)
+        self.assertEqual(2, cache.get_or_load(key="key", loader=Mock(side_effect=Exception)))
+
+        # Past the stale window the value is loaded inline
+        mock_monotonic.return_value = 100
+        self.assertEqual(3, cache.get_or_load(key="key", loader=Mock(return_value=3)))
+
+    def tearDown(self):
+        liquidity_balance_cache.ttl, liquidity_balance_cache.stale_ttl = self.ttl, self.stale_ttl
+        liquidity_balance_cache.clear()
@@ -0,0 +1,55 @@
+import unittest
+from decimal import Decimal
+from unittest.mock import patch, Mock
+
+from sqlalchemy.orm.attributes import set_committed_value
+
+from application.service.conversion_service import ConversionService
+from constants.status import ConversionStatus
+from infrastructure.models import ConversionDBModel, add_inserted_conversion_to_ledger, \
+    add_updated_conversion_to_ledger
+
+
+def persisted_conversion(status, claim_amount):
+    conversion = ConversionDBModel()
+    set_committed_value(conversion, "wallet_pair_id", 1)
+    set_committed_value(conversion, "status", status)
+    set_committed_value(conversion, "claim_amount", claim_amount)
+    return conversion
+
+
+class TestLiquidityLedger(unittest.TestCase):
+
+    @patch("infrastructure.models.add_locked_amount")
+    def test_ledger_follows_the_conversion_status(self, mock_add_locked_amount):
+        connection = Mock()
+        add_inserted_conversion_to_ledger(mapper=None, connection=connection, target=ConversionDBModel(
+            wallet_pair_id=1, status=ConversionStatus.USER_INITIATED.value, claim_amount=100))
+        mock_add_locked_amount.assert_called_with(connection=connection, wallet_pair_id=1, amount=Decimal(0))
+
+        conversion = persisted_conversion(status=ConversionStatus.USER_INITIATED.value, claim_amount=100)
+        conversion.status = ConversionStatus.PROCESSING.value
+        add_updated_conversion_to_ledger(mapper=None, connection=connection, target=conversion)
+        mock_add_locked_amount.assert_called_with(connection=connection, wallet_pair_id=1, amount=Decimal(100))
+
+        conversion = persisted_conversion(status=ConversionStatus.PROCESSING.value, claim_amount=100)
+        conversion.claim_amount = 90
+        add_updated_conversion_to_ledger(mapper=None, connection=connection, target=conversion)
+        mock_add_locked_amount.assert_called_with(connection=connection, wallet_pair_id=1, amount=Decimal(-10))
+
+        conversion = persisted_conversion(status=ConversionStatus.CLAIM_INITIATED.value, claim_amount=90)
+        conversion.status = ConversionStatus.SUCCESS.value
+        add_updated_conversion_to_ledger(mapper=None, connection=connection, target=conversion)
+        mock_add_locked_amount.assert_called_with(connection=connection, wallet_pair_id=1, amount=Decimal(-90))
+
+    @patch("common.utils.Utils.report_slack")
+    @patch("infrastructure.repositories.liquidity_repository.LiquidityRepository.reconcile_locked_amount")
+    @patch("infrastructure.repositories.liquidity_repository.LiquidityRepository.get_token_pair_ids")
+    def test_reconcile_liquidity_ledger(self, mock_get_token_pair_ids, mock_reconcile_locked_amount,
+                                        mock_report_slack):
+        mock_get_token_pair_ids.return_value = ["22477fd4ea994689a04646cbbaafd133", "fdd6a416d8414154bcdd95f82b6ab239"]
+        mock_reconcile_locked_amount.side_effect = [(100, 100), (50, 80)]
+
+        mismatches = ConversionService().reconcile_liquidity_ledger()
+        self.assertEqual(["token_pair_id=fdd6a416d8414154bcdd95f82b6ab239 ledger=50 locked=80"], mismatches)
+        self.assertEqual(1, mock_report_slack.call_count)
@@ -0,0 +1,45 @@
+import unittest
+from collections import Counter
+from unittest.mock import patch
+from uuid import uuid4
+
+from application.service.pooling_service import PoolingService, message_group_pool_cache
+from domain.factory.PoolFactory import PoolFactory
+
+
+def message_pools(*message_group_ids):
+    return [PoolFactory.message_pool(row_id=index, id=f"id{index}", name=message_group_id,
+                                     message_group_id=message_group_id, is_enabled=True, created_by="DummyForTest",
+                                     created_at=None, updated_at=None)
+            for index, message_group_id in enumerate(message_group_ids)]
+
+
+class TestMessageGroupPool(unittest.TestCase):
+
+    def setUp(self):
+        message_group_pool_cache.clear()
+
+    @patch("infrastructure.repositories.pooling_repository.PoolingRepository.get_enabled_message_group_pools")
+    def test_conversions_spread_over_the_enabled_groups(self, mock_get_enabled_message_group_pools):
+        mock_get_enabled_message_group_pools.return_value = message_pools(
+            "CONVERTER_BRIDGE_1", "CONVERTER_BRIDGE_2", "CONVERTER_BRIDGE_3", "CONVERTER_BRIDGE_4")
+        pooling_service = PoolingService()
+
+        picked = Counter(pooling_service.get_message_group_pool(conversion_id=uuid4().hex)["message_group_id"]
+                         for _ in range(4000))
+        self.assertEqual({"CONVERTER_BRIDGE_1", "CONVERTER_BRIDGE_2", "CONVERTER_BRIDGE_3", "CONVERTER_BRIDGE_4"},
+                         set(picked))
+        self.assertTrue(all(800 < count < 1200 for count in picked.values()))
+
+        # Every event of a conversion goes to the same group
+        conversion_id = "5086b5245cd046a68363d9ca8ed0027e"
+        self.assertEqual(pooling_service.get_message_group_pool(conversion_id=conversion_id),
+                         pooling_service.get_message_group_pool(conversion_id=conversion_id))
+
+    @patch("infrastructure.repositories.pooling_repository.PoolingRepository.get_enabled_message_group_pools")
+    def test_no_enabled_group(self, mock_get_enabled_message_group_pools):
+        mock_get_enabled_message_group_pools.return_value = []
+        self.assertIsNone(PoolingService().get_message_group_pool(conversion_id="5086b5245cd046a68363d9ca8ed0027e"))
+
+    def tearDown(self):
+        message_group_pool_cache.clear()
@@ -0,0 +1,32 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from utils.exceptions import BadRequestException, InternalServerErrorException
+from utils.general import validate_schema, schema_validators
+
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../documentation/models/conversion.json")
+
+
+class TestSchemaValidation(unittest.TestCase):
+
+    def setUp(self):
+        schema_validators.clear()
+
+    def test_schema_file_is_read_once(self):
+        input_json = {"conversion_id": "5086b5245cd046a68363d9ca8ed0027e", "transaction_hash": "0x", "amount": "1"}
+        with patch("builtins.open", wraps=open) as mock_open:
+            validate_schema(filepath=SCHEMA_FILE, schema_key="ClaimConversionRequestInput", input_json={
+                "conversion_id": "5086b5245cd046a68363d9ca8ed0027e", "amount": "1", "from_address": "0x",
+                "to_address": "0x", "signature": "0x"})
+            self.assertRaises(BadRequestException, validate_schema, filepath=SCHEMA_FILE,
+                              schema_key="ClaimConversionRequestInput", input_json=input_json)
+            self.assertEqual(1, mock_open.call_count)
+
+    def test_unknown_schema_key(self):
+        self.assertRaises(InternalServerErrorException, validate_schema, filepath=SCHEMA_FILE,
+                          schema_key="UnknownInput", input_json={})
+        self.assertEqual({}, schema_validators)
+
+    def tearDown(self):
+        schema_validators.clear()
@@ -0,0 +1,85 @@
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+from eth_account import Account
+
+from constants.general import SignatureTypeEntities
+from utils.signature import get_signature, secret_cache, secret_version_cache
+
+CONTRACT_ADDRESS = "0xacC7Fc3D6A8bDb0eF9Bc0d28B3b6b0F3Fd1D1b41"
+USER_ADDRESS = "0xa18b95A9371Ac18C233fB024cdAC5ef6300efDa1"
+
+
+class TestSecretCache(unittest.TestCase):
+
+    def setUp(self):
+        self.ttl = secret_cache.ttl
+        self.version_ttl = secret_version_cache.ttl
+        secret_cache.ttl = 60
+        secret_version_cache.ttl = 60
+        secret_cache.clear()
+        secret_version_cache.clear()
+        self.private_key = Account.create().key.hex()
+
+    def sign(self):
+        return get_signature(signature_type=SignatureTypeEntities.CONVERSION_IN.value, user_address=USER_ADDRESS,
+                             conversion_id="5086b5245cd046a68363d9ca8ed0027e", amount="1000",
+                             contract_address=CONTRACT_ADDRESS, chain_id=42)
+
+    @patch.dict(os.environ, {"AWS_REGION": "us-east-1", "CONVERTER_ETHEREUM_SIGNER_PRIVATE_KEY_PATH": "signer"})
+    @patch("utils.signature.get_secret_version_id", return_value="v1")
+    @patch("common.boto_utils.BotoUtils.get_parameter_value_from_secrets_manager")
+    def test_secret_is_fetched_once(self, mock_get_secret, mock_get_secret_version_id):
+        mock_get_secret.return_value = json.dumps({CONTRACT_ADDRESS: self.private_key})
+
+        self.assertEqual(self.sign(), self.sign())
+        self.assertEqual(1, mock_get_secret.call_count)
+        self.assertEqual(1, mock_get_secret_version_id.call_count)
+
+    @patch.dict(os.environ, {"AWS_REGION": "us-east-1", "CONVERTER_ETHEREUM_SIGNER_PRIVATE_KEY_PATH": "signer"})
+    @patch("utils.signature.get_secret_version_id", return_value="v1")
+    @patch("common.boto_utils.BotoUtils.get_parameter_value_from_secrets_manager")
+    def test_secret_is_refreshed_when_signing_fails(self, mock_get_secret, mock_get_secret_version_id):
+        mock_get_secret.side_effect = [json.dumps({CONTRACT_ADDRESS: "0xinvalid"}),
+                                       json.dumps({CONTRACT_ADDRESS: self.private_key})]
+        self.assertRaises(Exception, self.sign)
+
+        # Rotated secret is picked up on the retry with the cached one
+        self.sign()
+        self.sign()
+        self.assertEqual(2, mock_get_secret.call_count)
+
+    @patch.dict(os.environ, {"AWS_REGION": "us-east-1", "CONVERTER_ETHEREUM_SIGNER_PRIVATE_KEY_PATH": "signer"})
+    @patch("utils.signature.get_secret_version_id")
+    @patch("common.boto_utils.BotoUtils.get_parameter_value_from_secrets_manager")
+    def test_rotated_secret_is_picked_up_after_the_version_check(self, mock_get_secret, mock_get_secret_version_id):
+        rotated_private_key = Account.create().key.hex()
+        mock_get_secret.side_effect = [json.dumps({CONTRACT_ADDRESS: self.private_key}),
+                                       json.dumps({CONTRACT_ADDRESS: rotated_private_key})]
+        mock_get_secret_version_id.side_effect = ["v1", "v2", "v2"]
+        signature = self.sign()
+
+        # The old key still signs, the version check is what brings in the rotated one
+        self.assertEqual(signature, self.sign())
+        secret_version_cache.clear()
+        self.assertNotEqual(signature, self.sign())
+        self.assertEqual(2, mock_get_secret.call_count)
+
+    @patch.dict(os.environ, {"AWS_REGION": "us-east-1", "CONVERTER_ETHEREUM_SIGNER_PRIVATE_KEY_PATH": "signer"})
+    @patch("utils.signature.get_secret_version_id", return_value=None)
+    @patch("common.boto_utils.BotoUtils.get_parameter_value_from_secrets_manager")
+    def test_secret_without_a_version_is_not_served_from_the_cache(self, mock_get_secret,
+                                                                    mock_get_secret_version_id):
+        mock_get_secret.return_value = json.dumps({CONTRACT_ADDRESS: self.private_key})
+
+        self.sign()
+        self.sign()
+        self.assertEqual(2, mock_get_secret.call_count)
+
+    def tearDown(self):
+        secret_cache.ttl = self.ttl
+        secret_version_cache.ttl = self.version_ttl
+        secret_cache.clear()
+        secret_version_cache.clear()
@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import patch
+
+import web3
+from eth_account import Account
+from eth_account.messages import encode_defunct
+
+from utils.signature import validate_conversion_signature, validate_conversion_claim_signature, \
+    recover_signer_address
+
+
+class TestSignatureRecovery(unittest.TestCase):
+
+    def setUp(self):
+        self.account = Account.create()
+        self.cardano_address = "addr_test1qza8485avt2xn3vy63plawqt0gk3ykpf98wusc4qrml2avu0pkm5rp3pkz6q4n3kf8znlf3y74" \
+                               "9lll8lfmg5x86kgt8qju7vx8"
+
+    def sign(self, message):
+        return Account.sign_message(encode_defunct(message), private_key=self.account.key).signature.hex()
+
+    @patch("web3.providers.rpc.HTTPProvider.make_request")
+    def test_validate_conversion_signature(self, mock_make_request):
+        token_pair_id, amount, block_number = "22477fd4ea994689a04646cbbaafd133", "1000", 12345
+        message = web3.Web3.soliditySha3(["string", "string", "string", "string", "uint256"],
+                                         [token_pair_id, amount, self.account.address, self.cardano_address,
+                                          block_number])
+        signature = self.sign(message)
+
+        self.assertEqual(self.account.address, recover_signer_address(message=message, signature=signature))
+        self.assertTrue(validate_conversion_signature(token_pair_id=token_pair_id, amount=amount,
+                                                      from_address=self.account.address,
+                                                      to_address=self.cardano_address, block_number=block_number,
+                                                      signature=signature, is_signer_as_from_address=True,
+                                                      chain_id=42))
+        self.assertFalse(validate_conversion_signature(token_pair_id=token_pair_id, amount="1",
+                                                       from_address=self.account.address,
+                                                       to_address=self.cardano_address, block_number=block_number,
+                                                       signature=signature, is_signer_as_from_address=True,
+                                                       chain_id=42))
+        mock_make_request.assert_not_called()
+
+    @patch("web3.providers.rpc.HTTPProvider.make_request")
+    def test_validate_conversion_claim_signature(self, mock_make_request):
+        conversion_id, amount = "5086b5245cd046a68363d9ca8ed0027e", "1000"
+        message = web3.Web3.soliditySha3(["string", "string", "string", "string"],
+                                         [conversion_id, amount, self.cardano_address, self.account.address])
+
+        self.assertTrue(validate_conversion_claim_signature(conversion_id=conversion_id, amount=amount,
+                                                            from_address=self.cardano_address,
+                                                            to_address=self.account.address,
+                                                            signature=self.sign(message), chain_id=42))
+        mock_make_request.assert_not_called()
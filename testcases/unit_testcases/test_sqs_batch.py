@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import patch
+
+from utils.exceptions import InternalServerErrorException
+from utils.sqs import SqsService
+
+QUEUE_DETAILS = {"EVENT_CONSUMER": "https://sqs.us-east-1.amazonaws.com/000000000000/event-consumer.fifo"}
+
+
+class TestSqsBatch(unittest.TestCase):
+
+    @patch.dict("utils.sqs.QUEUE_DETAILS", QUEUE_DETAILS)
+    @patch("utils.sqs.get_sqs_client")
+    def test_messages_are_sent_in_batches_of_ten(self, mock_get_sqs_client):
+        mock_send_message_batch = mock_get_sqs_client.return_value.send_message_batch
+        mock_send_message_batch.return_value = {"Successful": [], "Failed": []}
+
+        SqsService.send_messages_to_queue(queue="EVENT_CONSUMER", messages=[str(i) for i in range(23)],
+                                          message_group_id=None)
+        self.assertEqual([10, 10, 3], [len(call.kwargs["Entries"]) for call in mock_send_message_batch.call_args_list])
+        self.assertEqual({"Id": "20", "MessageBody": "20"},
+                         mock_send_message_batch.call_args_list[2].kwargs["Entries"][0])
+
+    @patch.dict("utils.sqs.QUEUE_DETAILS", QUEUE_DETAILS)
+    @patch("utils.sqs.time.sleep")
+    @patch("utils.sqs.get_sqs_client")
+    def test_only_failed_entries_are_retried(self, mock_get_sqs_client, mock_sleep):
+        mock_send_message_batch = mock_get_sqs_client.return_value.send_message_batch
+        mock_send_message_batch.side_effect = [{"Failed": [{"Id": "1", "SenderFault": False}]}, {"Failed": []}]
+
+        SqsService.send_messages_to_queue(queue="EVENT_CONSUMER", messages=["a", "b", "c"], message_group_id="group")
+        self.assertEqual([{"Id": "1", "MessageBody": "b", "MessageGroupId": "group"}],
+                         mock_send_message_batch.call_args_list[1].kwargs["Entries"])
+
+    @patch.dict("utils.sqs.QUEUE_DETAILS", QUEUE_DETAILS)
+    @patch.dict("utils.sqs.MAX_RETRY", {"SQS_SEND_MESSAGE_BATCH": 2})
+    @patch.dict("utils.sqs.SLEEP_TIME", {"SQS_SEND_MESSAGE_BATCH": 0.1})
+    @patch("utils.sqs.random.uniform", side_effect=lambda low, high: high)
+    @patch("utils.sqs.time.sleep")
+    @patch("utils.sqs.get_sqs_client")
+    def test_failed_entries_are_retried_with_backoff(self, mock_get_sqs_client, mock_sleep, mock_uniform):
+        mock_send_message_batch = mock_get_sqs_client.return_value.send_message_batch
+        mock_send_message_batch.return_value = {"Failed": [{"Id": "0", "SenderFault": False, "Code": "Throttling"}]}
+
+        self.assertRaises(InternalServerErrorException, SqsService.send_messages_to_queue, queue="EVENT_CONSUMER",
+                          messages=["a"], message_group_id=None)
+        self.assertEqual(3, mock_send_message_batch.call_count)
+        self.assertEqual([0.2, 0.4], [call.args[0] for call in mock_sleep.call_args_list])
+
+    @patch.dict("utils.sqs.QUEUE_DETAILS", QUEUE_DETAILS)
+    @patch("utils.sqs.get_sqs_client")
+    def test_sender_faults_are_not_retried(self, mock_get_sqs_client):
+        mock_send_message_batch = mock_get_sqs_client.return_value.send_message_batch
+        mock_send_message_batch.return_value = {"Failed": [{"Id": "0", "SenderFault": True}]}
+
+        self.assertRaises(InternalServerErrorException, SqsService.send_messages_to_queue, queue="EVENT_CONSUMER",
+                          messages=["a", "b"], message_group_id=None)
+        self.assertEqual(1, mock_send_message_batch.call_count)
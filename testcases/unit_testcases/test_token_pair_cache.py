@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import patch, Mock
+
+from application.service.token_service import TokenService, token_pair_cache
+
+token_pair = {
+    "row_id": 1, "id": "22477fd4ea994689a04646cbbaafd133", "min_value": "10", "max_value": "100",
+    "conversion_ratio": None, "conversion_fee": {}, "created_by": "DApp", "created_at": "2022-01-12 04:10:54",
+    "updated_at": "2022-01-12 04:10:54",
+    "from_token": {"row_id": 1, "id": "53ceafdb42ad4f3d81eeb19c674437f9", "symbol": "AGIX", "logo": "",
+                   "allowed_decimal": 8, "token_address": "0x", "contract_address": "0x",
+                   "updated_at": "2022-01-12 04:10:54",
+                   "blockchain": {"id": "a38b4038c3a04810805fb26056dfabdd", "name": "Ethereum", "symbol": "ETH",
+                                  "chain_id": 42}},
+    "to_token": {"row_id": 2, "id": "aa5763de861e4a52ab24464790a5c017", "symbol": "AGIX", "logo": "",
+                 "allowed_decimal": 6, "token_address": "addr", "contract_address": None,
+                 "updated_at": "2022-01-12 04:10:54",
+                 "blockchain": {"id": "5b21294fe71a4145a40f6ab918a50f96", "name": "Cardano", "symbol": "ADA",
+                                "chain_id": 2}}
+}
+
+
+class TestTokenPairCache(unittest.TestCase):
+
+    def setUp(self):
+        self.ttl = token_pair_cache.ttl
+        token_pair_cache.ttl = 60
+        token_pair_cache.clear()
+
+    @patch("infrastructure.repositories.token_repository.TokenRepository.get_token_pair")
+    def test_get_token_pair_internal_is_cached_by_id_and_row_id(self, mock_get_token_pair):
+        mock_get_token_pair.return_value = Mock(to_dict=Mock(return_value=token_pair))
+        token_service = TokenService()
+
+        response = token_service.get_token_pair_internal(token_pair_id=token_pair["id"])
+        self.assertEqual(token_pair["row_id"], response["row_id"])
+        token_service.get_token_pair_internal(token_pair_id=token_pair["id"])
+        token_service.get_token_pair_internal(token_pair_id=None, token_pair_row_id=token_pair["row_id"])
+        token_service.get_token_pair(token_pair_id=token_pair["id"])
+        self.assertEqual(1, mock_get_token_pair.call_count)
+
+        # Row id not matching the cached id has to go to the database
+        token_service.get_token_pair_internal(token_pair_id=token_pair["id"], token_pair_row_id=2)
+        self.assertEqual(2, mock_get_token_pair.call_count)
+
+    @patch("infrastructure.repositories.token_repository.TokenRepository.get_token_pair")
+    def test_invalidate_token_pair_cache(self, mock_get_token_pair):
+        mock_get_token_pair.return_value = Mock(to_dict=Mock(return_value=token_pair))
+        token_service = TokenService()
+
+        token_service.get_token_pair_internal(token_pair_id=token_pair["id"])
+        TokenService.invalidate_token_pair_cache(token_pair_row_id=token_pair["row_id"])
+        self.assertIsNone(TokenService.get_cached_token_pair(token_pair_id=token_pair["id"]))
+        token_service.get_token_pair_internal(token_pair_id=None, token_pair_row_id=token_pair["row_id"])
+        self.assertEqual(2, mock_get_token_pair.call_count)
+
+        TokenService.invalidate_token_pair_cache()
+        token_service.get_token_pair_internal(token_pair_id=token_pair["id"])
+        self.assertEqual(3, mock_get_token_pair.call_count)
+
+    @patch("infrastructure.repositories.token_repository.TokenRepository.get_token_pair")
+    def test_disabled_cache_always_reads_from_database(self, mock_get_token_pair):
+        token_pair_cache.ttl = 0
+        mock_get_token_pair.return_value = Mock(to_dict=Mock(return_value=token_pair))
+        token_service = TokenService()
+
+        token_service.get_token_pair_internal(token_pair_id=token_pair["id"])
+        token_service.get_token_pair_internal(token_pair_id=token_pair["id"])
+        self.assertEqual(2, mock_get_token_pair.call_count)
+
+    def tearDown(self):
+        token_pair_cache.ttl = self.ttl
+        token_pair_cache.clear()
@@ -0,0 +1,26 @@
+import unittest
+
+from utils.web3_provider import get_blockchain_util, get_evm_web3_object, clear_providers
+
+
+class TestWeb3Provider(unittest.TestCase):
+
+    def setUp(self):
+        clear_providers()
+
+    def test_providers_are_reused_per_chain_id(self):
+        web3_object = get_evm_web3_object(chain_id=42)
+        self.assertIs(web3_object, get_evm_web3_object(chain_id=42))
+        self.assertIsNot(web3_object, get_evm_web3_object(chain_id=97))
+        self.assertEqual("https://kovan.infura.io/v3/", web3_object.provider.endpoint_uri)
+
+        blockchain_util = get_blockchain_util(chain_id=42)
+        self.assertIs(blockchain_util, get_blockchain_util(chain_id=42))
+        self.assertIs(web3_object, blockchain_util.web3_object)
+        self.assertIs(web3_object.provider, blockchain_util.provider)
+
+    def test_unsupported_chain_id(self):
+        self.assertRaises(ValueError, get_evm_web3_object, chain_id=2)
+
+    def tearDown(self):
+        clear_providers()
@@ -0,0 +1,37 @@
+from config import BLOCK_INTERVAL, MAX_CACHED_BLOCK_LAG
+from common.logger import get_logger
+from constants.general import BlockchainName
+from utils.cache import TTLCache
+from utils.cardano_blockchain import get_cardano_blockchain_util
+from utils.web3_provider import get_blockchain_util
+
+logger = get_logger(__name__)
+
+# Latest block height per chain id, kept for one block interval of the chain so the node is asked once per block
+block_height_caches = {
+    blockchain_name: TTLCache(name=f"{blockchain_name.name.lower()}_block_height",
+                              ttl=BLOCK_INTERVAL.get(blockchain_name.name, 0))
+    for blockchain_name in BlockchainName
+}
+
+
+def get_latest_block_number(blockchain_name: BlockchainName, chain_id):
+    return block_height_caches[blockchain_name].get_or_load(
+        key=chain_id, loader=lambda: fetch_latest_block_number(blockchain_name=blockchain_name, chain_id=chain_id))
+
+
+def fetch_latest_block_number(blockchain_name: BlockchainName, chain_id):
+    logger.info(f"Getting the latest block number of blockchain={blockchain_name.value} chain_id={chain_id}")
+    if blockchain_name == BlockchainName.CARDANO:
+        return get_cardano_blockchain_util(chain_id=chain_id).get_latest_block().height
+    return get_blockchain_util(chain_id=chain_id).get_current_block_no()
+
+
+def get_block_number_lag(blockchain_name: BlockchainName):
+    """
+    Number of blocks the height from get_latest_block_number can be behind, block numbers signed by the user are
+    allowed that far above it.
+    """
+    if not block_height_caches[blockchain_name].ttl:
+        return 0
+    return MAX_CACHED_BLOCK_LAG.get(blockchain_name.name, 0)
@@ -5,36 +5,47 @@ from http import HTTPStatus
 import re
 
 from web3.exceptions import TransactionNotFound, ABIFunctionNotFound
-from pycardano import Address
+from pycardano import Address, Network
 from pycardano.exception import DecodingException
 
 from application.service.cardano_service import CardanoService
-from common.blockchain_util import BlockChainUtil
 from common.logger import get_logger
-from config import TOKEN_CONTRACT_PATH, MAX_RETRY, SLEEP_TIME
+from config import TOKEN_CONTRACT_PATH, MAX_RETRY, SLEEP_TIME, CACHE_TTL, CACHE_STALE_TTL, REDELIVERY_DELAY, \
+    CONFIRMATION_TRACKER, CACHE_MAX_SIZE
 from constants.blockchain import CardanoTransactionEntities, CardanoBlockEntities, EthereumBlockchainEntities, \
-    BinanceBlockchainEntities
+    BinanceBlockchainEntities, CardanoNetwork
 from constants.entity import BlockchainEntities, TokenEntities, ConversionDetailEntities, TransactionEntities, \
     ConversionEntities, CardanoEventType, CardanoAPIEntities, WalletPairEntities, \
     EthereumAllowedEventType, CardanoAllowedEventType, CardanoServicesEventTypes, EthereumEventConsumerEntities, \
     BinanceAllowedEventType, BinanceEventConsumerEntities
 from constants.error_details import ErrorCode, ErrorDetails
-from constants.general import BlockchainName, ConversionOn, MaxRetryEntities, SleepTimeEntities
+from constants.general import BlockchainName, ConversionOn, MaxRetryEntities, SleepTimeEntities, CacheTTLEntities, \
+    RedeliveryDelayEntities, CacheSizeEntities
 from constants.status import TransactionOperation, EthereumToCardanoEvent, CardanoToEthereumEvent, TransactionStatus, \
     ConversionStatus, EthereumToBinanceEvent, BinanceToEthereumEvent, CardanoToCardanoEvent
 from domain.entities.converter_bridge import ConverterBridge
-from utils.cardano_blockchain import CardanoBlockchainUtil
-from utils.exceptions import InternalServerErrorException, BadRequestException
-from utils.general import get_ethereum_network_url, get_cardano_network_url_and_project_id, \
-    check_existing_transaction_succeed, get_transactions_operation, get_binance_network_url, get_evm_network_url, \
-    get_evm_blockchain
+from utils.cache import TTLCache, LRUCache
+from utils.cardano_blockchain import get_cardano_blockchain_util
+from utils.exceptions import InternalServerErrorException, BadRequestException, BlockConfirmationNotEnoughException
+from utils.general import check_existing_transaction_succeed, get_transactions_operation, get_evm_blockchain
 from utils.signature import validate_conversion_claim_signature
+from utils.web3_provider import get_blockchain_util, get_evm_web3_object
 from infrastructure.repositories.blockchain_repository import BlockchainRepository
 
 logger = get_logger(__name__)
 
 blockchain_repo = BlockchainRepository()
 
+# Parsed token ABIs and the contract instances built from them, so the hot paths skip the disk read and json parsing
+contract_cache = TTLCache(name="contract", ttl=CACHE_TTL.get(CacheTTLEntities.CONTRACT.value, 0))
+# Converter liquidity per token pair id, dropped whenever a mint or a transfer of the pair is processed
+liquidity_balance_cache = TTLCache(name="liquidity_balance",
+                                   ttl=CACHE_TTL.get(CacheTTLEntities.LIQUIDITY_BALANCE.value, 0),
+                                   stale_ttl=CACHE_STALE_TTL.get(CacheTTLEntities.LIQUIDITY_BALANCE.value, 0))
+# Cardano addresses found valid per chain id, an address stays valid on its chain
+cardano_address_cache = LRUCache(name="cardano_address",
+                                 max_size=CACHE_MAX_SIZE.get(CacheSizeEntities.CARDANO_ADDRESS.value, 0))
+
 
 def get_deposit_address_details(blockchain_name, token_name):
     logger.info(f"Getting the deposit address details for blockchain name={blockchain_name}, token_name={token_name}")
@@ -73,9 +84,32 @@ def get_deposit_address_details_format(derived_address, index, role):
 
 
 def validate_cardano_address(address, chain_id):
-    url, project_id = get_cardano_network_url_and_project_id(chain_id=chain_id)
+    """
+    Shelley addresses carry their network, so they are decoded and checked against the chain locally. Only the byron
+    addresses, which pycardano does not decode, are looked up on blockfrost.
+    """
+    if cardano_address_cache.get(key=(chain_id, address)):
+        return
+
+    if not is_valid_cardano_address(address):
+        raise BadRequestException(error_code=ErrorCode.INVALID_CARDANO_ADDRESS.value,
+                                  error_details=ErrorDetails[ErrorCode.INVALID_CARDANO_ADDRESS.value].value)
+
+    if address.startswith("addr"):
+        network = Network.MAINNET if chain_id == CardanoNetwork.MAINNET.value else Network.TESTNET
+        if Address.decode(address).network != network:
+            logger.info(f"Cardano address={address} does not belong to the chain_id={chain_id}")
+            raise BadRequestException(error_code=ErrorCode.INVALID_CARDANO_ADDRESS.value,
+                                      error_details=ErrorDetails[ErrorCode.INVALID_CARDANO_ADDRESS.value].value)
+    else:
+        validate_cardano_address_on_chain(address=address, chain_id=chain_id)
+
+    cardano_address_cache.set(key=(chain_id, address), value=True)
+
+
+def validate_cardano_address_on_chain(address, chain_id):
     try:
-        cardano_blockchain = CardanoBlockchainUtil(project_id=project_id, base_url=url)
+        cardano_blockchain = get_cardano_blockchain_util(chain_id=chain_id)
         cardano_blockchain.get_address_detail(address=address)
     except Exception as e:
         if e.status_code == HTTPStatus.NOT_FOUND.value:
@@ -134,7 +168,11 @@ def get_event_logs(contract_instance, receipt, conversion_on):
 
 def get_converter_contract_balance(token_pair_id: str):
     logger.info(f"Get liquidity balance for token pair id {token_pair_id}")
+    return get_cached_converter_balance(token_pair_id=token_pair_id,
+                                        to_token_data=get_converter_token_data(token_pair_id=token_pair_id))
 
+
+def get_converter_token_data(token_pair_id: str):
     to_token_data = blockchain_repo.get_to_token_data_by_token_pair_id(token_pair_id)
 
     if not to_token_data:
@@ -147,6 +185,19 @@ def get_converter_contract_balance(token_pair_id: str):
                      f"token_symbol={token_symbol}, contract_address={contract_address}")
         raise InternalServerErrorException(error_code=ErrorCode.INVALID_TOKEN_DATA)
 
+    return to_token_data
+
+
+def get_cached_converter_balance(token_pair_id: str, to_token_data):
+    # Doesn't touch the db, so it can run off the main thread. The token data is read beforehand on the shared session
+    blockchain_name, chain_id, token_symbol, contract_address = to_token_data
+    return liquidity_balance_cache.get_or_load(
+        key=token_pair_id, loader=lambda: get_converter_balance(blockchain_name=blockchain_name, chain_id=chain_id,
+                                                               token_symbol=token_symbol,
+                                                               contract_address=contract_address))
+
+
+def get_converter_balance(blockchain_name, chain_id, token_symbol, contract_address):
     if blockchain_name == BlockchainName.CARDANO.value:
         result = CardanoService.get_token_liquidity(token_name=token_symbol)
         result = result["data"]["balance"]
@@ -157,11 +208,9 @@ def get_converter_contract_balance(token_pair_id: str):
             logger.error(f"Bad contract address: contract_address={contract_address}")
             raise InternalServerErrorException(error_code=ErrorCode.INVALID_TOKEN_DATA)
 
-        provider_url = get_evm_network_url(chain_id=chain_id)
-        web3_object = BlockChainUtil(provider_type="HTTP_PROVIDER", provider=provider_url)
-        contract_abi_path = get_token_contract_path(token=token_symbol)
-        abi = web3_object.load_contract(path=contract_abi_path)
-        contract_instance = web3_object.contract_instance(contract_abi=abi, address=contract_address)
+        web3_object = get_blockchain_util(chain_id=chain_id)
+        contract_instance = get_token_contract_instance(web3_object=web3_object, token_symbol=token_symbol,
+                                                        chain_id=chain_id, contract_address=contract_address)
 
         try:
             balance = contract_instance.functions.getConverterBalance().call()
@@ -177,8 +226,7 @@ def get_converter_contract_balance(token_pair_id: str):
 def validate_evm_transaction_details_against_conversion(chain_id, transaction_hash, conversion_on,
                                                         contract_address, conversion_detail):
     blockchain_name = get_evm_blockchain(chain_id=chain_id)
-    network_url = get_evm_network_url(chain_id=chain_id)
-    evm_web3_object = BlockChainUtil(provider_type="HTTP_PROVIDER", provider=network_url)
+    evm_web3_object = get_blockchain_util(chain_id=chain_id)
 
     blockchain_transaction = get_evm_transaction_details(web3_object=evm_web3_object,
                                                          transaction_hash=transaction_hash)
@@ -187,10 +235,8 @@ def validate_evm_transaction_details_against_conversion(chain_id, transaction_ha
     else:
         token_symbol = conversion_detail.get(ConversionDetailEntities.TO_TOKEN.value).get(TokenEntities.SYMBOL.value)
 
-    contract_abi_path = get_token_contract_path(token=token_symbol)
-
-    contract = evm_web3_object.load_contract(path=contract_abi_path)
-    contract_instance = evm_web3_object.contract_instance(contract_abi=contract, address=contract_address)
+    contract_instance = get_token_contract_instance(web3_object=evm_web3_object, token_symbol=token_symbol,
+                                                    chain_id=chain_id, contract_address=contract_address)
     logs = get_event_logs(contract_instance=contract_instance, receipt=blockchain_transaction,
                           conversion_on=conversion_on)
 
@@ -238,10 +284,29 @@ def get_token_contract_path(token):
     return os.path.abspath(os.path.join(token_contract_path))
 
 
+def get_token_contract_abi(web3_object, token_symbol):
+    key = token_symbol.lower()
+    abi = contract_cache.get(key=key)
+    if abi is None:
+        abi = web3_object.load_contract(path=get_token_contract_path(token=token_symbol))
+        contract_cache.set(key=key, value=abi)
+    return abi
+
+
+def get_token_contract_instance(web3_object, token_symbol, chain_id, contract_address):
+    key = (token_symbol.lower(), chain_id, contract_address)
+    contract_instance = contract_cache.get(key=key)
+    if contract_instance is None:
+        abi = get_token_contract_abi(web3_object=web3_object, token_symbol=token_symbol)
+        # BlockChainUtil.contract_instance would replace the pooled provider of the shared util with a new one
+        contract_instance = get_evm_web3_object(chain_id=chain_id).eth.contract(abi=abi, address=contract_address)
+        contract_cache.set(key=key, value=contract_instance)
+    return contract_instance
+
+
 def get_cardano_transaction_details(chain_id, transaction_hash):
-    url, project_id = get_cardano_network_url_and_project_id(chain_id=chain_id)
     try:
-        cardano_blockchain = CardanoBlockchainUtil(project_id=project_id, base_url=url)
+        cardano_blockchain = get_cardano_blockchain_util(chain_id=chain_id)
         blockchain_transaction = cardano_blockchain.get_transaction_utxos(transaction_hash=transaction_hash)
     except Exception as e:
         logger.info(repr(e))
@@ -358,16 +423,13 @@ def validate_tx_hash_presence_in_blockchain(blockchain_name, tx_hash, network_id
                 f"tx_hash={tx_hash}, network_id={network_id}")
     try:
         if blockchain_name.lower() == BlockchainName.ETHEREUM.value.lower():
-            network_url = get_ethereum_network_url(chain_id=network_id)
-            ethereum_web3_object = BlockChainUtil(provider_type="HTTP_PROVIDER", provider=network_url)
+            ethereum_web3_object = get_blockchain_util(chain_id=network_id)
             transaction = ethereum_web3_object.get_transaction_receipt_from_blockchain(transaction_hash=tx_hash)
         elif blockchain_name.lower() == BlockchainName.BINANCE.value.lower():
-            network_url = get_binance_network_url(chain_id=network_id)
-            binance_web3_object = BlockChainUtil(provider_type="HTTP_PROVIDER", provider=network_url)
+            binance_web3_object = get_blockchain_util(chain_id=network_id)
             transaction = binance_web3_object.get_transaction_receipt_from_blockchain(transaction_hash=tx_hash)
         else:
-            url, project_id = get_cardano_network_url_and_project_id(chain_id=network_id)
-            cardano_blockchain = CardanoBlockchainUtil(project_id=project_id, base_url=url)
+            cardano_blockchain = get_cardano_blockchain_util(chain_id=network_id)
             transaction = cardano_blockchain.get_transaction(hash=tx_hash)
 
         if not transaction:
@@ -408,8 +470,7 @@ def validate_consumer_event_against_transaction(event_type, transaction, blockch
 
 
 def get_block_confirmation(tx_hash, blockchain_network_id):
-    url, project_id = get_cardano_network_url_and_project_id(chain_id=blockchain_network_id)
-    cardano_blockchain = CardanoBlockchainUtil(project_id=project_id, base_url=url)
+    cardano_blockchain = get_cardano_blockchain_util(chain_id=blockchain_network_id)
     try:
         transaction = cardano_blockchain.get_transaction(hash=tx_hash)
         bc_block_height = transaction.get(CardanoTransactionEntities.BLOCK_HEIGHT.value)
@@ -426,8 +487,7 @@ def get_block_confirmation(tx_hash, blockchain_network_id):
 
 def get_evm_block_confirmation(tx_hash, blockchain_network_id):
     blockchain_name = get_evm_blockchain(chain_id=blockchain_network_id)
-    network_url = get_evm_network_url(chain_id=blockchain_network_id)
-    evm_web3_object = BlockChainUtil(provider_type="HTTP_PROVIDER", provider=network_url)
+    evm_web3_object = get_blockchain_util(chain_id=blockchain_network_id)
     try:
         transaction = evm_web3_object.get_transaction_receipt_from_blockchain(transaction_hash=tx_hash)
         if blockchain_name.lower() == BlockchainName.ETHEREUM.value.lower():
@@ -445,6 +505,29 @@ def get_evm_block_confirmation(tx_hash, blockchain_network_id):
     return bc_block_confirmations
 
 
+def is_confirmation_tracked(blockchain_name):
+    return bool(CONFIRMATION_TRACKER.get(blockchain_name.upper(), False))
+
+
+def get_transaction_block_number(blockchain_name, tx_hash, network_id):
+    """
+    Block number the transaction is included in, None while it isn't included in a block yet.
+    """
+    try:
+        if blockchain_name.lower() == BlockchainName.CARDANO.value.lower():
+            cardano_blockchain = get_cardano_blockchain_util(chain_id=network_id)
+            return cardano_blockchain.get_transaction(hash=tx_hash).get(CardanoTransactionEntities.BLOCK_HEIGHT.value)
+        transaction = get_blockchain_util(chain_id=network_id) \
+            .get_transaction_receipt_from_blockchain(transaction_hash=tx_hash)
+    except Exception as e:
+        logger.info(f"Transaction mayn't be available={e}")
+        return None
+
+    if blockchain_name.lower() == BlockchainName.BINANCE.value.lower():
+        return transaction.get(BinanceBlockchainEntities.BLOCK_NUMBER.value)
+    return transaction.get(EthereumBlockchainEntities.BLOCK_NUMBER.value)
+
+
 def generate_deposit_address_details_for_cardano_operation(wallet_pair):
     deposit_address = wallet_pair.get(WalletPairEntities.DEPOSIT_ADDRESS.value)
     deposit_address_details = wallet_pair.get(WalletPairEntities.DEPOSIT_ADDRESS_DETAIL.value)
@@ -553,12 +636,18 @@ def validate_conversion_with_blockchain(conversion_on, address, amount, conversi
     return is_valid
 
 
+def is_redelivery_delayed():
+    # When set, an unconfirmed transaction is checked once and its message is redelivered later by sqs
+    return bool(REDELIVERY_DELAY.get(RedeliveryDelayEntities.BLOCK_CONFIRMATION.value, 0))
+
+
 def get_current_block_confirmation(blockchain_name, tx_hash, network_id):
     current_block_confirmation = 0
     logger.info("Getting the current block confirmation")
     i = 1
     BLOCK_CONFIRMATION_SLEEP_TIME = SLEEP_TIME.get(SleepTimeEntities.BLOCK_CONFIRMATION.value, 0)
-    MAX_RETRY_BLOCK_CONFIRMATION = MAX_RETRY.get(MaxRetryEntities.BLOCK_CONFIRMATION.value, 0)
+    MAX_RETRY_BLOCK_CONFIRMATION = 0 if is_redelivery_delayed() \
+        else MAX_RETRY.get(MaxRetryEntities.BLOCK_CONFIRMATION.value, 0)
 
     while True:
         try:
@@ -586,14 +675,26 @@ def get_current_block_confirmation(blockchain_name, tx_hash, network_id):
 
 
 def wait_until_transaction_hash_exists_in_blockchain(tx_hash, network_id):
+    cardano_blockchain = get_cardano_blockchain_util(chain_id=network_id)
+
+    if is_redelivery_delayed():
+        # Checked once, the message is redelivered later while the transaction is missing
+        try:
+            transaction = cardano_blockchain.get_transaction(hash=tx_hash)
+        except Exception as e:
+            logger.info(f"Transaction hash mayn't be available={e}")
+            transaction = None
+        if not transaction:
+            raise BlockConfirmationNotEnoughException(
+                error_code=ErrorCode.NOT_ENOUGH_BLOCK_CONFIRMATIONS.value,
+                error_details=ErrorDetails[ErrorCode.NOT_ENOUGH_BLOCK_CONFIRMATIONS.value].value)
+        return
+
     logger.info("Waiting until the transaction hash exists in the blockchain exists ")
     i = 1
     SLEEP_TIME_TRANSACTION_HASH_PRESENCE = SLEEP_TIME.get(SleepTimeEntities.TRANSACTION_HASH_PRESENCE.value, 0)
     MAX_RETRY_TRANSACTION_HASH_PRESENCE = MAX_RETRY.get(MaxRetryEntities.TRANSACTION_HASH_PRESENCE.value, 0)
 
-    url, project_id = get_cardano_network_url_and_project_id(chain_id=network_id)
-    cardano_blockchain = CardanoBlockchainUtil(project_id=project_id, base_url=url)
-
     while True:
         transaction = None
         try:
@@ -620,6 +721,7 @@ def is_valid_cardano_address(address: str) -> bool:
     if address.startswith("addr"):
         try:
             Address.decode(address)
-        except DecodingException:
+        # pycardano fails with a TypeError when the bech32 checksum does not match
+        except (DecodingException, TypeError, ValueError):
             return False
     return True
@@ -0,0 +1,133 @@
+import time
+from collections import OrderedDict
+from threading import RLock, Thread
+
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TTLCache:
+    """
+    In-process key/value cache whose entries expire after ttl seconds. Instances are meant to be created at module
+    level so a warm lambda container keeps serving them across invocations. A ttl of 0 disables the cache.
+
+    With a stale_ttl, get_or_load keeps serving an expired entry for that many more seconds while a single background
+    thread loads the fresh value.
+    """
+
+    def __init__(self, name: str, ttl: float, stale_ttl: float = 0):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._items = {}
+        self._refreshing = {}
+        self._lock = RLock()
+
+    def get(self, key):
+        if not self.ttl:
+            return None
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                if expires_at + self.stale_ttl <= time.monotonic():
+                    del self._items[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        if not self.ttl:
+            return
+        with self._lock:
+            self._items[key] = (value, time.monotonic() + self.ttl)
+
+    def get_or_load(self, key, loader):
+        if not self.ttl:
+            return loader()
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                value, expires_at = item
+                now = time.monotonic()
+                if expires_at > now:
+                    return value
+                if expires_at + self.stale_ttl > now:
+                    if key not in self._refreshing:
+                        self.__start_refresh(key=key, loader=loader)
+                    return value
+        value = loader()
+        self.set(key=key, value=value)
+        return value
+
+    def __start_refresh(self, key, loader):
+        refresh = object()
+        self._refreshing[key] = refresh
+        Thread(target=self.__refresh, args=(key, loader, refresh), daemon=True).start()
+
+    def __refresh(self, key, loader, refresh):
+        try:
+            value = loader()
+        except Exception as e:
+            logger.warning(f"Unable to refresh the {self.name} cache for key={key}: {repr(e)}")
+            value = refresh
+        with self._lock:
+            # An invalidation during the refresh wins over the value loaded before it
+            if self._refreshing.get(key) is refresh:
+                del self._refreshing[key]
+                if value is not refresh:
+                    self.set(key=key, value=value)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+            self._refreshing.pop(key, None)
+
+    def clear(self):
+        logger.info(f"Clearing the {self.name} cache")
+        with self._lock:
+            self._items.clear()
+            self._refreshing.clear()
+
+
+class LRUCache:
+    """
+    In-process cache of at most max_size entries which evicts the least recently used one, meant for values that
+    never change once loaded. A max_size of 0 disables the cache.
+    """
+
+    def __init__(self, name: str, max_size: int):
+        self.name = name
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = RLock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def set(self, key, value):
+        if not self.max_size:
+            return
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def get_or_load(self, key, loader):
+        value = self.get(key)
+        if value is None:
+            value = loader()
+            self.set(key=key, value=value)
+        return value
+
+    def clear(self):
+        logger.info(f"Clearing the {self.name} cache")
+        with self._lock:
+            self._items.clear()
@@ -1,10 +1,24 @@
+from threading import Lock
+
 from blockfrost import BlockFrostApi, ApiUrls
 
 from common.logger import get_logger
+from config import CACHE_MAX_SIZE
+from constants.general import CacheSizeEntities
+from utils.cache import LRUCache
+from utils.general import get_cardano_network_url_and_project_id
 
 logger = get_logger(__name__)
 JSON_RETURN_TYPE = "json"
 
+# The inputs and outputs of a transaction are fixed by its hash, so they are kept until evicted
+transaction_utxos_cache = LRUCache(name="cardano_transaction_utxos",
+                                   max_size=CACHE_MAX_SIZE.get(CacheSizeEntities.CARDANO_TRANSACTION_UTXOS.value, 0))
+
+# One client per chain id for the lifetime of the container
+_cardano_blockchain_utils = {}
+_lock = Lock()
+
 
 class CardanoBlockchainUtil:
 
@@ -18,7 +32,9 @@ class CardanoBlockchainUtil:
         return self.blockchain_api.address(address=address, return_type=JSON_RETURN_TYPE)
 
     def get_transaction_utxos(self, transaction_hash):
-        return self.blockchain_api.transaction_utxos(hash=transaction_hash)
+        return transaction_utxos_cache.get_or_load(
+            key=(self.base_url, transaction_hash),
+            loader=lambda: self.blockchain_api.transaction_utxos(hash=transaction_hash))
 
     def get_block(self, hash_or_number):
         logger.info(f"Getting the block detail for given hash or number={hash_or_number}")
@@ -30,3 +46,21 @@ class CardanoBlockchainUtil:
     def get_transaction(self, hash):
         logger.info(f"Getting the transaction detail for given hash={hash}")
         return self.blockchain_api.transaction(hash=hash, return_type=JSON_RETURN_TYPE)
+
+
+def get_cardano_blockchain_util(chain_id):
+    cardano_blockchain_util = _cardano_blockchain_utils.get(chain_id)
+    if cardano_blockchain_util is None:
+        with _lock:
+            cardano_blockchain_util = _cardano_blockchain_utils.get(chain_id)
+            if cardano_blockchain_util is None:
+                logger.info(f"Creating the cardano blockchain util for chain_id={chain_id}")
+                url, project_id = get_cardano_network_url_and_project_id(chain_id=chain_id)
+                cardano_blockchain_util = CardanoBlockchainUtil(project_id=project_id, base_url=url)
+                _cardano_blockchain_utils[chain_id] = cardano_blockchain_util
+    return cardano_blockchain_util
+
+
+def clear_cardano_blockchain_utils():
+    with _lock:
+        _cardano_blockchain_utils.clear()
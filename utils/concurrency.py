@@ -0,0 +1,41 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+MAX_WORKERS = 4
+
+# Shared by the invocations of a warm container, tasks given to it must not touch the db session
+executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="task")
+
+
+def run_timed(name, task):
+    start = time.perf_counter()
+    try:
+        return task()
+    finally:
+        logger.info(f"Task={name} took {time.perf_counter() - start:.3f}s")
+
+
+def run_concurrently(tasks: dict):
+    """
+    Runs the independent tasks, given by name, on the shared pool and returns their results by name. A failure is
+    raised as soon as every task given before the failing one has finished, so the error reported is the one of the
+    first failing task in the given order without waiting for the slower tasks after it. The tasks not started yet
+    are cancelled then.
+    """
+    futures = {name: executor.submit(run_timed, name, task) for name, task in tasks.items()}
+
+    for _ in as_completed(futures.values()):
+        for name, future in futures.items():
+            if not future.done():
+                break
+            if future.exception() is not None:
+                logger.info(f"Task={name} failed")
+                for pending_future in futures.values():
+                    pending_future.cancel()
+                raise future.exception()
+
+    return {name: future.result() for name, future in futures.items()}
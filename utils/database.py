@@ -1,3 +1,24 @@
+import json
+import time
+from threading import Lock
+
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool, NullPool
+
+from common.logger import get_logger
+from constants.general import DBPoolMode
+
+logger = get_logger(__name__)
+
+# In seconds
+DEFAULT_POOL_SIZE = 1
+DEFAULT_MAX_OVERFLOW = 2
+DEFAULT_POOL_TIMEOUT = 10
+DEFAULT_POOL_RECYCLE = 3600
+RDS_PROXY_POOL_RECYCLE = 240
+SLOW_CHECKOUT_SECONDS = 1
+
+
 def update_in_db(*decorator_args, **decorator_kwargs):
     def decorator(func):
         def wrapper(*args, **kwargs):
@@ -34,3 +55,102 @@ def read_from_db(*decorator_args, **decorator_kwargs):
         return wrapper
 
     return decorator
+
+
+class PoolMetrics:
+    """
+    Connection pool counters of the container, the wait is the time spent getting a connection from the pool
+    (including opening it when the pool has none left).
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.checkins = 0
+            self.connects = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+
+    def record_wait(self, wait):
+        with self._lock:
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+        if wait >= SLOW_CHECKOUT_SECONDS:
+            logger.info(f"Waited {wait:.3f} seconds for a database connection")
+
+    def record(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "total_wait": round(self.total_wait, 6),
+                "max_wait": round(self.max_wait, 6)
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class MeteredPoolMixin:
+
+    def _do_get(self):
+        now = time.monotonic()
+        connection = super()._do_get()
+        pool_metrics.record_wait(time.monotonic() - now)
+        return connection
+
+
+class MeteredQueuePool(MeteredPoolMixin, QueuePool):
+    pass
+
+
+class MeteredNullPool(MeteredPoolMixin, NullPool):
+    pass
+
+
+def get_engine_pool_kwargs(db_config):
+    """
+    Pool settings from NETWORK['db']. A lambda container serves one request at a time, so the defaults keep a
+    single connection per container and the total stays bounded by the lambda concurrency. NULL opens a
+    connection per checkout and RDS_PROXY leaves the pooling to the proxy, recycling before its idle timeout.
+    """
+    pool_mode = db_config.get("DB_POOL_MODE", DBPoolMode.QUEUE.value)
+    pool_recycle = db_config.get("DB_POOL_RECYCLE", DEFAULT_POOL_RECYCLE)
+
+    if pool_mode == DBPoolMode.NULL.value:
+        return {"poolclass": MeteredNullPool, "pool_pre_ping": False}
+    elif pool_mode == DBPoolMode.RDS_PROXY.value:
+        return {"poolclass": MeteredQueuePool, "pool_pre_ping": False, "pool_size": 1, "max_overflow": 0,
+                "pool_recycle": min(pool_recycle, RDS_PROXY_POOL_RECYCLE),
+                "pool_timeout": db_config.get("DB_POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT)}
+    elif pool_mode == DBPoolMode.QUEUE.value:
+        return {"poolclass": MeteredQueuePool, "pool_pre_ping": True,
+                "pool_size": db_config.get("DB_POOL_SIZE", DEFAULT_POOL_SIZE),
+                "max_overflow": db_config.get("DB_MAX_OVERFLOW", DEFAULT_MAX_OVERFLOW),
+                "pool_recycle": pool_recycle,
+                "pool_timeout": db_config.get("DB_POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT)}
+    raise ValueError(f"Database pool mode {pool_mode} is not supported")
+
+
+def log_pool_metrics(handler_logger, handler_name):
+    """
+    Writes the pool counters of the invocation as one json log line, for the log metric filters, and starts the
+    counters over for the next invocation of the container.
+    """
+    handler_logger.info(json.dumps({"handler": handler_name, "db_pool": pool_metrics.to_dict()}))
+    pool_metrics.reset()
+
+
+def register_pool_metrics(engine):
+    event.listen(engine, "checkout", lambda *args: pool_metrics.record("checkouts"))
+    event.listen(engine, "checkin", lambda *args: pool_metrics.record("checkins"))
+    event.listen(engine, "connect", lambda *args: pool_metrics.record("connects"))
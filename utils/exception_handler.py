@@ -4,10 +4,13 @@ import traceback
 from http import HTTPStatus
 
 from common.utils import generate_lambda_response, make_response_body, Utils
-from constants.entity import ConverterBridgeEntities
+from constants.entity import ConverterBridgeEntities, SQSEventEntities
+from constants.general import RedeliveryDelayEntities
 from constants.lambdas import HttpRequestParamType, LambdaResponseStatus
+from utils.database import log_pool_metrics
 from utils.exceptions import InternalServerErrorException, BlockConfirmationNotEnoughException, BadRequestException
-from utils.lambdas import make_error_format
+from utils.lambdas import make_error_format, set_invocation_deadline
+from utils.sqs import SqsService
 
 utils_obj = Utils()
 internal_server_exception_obj = InternalServerErrorException(error_code=None, error_details=None)
@@ -86,6 +89,8 @@ def exception_handler(*decorator_args, **decorator_kwargs):
                                                                error_message=internal_server_exception_obj.error_message,
                                                                error_details="Oops something went wrong, Try again")),
                     cors_enabled=True)
+            finally:
+                log_pool_metrics(handler_logger=logger, handler_name=handler_name)
 
         return wrapper
 
@@ -147,6 +152,104 @@ def consumer_exception_handler(*decorator_args, **decorator_kwargs):
                 logger.exception(slack_message)
                 utils_obj.report_slack(slack_msg=slack_message, SLACK_HOOK=SLACK_HOOK)
                 raise e
+            finally:
+                log_pool_metrics(handler_logger=logger, handler_name=handler_name)
+
+        return wrapper
+
+    return decorator
+
+
+def consumer_batch_exception_handler(*decorator_args, **decorator_kwargs):
+    """
+    Runs the decorated sqs handler once per record and reports the failed records as batchItemFailures, so only
+    those are redelivered. Records of a fifo message group are skipped after a failure in the same group to keep
+    their order. When every record fails the error is raised as before, which redelivers the whole batch.
+
+    With a REDELIVERY_DELAY, a record without enough block confirmations is redelivered after that delay instead of
+    the visibility timeout of the queue. On a standard queue it is sent again as a new message carrying its attempt,
+    up to MAX_RETRY['BLOCK_CONFIRMATION'] times, so the checks do not use up the receives of the queue. A fifo queue
+    does not allow a delay per message, there the record stays hidden for the delay, growing with its receive count.
+    """
+    logger = decorator_kwargs["logger"]
+
+    def decorator(func):
+        SLACK_HOOK = decorator_kwargs.get("SLACK_HOOK", None)
+        REDELIVERY_DELAY = decorator_kwargs.get("REDELIVERY_DELAY", {})
+        BLOCK_CONFIRMATION_DELAY = REDELIVERY_DELAY.get(RedeliveryDelayEntities.BLOCK_CONFIRMATION.value, 0)
+        MAX_DELAY = REDELIVERY_DELAY.get(RedeliveryDelayEntities.MAX.value, 0)
+
+        def get_exec_info():
+            exec_info = sys.exc_info()
+            formatted_exec_info = traceback.format_exception(*exec_info)
+            exception_info = ""
+            for exc_lines in formatted_exec_info:
+                exception_info = exception_info + exc_lines
+            return exception_info
+
+        def wrapper(*args, **kwargs):
+            event = kwargs.get("event", args[0])
+            context = kwargs.get("context", args[1] if len(args) > 1 else None)
+            now = time.time()
+            set_invocation_deadline(context)
+
+            handler_name = decorator_kwargs.get("handler_name", func.__name__)
+            records = event.get(SQSEventEntities.RECORDS.value, [])
+            failed_records = []
+            failed_message_groups = set()
+            error = None
+
+            for record in records:
+                message_id = record.get(SQSEventEntities.MESSAGE_ID.value)
+                message_group_id = record.get(SQSEventEntities.ATTRIBUTES.value, {}) \
+                    .get(SQSEventEntities.MESSAGE_GROUP_ID.value)
+                if message_group_id and message_group_id in failed_message_groups:
+                    failed_records.append(record)
+                    continue
+
+                try:
+                    func({**event, SQSEventEntities.RECORDS.value: [record]}, context)
+                    continue
+                except BlockConfirmationNotEnoughException as e:
+                    logger.info("Not enough blockchain confirmation, so retrying silently")
+                    if BLOCK_CONFIRMATION_DELAY:
+                        if SqsService.is_fifo_record(record=record):
+                            SqsService.delay_redelivery(record=record, delay=BLOCK_CONFIRMATION_DELAY,
+                                                        max_delay=MAX_DELAY)
+                        elif SqsService.redeliver_with_delay(record=record, delay=BLOCK_CONFIRMATION_DELAY,
+                                                             max_delay=MAX_DELAY):
+                            # Sent again as a new message, so this one is done with
+                            continue
+                    error = e
+                except BadRequestException as e:
+                    logger.info(e)
+                    continue
+                except Exception as e:
+                    error_message = f"Error Reported! \n" \
+                                    f"handler: {handler_name} \n" \
+                                    f"message_id: {message_id} \n" \
+                                    f"body: {record.get(ConverterBridgeEntities.BODY.value)} \n" \
+                                    f"error_description: \n"
+                    slack_message = f"```{error_message}{get_exec_info()}```"
+                    logger.exception(slack_message)
+                    utils_obj.report_slack(slack_msg=slack_message, SLACK_HOOK=SLACK_HOOK)
+                    error = e
+
+                failed_records.append(record)
+                if message_group_id:
+                    failed_message_groups.add(message_group_id)
+
+            logger.info(f"Time taken for handler name= {handler_name} time={int(time.time() - now)} seconds")
+            log_pool_metrics(handler_logger=logger, handler_name=handler_name)
+            if not failed_records:
+                return None
+            if error is not None and len(failed_records) == len(records):
+                raise error
+            return {
+                SQSEventEntities.BATCH_ITEM_FAILURES.value: [
+                    {SQSEventEntities.ITEM_IDENTIFIER.value: record.get(SQSEventEntities.MESSAGE_ID.value)}
+                    for record in failed_records]
+            }
 
         return wrapper
 
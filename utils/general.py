@@ -1,12 +1,16 @@
+import base64
+import binascii
 import json
 import math
+import os
 import uuid
 from datetime import datetime
 from datetime import timedelta
 from decimal import Decimal, ROUND_DOWN
+from threading import Lock
 
-from jsonschema.exceptions import ValidationError
-from jsonschema.validators import validate
+from jsonschema.exceptions import ValidationError, best_match
+from jsonschema.validators import validator_for
 
 from common.logger import get_logger
 from config import BLOCKCHAIN_DETAILS
@@ -22,6 +26,10 @@ from utils.exceptions import InternalServerErrorException, BadRequestException
 
 logger = get_logger(__name__)
 
+# Compiled schema validators keyed by (schema file, schema key), built once per container
+schema_validators = {}
+schema_validators_lock = Lock()
+
 
 def get_response_from_entities(list_of_objs):
     return [obj.to_dict() for obj in list_of_objs]
@@ -37,17 +45,34 @@ def get_valid_value(dict_name, key):
     return dict_name.get(key, {})
 
 
+def get_schema_validator(filepath, schema_key):
+    key = (os.path.abspath(filepath), schema_key)
+    validator = schema_validators.get(key)
+    if validator is None:
+        with schema_validators_lock:
+            validator = schema_validators.get(key)
+            if validator is None:
+                with open(filepath) as f:
+                    data = json.load(f)
+                schema = data.get(schema_key, None)
+
+                if schema is None:
+                    raise InternalServerErrorException(
+                        error_code=ErrorCode.EMPTY_SCHEMA_FILE.value,
+                        error_details=ErrorDetails[ErrorCode.EMPTY_SCHEMA_FILE.value].value)
+                validator_class = validator_for(schema)
+                validator_class.check_schema(schema)
+                validator = validator_class(schema)
+                schema_validators[key] = validator
+    return validator
+
+
 def validate_schema(filepath, schema_key, input_json):
     try:
-        f = open(filepath)
-        data = json.load(f)
-        f.close()
-        schema = data.get(schema_key, None)
-
-        if schema is None:
-            raise InternalServerErrorException(error_code=ErrorCode.EMPTY_SCHEMA_FILE.value,
-                                               error_details=ErrorDetails[ErrorCode.EMPTY_SCHEMA_FILE.value].value)
-        validate(instance=input_json, schema=schema)
+        validator = get_schema_validator(filepath=filepath, schema_key=schema_key)
+        error = best_match(validator.iter_errors(input_json))
+        if error is not None:
+            raise error
 
     except ValidationError as e:
         logger.info(f"Missing required field(s)={e.message}")
@@ -144,6 +169,29 @@ def paginate_items_response_format(items, total_records, page_number, page_size)
                 PaginationEntity.PAGE_SIZE.value: page_size}}
 
 
+def cursor_pagination_response_format(items, next_cursor, page_size):
+    return {PaginationEntity.ITEMS.value: items,
+            PaginationEntity.META.value: {
+                PaginationEntity.PAGE_SIZE.value: page_size,
+                PaginationEntity.NEXT_CURSOR.value: next_cursor}}
+
+
+def encode_pagination_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode()
+
+
+def decode_pagination_cursor(cursor):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        values = None
+
+    if not isinstance(values, list):
+        raise BadRequestException(error_code=ErrorCode.INVALID_PAGINATION_CURSOR.value,
+                                  error_details=ErrorDetails[ErrorCode.INVALID_PAGINATION_CURSOR.value].value)
+    return values
+
+
 def check_existing_transaction_succeed(transactions):
     is_check_existing_transaction_succeed = True
     for transaction in transactions:
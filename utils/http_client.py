@@ -0,0 +1,215 @@
+import random
+import time
+from http import HTTPStatus
+from threading import Lock
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from common.logger import get_logger
+from config import CARDANO_SERVICE_CLIENT
+from constants.general import HttpClientEntities
+from utils.concurrency import MAX_WORKERS
+from utils.lambdas import get_remaining_invocation_time
+
+logger = get_logger(__name__)
+
+IDEMPOTENT_METHODS = ["GET", "HEAD", "OPTIONS", "PUT", "DELETE"]
+RETRYABLE_STATUS_CODES = [HTTPStatus.BAD_GATEWAY.value, HTTPStatus.SERVICE_UNAVAILABLE.value,
+                          HTTPStatus.GATEWAY_TIMEOUT.value]
+
+
+def is_not_sent(error):
+    # The connection was never established, so the service did not get the request
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(error, requests.exceptions.ConnectionError) and isinstance(reason, NewConnectionError)
+
+
+class CircuitOpenException(requests.exceptions.RequestException):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive failures and then fails the calls fast for reset_timeout seconds. The
+    first call after that goes through as a trial, its success closes the circuit and its failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if self._trial_running or time.monotonic() - self._opened_at < self.reset_timeout:
+                raise CircuitOpenException(f"Circuit of {self.name} is open")
+            self._trial_running = True
+
+    def record_success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info(f"Closing the circuit of {self.name}")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                logger.warning(f"Opening the circuit of {self.name} after {self._failures} failures")
+                self._opened_at = time.monotonic()
+
+    @property
+    def is_open(self):
+        with self._lock:
+            return self._opened_at is not None
+
+
+class HttpMetrics:
+    """
+    Call counters and latency of the container per endpoint, the latency covers the retries of a call.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+
+    def record(self, endpoint, latency, failed):
+        with self._lock:
+            metrics = self._endpoints.setdefault(endpoint, {"calls": 0, "failures": 0, "total_latency": 0.0,
+                                                            "max_latency": 0.0})
+            metrics["calls"] += 1
+            metrics["failures"] += 1 if failed else 0
+            metrics["total_latency"] += latency
+            metrics["max_latency"] = max(metrics["max_latency"], latency)
+        logger.info(f"Endpoint={endpoint} took {latency:.3f}s failed={failed}")
+
+    def to_dict(self):
+        with self._lock:
+            return {endpoint: {name: round(value, 6) if isinstance(value, float) else value
+                               for name, value in metrics.items()}
+                    for endpoint, metrics in self._endpoints.items()}
+
+
+http_metrics = HttpMetrics()
+
+
+class HttpClient:
+    """
+    Keep-alive session of a base path with timeouts, retries and a circuit breaker. A request that never reached the
+    service is retried for every method, read timeouts and gateway errors only for the idempotent methods, since a
+    mint or a burn might have gone through already. For the same reason the other methods are waited for until
+    deadline_margin seconds before the invocation times out, or write_read_timeout when its deadline is not known.
+    """
+
+    def __init__(self, name: str, base_path: str, connect_timeout: float, read_timeout: float, max_retry: int,
+                 retry_backoff: float, circuit_breaker: CircuitBreaker, write_read_timeout: float = None,
+                 deadline_margin: float = 0):
+        self.name = name
+        self.base_path = base_path
+        self.timeout = (connect_timeout, read_timeout)
+        self.write_read_timeout = write_read_timeout if write_read_timeout is not None else read_timeout
+        self.deadline_margin = deadline_margin
+        self.max_retry = max_retry
+        self.retry_backoff = retry_backoff
+        self.circuit_breaker = circuit_breaker
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, endpoint: str, path: str, **kwargs):
+        return self.request(method="GET", endpoint=endpoint, path=path, **kwargs)
+
+    def post(self, endpoint: str, path: str, **kwargs):
+        return self.request(method="POST", endpoint=endpoint, path=path, **kwargs)
+
+    def request(self, method: str, endpoint: str, path: str, **kwargs):
+        self.circuit_breaker.before_call()
+        start = time.monotonic()
+        failed = True
+        try:
+            response = self.__request_with_retry(method=method, path=path, **kwargs)
+            failed = response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR.value
+            return response
+        finally:
+            if failed:
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success()
+            http_metrics.record(endpoint=f"{self.name}.{endpoint}", latency=time.monotonic() - start, failed=failed)
+
+    def __request_with_retry(self, method, path, **kwargs):
+        is_idempotent = method in IDEMPOTENT_METHODS
+        retry = 0
+        while True:
+            try:
+                response = self.session.request(method=method, url=f"{self.base_path}{path}",
+                                                timeout=self.__get_timeout(is_idempotent=is_idempotent), **kwargs)
+                if not (is_idempotent and response.status_code in RETRYABLE_STATUS_CODES) or retry >= self.max_retry:
+                    return response
+                logger.info(f"Retrying {method} {path} on status_code={response.status_code}")
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if not (is_idempotent or is_not_sent(e)) or retry >= self.max_retry:
+                    raise e
+                logger.info(f"Retrying {method} {path} on {repr(e)}")
+            retry += 1
+            # Full jitter, so the retries of concurrent lambdas do not hit the recovering service together
+            time.sleep(random.uniform(0, self.retry_backoff * 2 ** retry))
+
+    def __get_timeout(self, is_idempotent):
+        if is_idempotent:
+            return self.timeout
+        remaining_time = get_remaining_invocation_time()
+        if remaining_time is None:
+            return self.timeout[0], self.write_read_timeout
+        return self.timeout[0], max(remaining_time - self.deadline_margin, self.timeout[0])
+
+
+_clients = {}
+_clients_lock = Lock()
+
+
+def get_cardano_service_client(base_path: str):
+    client = _clients.get(base_path)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(base_path)
+            if client is None:
+                client = HttpClient(
+                    name="cardano_service", base_path=base_path,
+                    connect_timeout=CARDANO_SERVICE_CLIENT.get(HttpClientEntities.CONNECT_TIMEOUT.value, 5),
+                    read_timeout=CARDANO_SERVICE_CLIENT.get(HttpClientEntities.READ_TIMEOUT.value, 60),
+                    write_read_timeout=CARDANO_SERVICE_CLIENT.get(HttpClientEntities.WRITE_READ_TIMEOUT.value),
+                    deadline_margin=CARDANO_SERVICE_CLIENT.get(HttpClientEntities.DEADLINE_MARGIN.value, 0),
+                    max_retry=CARDANO_SERVICE_CLIENT.get(HttpClientEntities.MAX_RETRY.value, 0),
+                    retry_backoff=CARDANO_SERVICE_CLIENT.get(HttpClientEntities.RETRY_BACKOFF.value, 0.5),
+                    circuit_breaker=CircuitBreaker(
+                        name=f"cardano_service {base_path}",
+                        failure_threshold=CARDANO_SERVICE_CLIENT.get(HttpClientEntities.FAILURE_THRESHOLD.value, 5),
+                        reset_timeout=CARDANO_SERVICE_CLIENT.get(HttpClientEntities.RESET_TIMEOUT.value, 30)))
+                _clients[base_path] = client
+    return client
+
+
+def clear_clients():
+    with _clients_lock:
+        for client in _clients.values():
+            client.session.close()
+        _clients.clear()
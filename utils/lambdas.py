@@ -1,6 +1,25 @@
+import time
+
+# Monotonic time the running invocation times out at, set by the handlers from their lambda context
+_invocation_deadline = None
+
+
 def make_error_format(error_code=None, error_message=None, error_details=None):
     return {
         "code": error_code,
         "message": error_message,
         "details": error_details
     }
+
+
+def set_invocation_deadline(context):
+    global _invocation_deadline
+    get_remaining_time_in_millis = getattr(context, "get_remaining_time_in_millis", None)
+    _invocation_deadline = time.monotonic() + get_remaining_time_in_millis() / 1000 \
+        if get_remaining_time_in_millis else None
+
+
+def get_remaining_invocation_time():
+    if _invocation_deadline is None:
+        return None
+    return max(_invocation_deadline - time.monotonic(), 0)
@@ -1,7 +1,10 @@
 import json
 import os
+from threading import Lock
 
+import boto3
 import web3
+from eth_account import Account
 from eth_account.messages import defunct_hash_message, encode_defunct
 from eth_utils import ValidationError
 from web3 import Web3
@@ -9,14 +12,32 @@ from pycardano import cip8
 
 from common.boto_utils import BotoUtils
 from common.logger import get_logger
+from config import CACHE_TTL
 from constants.entity import SignatureMetadataEntities
 from constants.error_details import ErrorCode, ErrorDetails
-from constants.general import SIGNATURE_TYPES, ENV_CONVERTER_SIGNER_PRIVATE_KEY_PATH
+from constants.general import SIGNATURE_TYPES, ENV_CONVERTER_SIGNER_PRIVATE_KEY_PATH, CacheTTLEntities
+from utils.cache import TTLCache
 from utils.exceptions import InternalServerErrorException, BadRequestException
-from utils.general import string_to_bytes_to_hex, get_evm_network_url, get_evm_blockchain
+from utils.general import string_to_bytes_to_hex, get_evm_blockchain
 
 logger = get_logger(__name__)
 
+SECRET_CURRENT_VERSION_STAGE = "AWSCURRENT"
+
+# Signer keys and their version id by secret name. A rotated key still signs without an error, so the cached
+# version id is compared to the current one of Secrets Manager at most every SECRET_VERSION seconds
+secret_cache = TTLCache(name="secret", ttl=CACHE_TTL.get(CacheTTLEntities.SECRET.value, 0))
+secret_version_cache = TTLCache(name="secret_version", ttl=CACHE_TTL.get(CacheTTLEntities.SECRET_VERSION.value, 0))
+
+_secrets_manager_clients = {}
+_secrets_manager_clients_lock = Lock()
+
+
+def recover_signer_address(message, signature):
+    # Recovery is pure local crypto, so no provider is needed and it never waits on an RPC endpoint
+    hash_message = defunct_hash_message(message)
+    return Account.recoverHash(message_hash=hash_message, signature=signature)
+
 
 def validate_conversion_signature(token_pair_id, amount, from_address, to_address, block_number, signature,
                                   is_signer_as_from_address, chain_id):
@@ -29,9 +50,7 @@ def validate_conversion_signature(token_pair_id, amount, from_address, to_addres
         [token_pair_id, amount, from_address, to_address, block_number],
     )
 
-    hash_message = defunct_hash_message(message)
-    web3_object = Web3(web3.providers.HTTPProvider(get_evm_network_url(chain_id=chain_id)))
-    signer_address = web3_object.eth.account.recoverHash(message_hash=hash_message, signature=signature)
+    signer_address = recover_signer_address(message=message, signature=signature)
 
     return signer_address == target_address
 
@@ -82,9 +101,7 @@ def validate_conversion_claim_signature(conversion_id, amount, from_address, to_
             [conversion_id, amount, from_address, to_address],
         )
 
-        hash_message = defunct_hash_message(message)
-        web3_object = Web3(web3.providers.HTTPProvider(get_evm_network_url(chain_id=chain_id)))
-        signer_address = web3_object.eth.account.recoverHash(message_hash=hash_message, signature=signature)
+        signer_address = recover_signer_address(message=message, signature=signature)
     except ValidationError as e:
         logger.info(e)
         raise BadRequestException(error_code=ErrorCode.INCORRECT_SIGNATURE_LENGTH.value,
@@ -126,9 +143,7 @@ def generate_signature(signature_type, private_key, user_address, conversion_id,
 
     message_hash = encode_defunct(message)
 
-    network_url = get_evm_network_url(chain_id=chain_id)
-    web3_object = Web3(web3.providers.HTTPProvider(network_url))
-    signed_message = web3_object.eth.account.sign_message(message_hash, private_key=private_key)
+    signed_message = Account.sign_message(message_hash, private_key=private_key)
 
     return signed_message.signature.hex()
 
@@ -150,19 +165,70 @@ def get_signature(signature_type, user_address, conversion_id, amount, contract_
             error_code=ErrorCode.REQUIRED_SIGNING_ENVIRONMENT_FIELDS_NOT_FOUND.value,
             error_details=ErrorDetails[ErrorCode.REQUIRED_SIGNING_ENVIRONMENT_FIELDS_NOT_FOUND.value].value)
 
+    for force_refresh in (False, True):
+        secrets, is_cached = get_signer_secrets(region_name=region_name, secret_name=secret_name,
+                                                force_refresh=force_refresh)
+        private_key = secrets.get(contract_address)
+
+        if not private_key:
+            if is_cached:
+                logger.info(f"Signer key for contract_address={contract_address} not found in the cached secret")
+                continue
+            raise InternalServerErrorException(
+                error_code=ErrorCode.SECRET_DETAILS_FOR_CONTRACT_NOT_AVAILABLE.value,
+                error_details=ErrorDetails[ErrorCode.SECRET_DETAILS_FOR_CONTRACT_NOT_AVAILABLE.value].value)
+
+        try:
+            return generate_signature(signature_type=signature_type, private_key=private_key,
+                                      user_address=user_address, conversion_id=conversion_id, amount=amount,
+                                      contract_address=contract_address, chain_id=chain_id)
+        except InternalServerErrorException as e:
+            raise e
+        except Exception as e:
+            if not is_cached:
+                raise e
+            logger.info(f"Signing with the cached signer key failed because of {e}, refreshing the secret")
+
+
+def get_signer_secrets(region_name, secret_name, force_refresh=False):
+    """
+    Returns the signer secrets and whether they were served from the cache.
+    """
+    if force_refresh:
+        secret_cache.invalidate(key=secret_name)
+    else:
+        cached_secret = secret_cache.get(key=secret_name)
+        if cached_secret is not None:
+            secrets, version_id = cached_secret
+            # A secret whose version is not known can not be checked for a rotation, so it is read again
+            if version_id is not None and (
+                    secret_version_cache.get(key=secret_name) == version_id or
+                    get_secret_version_id(region_name=region_name, secret_name=secret_name) == version_id):
+                secret_version_cache.set(key=secret_name, value=version_id)
+                return secrets, True
+            logger.info(f"Secret {secret_name} was rotated or its version is not known, refreshing the signer keys")
+
+    # Read before the value, a rotation in between only costs one more refresh
+    version_id = get_secret_version_id(region_name=region_name, secret_name=secret_name) if secret_cache.ttl else None
     boto_utils_obj = BotoUtils(region_name=region_name)
     secrets = boto_utils_obj.get_parameter_value_from_secrets_manager(secret_name=secret_name)
 
     if not secrets:
         raise InternalServerErrorException(error_code=ErrorCode.SECRET_KEY_NOT_FOUND.value,
                                            error_details=ErrorDetails[ErrorCode.SECRET_KEY_NOT_FOUND.value].value)
-    private_key = json.loads(secrets).get(contract_address)
-
-    if not private_key:
-        raise InternalServerErrorException(
-            error_code=ErrorCode.SECRET_DETAILS_FOR_CONTRACT_NOT_AVAILABLE.value,
-            error_details=ErrorDetails[ErrorCode.SECRET_DETAILS_FOR_CONTRACT_NOT_AVAILABLE.value].value)
-
-    return generate_signature(signature_type=signature_type, private_key=private_key, user_address=user_address,
-                              conversion_id=conversion_id, amount=amount, contract_address=contract_address,
-                              chain_id=chain_id)
+    secrets = json.loads(secrets)
+    secret_cache.set(key=secret_name, value=(secrets, version_id))
+    secret_version_cache.set(key=secret_name, value=version_id)
+    return secrets, False
+
+
+def get_secret_version_id(region_name, secret_name):
+    # Describing the secret does not decrypt it, so it is cheaper than reading the value
+    client = _secrets_manager_clients.get(region_name)
+    if client is None:
+        with _secrets_manager_clients_lock:
+            client = _secrets_manager_clients.setdefault(
+                region_name, boto3.client("secretsmanager", region_name=region_name))
+    version_stages = client.describe_secret(SecretId=secret_name).get("VersionIdsToStages", {})
+    return next((version_id for version_id, stages in version_stages.items()
+                 if SECRET_CURRENT_VERSION_STAGE in stages), None)
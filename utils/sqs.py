@@ -1,37 +1,180 @@
+import random
+import time
+from threading import Lock
+
 import boto3
 
 from common.logger import get_logger
-from config import QUEUE_DETAILS
-from constants.entity import SQSEntities
+from config import QUEUE_DETAILS, MAX_RETRY, SLEEP_TIME
+from constants.entity import SQSEntities, SQSEventEntities
 from constants.error_details import ErrorCode, ErrorDetails
+from constants.general import MaxRetryEntities, SleepTimeEntities
 from utils.exceptions import InternalServerErrorException
 
 logger = get_logger(__name__)
 
+SQS_MAX_BATCH_SIZE = 10
+SQS_MAX_DELAY_SECONDS = 900
+FIFO_QUEUE_SUFFIX = ".fifo"
+
+# One client per container, creating a boto3 client costs more than the send itself
+_sqs_client = None
+_sqs_client_lock = Lock()
+
+
+def get_sqs_client():
+    global _sqs_client
+    if _sqs_client is None:
+        with _sqs_client_lock:
+            if _sqs_client is None:
+                _sqs_client = boto3.client('sqs')
+    return _sqs_client
+
 
 class SqsService:
 
     @staticmethod
-    def send_message_to_queue(queue: str, message: str, message_group_id: str):
-        payload = dict()
+    def get_queue_url(queue: str):
         queue_url = QUEUE_DETAILS.get(queue)
         if not queue_url:
             raise InternalServerErrorException(error_code=ErrorCode.QUEUE_DETAILS_NOT_FOUND.value,
                                                error_details=ErrorDetails[
                                                    ErrorCode.QUEUE_DETAILS_NOT_FOUND.value].value)
+        return queue_url
 
-        payload[SQSEntities.QUEUE_URL.value] = queue_url
+    @staticmethod
+    def send_message_to_queue(queue: str, message: str, message_group_id: str):
+        payload = dict()
+        payload[SQSEntities.QUEUE_URL.value] = SqsService.get_queue_url(queue=queue)
         payload[SQSEntities.MESSAGE_BODY.value] = message
         if message_group_id:
             payload[SQSEntities.MESSAGE_GROUP_ID.value] = message_group_id
 
         logger.info(f"Started publishing the message to the queue with details={payload}")
         try:
-            sqs_client = boto3.client('sqs')
-            response = sqs_client.send_message(**payload)
+            response = get_sqs_client().send_message(**payload)
             logger.info(response)
         except Exception as e:
             logger.error(f"Unable to send message because of {e}")
             raise InternalServerErrorException(error_code=ErrorCode.UNEXPECTED_ERROR_ON_SENDING_MESSAGE.value,
                                                error_details=ErrorDetails[
                                                    ErrorCode.UNEXPECTED_ERROR_ON_SENDING_MESSAGE.value].value)
+
+    @staticmethod
+    def send_messages_to_queue(queue: str, messages: list, message_group_id: str):
+        queue_url = SqsService.get_queue_url(queue=queue)
+        logger.info(f"Started publishing {len(messages)} messages to the queue={queue}")
+        for start in range(0, len(messages), SQS_MAX_BATCH_SIZE):
+            entries = []
+            for index, message in enumerate(messages[start:start + SQS_MAX_BATCH_SIZE]):
+                entry = {SQSEntities.ID.value: str(start + index), SQSEntities.MESSAGE_BODY.value: message}
+                if message_group_id:
+                    entry[SQSEntities.MESSAGE_GROUP_ID.value] = message_group_id
+                entries.append(entry)
+            SqsService.__send_message_batch(queue_url=queue_url, entries=entries)
+
+    @staticmethod
+    def __send_message_batch(queue_url: str, entries: list):
+        max_retry = MAX_RETRY.get(MaxRetryEntities.SQS_SEND_MESSAGE_BATCH.value, 0)
+        retry_backoff = SLEEP_TIME.get(SleepTimeEntities.SQS_SEND_MESSAGE_BATCH.value, 0)
+        sender_faults = []
+        retry = 0
+        while entries:
+            try:
+                response = get_sqs_client().send_message_batch(**{SQSEntities.QUEUE_URL.value: queue_url,
+                                                                  SQSEntities.ENTRIES.value: entries})
+            except Exception as e:
+                logger.error(f"Unable to send message batch because of {e}")
+                raise InternalServerErrorException(error_code=ErrorCode.UNEXPECTED_ERROR_ON_SENDING_MESSAGE.value,
+                                                   error_details=ErrorDetails[
+                                                       ErrorCode.UNEXPECTED_ERROR_ON_SENDING_MESSAGE.value].value)
+
+            failed = response.get(SQSEntities.FAILED.value, [])
+            if failed:
+                logger.info(f"Failed entries on sending message batch={failed}")
+
+            # Entries rejected because of the message itself would fail again, so only the others are retried
+            sender_faults.extend([entry for entry in failed if entry.get(SQSEntities.SENDER_FAULT.value)])
+            failed_ids = [entry[SQSEntities.ID.value] for entry in failed
+                          if not entry.get(SQSEntities.SENDER_FAULT.value)]
+            entries = [entry for entry in entries if entry[SQSEntities.ID.value] in failed_ids]
+            if entries and retry >= max_retry:
+                break
+            retry += 1
+            if entries:
+                # Full jitter, throttled entries sent again right away would use up the retries at once
+                time.sleep(random.uniform(0, retry_backoff * 2 ** retry))
+
+        if entries or sender_faults:
+            logger.error(f"Unable to send the messages of entries={entries}, sender_faults={sender_faults}")
+            raise InternalServerErrorException(error_code=ErrorCode.UNEXPECTED_ERROR_ON_SENDING_MESSAGE.value,
+                                               error_details=ErrorDetails[
+                                                   ErrorCode.UNEXPECTED_ERROR_ON_SENDING_MESSAGE.value].value)
+
+    @staticmethod
+    def get_queue_url_from_arn(queue_arn: str):
+        # arn:aws:sqs:<region>:<account_id>:<queue_name>
+        _, _, _, region, account_id, queue_name = queue_arn.split(":")
+        return f"https://sqs.{region}.amazonaws.com/{account_id}/{queue_name}"
+
+    @staticmethod
+    def delay_redelivery(record: dict, delay: int, max_delay: int):
+        """
+        Hides a received record for a delay doubled on every receive of its message, so once the record is reported
+        as failed sqs redelivers it after that delay instead of the visibility timeout of the queue.
+        """
+        receive_count = int(record.get(SQSEventEntities.ATTRIBUTES.value, {})
+                            .get(SQSEventEntities.APPROXIMATE_RECEIVE_COUNT.value, 1))
+        visibility_timeout = min(delay * 2 ** (receive_count - 1), max_delay)
+        logger.info(f"Delaying the redelivery of message_id={record.get(SQSEventEntities.MESSAGE_ID.value)} "
+                    f"received {receive_count} times by {visibility_timeout} seconds")
+        try:
+            get_sqs_client().change_message_visibility(**{
+                SQSEntities.QUEUE_URL.value: SqsService.get_queue_url_from_arn(
+                    queue_arn=record.get(SQSEventEntities.EVENT_SOURCE_ARN.value)),
+                SQSEntities.RECEIPT_HANDLE.value: record.get(SQSEventEntities.RECEIPT_HANDLE.value),
+                SQSEntities.VISIBILITY_TIMEOUT.value: visibility_timeout})
+        except Exception as e:
+            # The message still comes back, only after the visibility timeout of the queue
+            logger.error(f"Unable to change the message visibility because of {e}")
+
+    @staticmethod
+    def is_fifo_record(record: dict):
+        return record.get(SQSEventEntities.EVENT_SOURCE_ARN.value, "").endswith(FIFO_QUEUE_SUFFIX)
+
+    @staticmethod
+    def redeliver_with_delay(record: dict, delay: int, max_delay: int):
+        """
+        Sends a received record of a standard queue again as a new message delayed by a delay doubled on every
+        attempt. The attempt is carried in a message attribute, so the receive count of the queue, and with it the
+        dead letter queue, only counts the real failures. Returns False once MAX_RETRY['BLOCK_CONFIRMATION']
+        attempts are used up or the message could not be sent, the record is then left to fail as any other.
+        """
+        message_attributes = record.get(SQSEventEntities.MESSAGE_ATTRIBUTES.value) or {}
+        attempt = int(message_attributes.get(SQSEntities.ATTEMPT.value, {})
+                      .get(SQSEventEntities.STRING_VALUE.value, 1))
+        max_retry = MAX_RETRY.get(MaxRetryEntities.BLOCK_CONFIRMATION.value, 0)
+        message_id = record.get(SQSEventEntities.MESSAGE_ID.value)
+        if attempt > max_retry:
+            logger.info(f"Message_id={message_id} used up its {max_retry} delayed redeliveries")
+            return False
+
+        delay_seconds = min(delay * 2 ** (attempt - 1), max_delay, SQS_MAX_DELAY_SECONDS)
+        attributes = {name: {SQSEntities.DATA_TYPE.value: value.get(SQSEventEntities.DATA_TYPE.value),
+                             SQSEntities.STRING_VALUE.value: value.get(SQSEventEntities.STRING_VALUE.value)}
+                      for name, value in message_attributes.items()
+                      if value.get(SQSEventEntities.STRING_VALUE.value) is not None}
+        attributes[SQSEntities.ATTEMPT.value] = {SQSEntities.DATA_TYPE.value: "Number",
+                                                 SQSEntities.STRING_VALUE.value: str(attempt + 1)}
+        logger.info(f"Redelivering message_id={message_id} as attempt {attempt + 1} in {delay_seconds} seconds")
+        try:
+            get_sqs_client().send_message(**{
+                SQSEntities.QUEUE_URL.value: SqsService.get_queue_url_from_arn(
+                    queue_arn=record.get(SQSEventEntities.EVENT_SOURCE_ARN.value)),
+                SQSEntities.MESSAGE_BODY.value: record.get(SQSEventEntities.BODY.value),
+                SQSEntities.DELAY_SECONDS.value: delay_seconds,
+                SQSEntities.MESSAGE_ATTRIBUTES.value: attributes})
+        except Exception as e:
+            logger.error(f"Unable to redeliver the message because of {e}")
+            return False
+        return True
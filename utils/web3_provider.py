@@ -0,0 +1,65 @@
+from threading import Lock
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from web3 import Web3
+
+from common.blockchain_util import BlockChainUtil
+from common.logger import get_logger
+from utils.general import get_evm_network_url
+
+logger = get_logger(__name__)
+
+HTTP_PROVIDER = "HTTP_PROVIDER"
+HTTP_POOL_CONNECTIONS = 1
+HTTP_POOL_MAXSIZE = 10
+
+# Providers are kept per chain id for the lifetime of the container, so a warm lambda reuses the keep-alive
+# connection to the node instead of doing a new TLS handshake on every request
+_web3_objects = {}
+_blockchain_utils = {}
+_lock = Lock()
+
+
+def _create_session():
+    session = Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_evm_web3_object(chain_id):
+    web3_object = _web3_objects.get(chain_id)
+    if web3_object is None:
+        with _lock:
+            web3_object = _web3_objects.get(chain_id)
+            if web3_object is None:
+                logger.info(f"Creating the web3 provider for chain_id={chain_id}")
+                # web3 keeps the session of an endpoint in its own session cache, so the providers created by
+                # BlockChainUtil for the same url share this pooled session as well
+                provider = Web3.HTTPProvider(get_evm_network_url(chain_id=chain_id), session=_create_session())
+                web3_object = Web3(provider)
+                _web3_objects[chain_id] = web3_object
+    return web3_object
+
+
+def get_blockchain_util(chain_id):
+    blockchain_util = _blockchain_utils.get(chain_id)
+    if blockchain_util is None:
+        web3_object = get_evm_web3_object(chain_id=chain_id)
+        with _lock:
+            blockchain_util = _blockchain_utils.get(chain_id)
+            if blockchain_util is None:
+                blockchain_util = BlockChainUtil(provider_type=HTTP_PROVIDER,
+                                                 provider=get_evm_network_url(chain_id=chain_id))
+                blockchain_util.provider = web3_object.provider
+                blockchain_util.web3_object = web3_object
+                _blockchain_utils[chain_id] = blockchain_util
+    return blockchain_util
+
+
+def clear_providers():
+    with _lock:
+        _web3_objects.clear()
+        _blockchain_utils.clear()